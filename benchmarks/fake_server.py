@@ -0,0 +1,349 @@
+"""Local stand-in for the Thames Water sign-in and smart meter endpoints.
+
+The server emulates just enough of the Azure B2C login flow and the
+getSmartWaterMeterConsumptions endpoint for both clients to authenticate
+and download hourly readings or daily and monthly totals. Latency, transient errors, throttling and
+missing hours can be injected to exercise the retry and fetch paths.
+
+Run it on its own with ``python -m benchmarks.fake_server --port 8080``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+import datetime
+import random
+import socket
+import threading
+import uuid
+
+from aiohttp import web
+
+from custom_components.thames_water.thameswaterclient import Endpoints
+
+B2C_PREFIX = "/b2c"
+MYACCOUNT_PREFIX = "/myaccount"
+REDIRECT_PATH = "/redirect"
+SESSION_COOKIE = "ASP.NET_SessionId"
+
+
+@dataclass
+class FakeServerConfig:
+    """Behaviour of the fake server."""
+
+    email: str = "user@example.com"
+    password: str = "password"
+    # Seconds added to every request.
+    latency: float = 0.0
+    # Share of usage requests answered with a 500 or a 429.
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 1
+    # Share of hourly readings left out of the responses.
+    missing_hour_rate: float = 0.0
+    # Days before today for which no readings are published yet.
+    publish_delay_days: int = 3
+    seed: int = 0
+
+
+class FakeThamesWaterServer:
+    """aiohttp application serving the fake endpoints.
+
+    Use start() and stop() from a running event loop, or run it in a
+    background thread with FakeServerThread for blocking clients.
+    """
+
+    def __init__(self, config: FakeServerConfig | None = None) -> None:
+        """Initialise the server."""
+        self.config = config or FakeServerConfig()
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(self.config.seed)
+        self._sessions: set[str] = set()
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    @property
+    def endpoints(self) -> Endpoints:
+        """Return client endpoints pointing at this server."""
+        return Endpoints(
+            b2c_url=f"{self.base_url}{B2C_PREFIX}",
+            myaccount_url=f"{self.base_url}{MYACCOUNT_PREFIX}",
+            redirect_uri=f"{self.base_url}{REDIRECT_PATH}",
+        )
+
+    def make_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(middlewares=[self._middleware])
+        b2c = f"{B2C_PREFIX}/{{policy}}"
+        app.router.add_get(f"{b2c}/oauth2/v2.0/authorize", self._authorize)
+        app.router.add_post(f"{b2c}/SelfAsserted", self._self_asserted)
+        app.router.add_get(
+            f"{b2c}/api/CombinedSigninAndSignup/confirmed", self._confirmed
+        )
+        app.router.add_route("*", f"{b2c}/oauth2/v2.0/token", self._token)
+        app.router.add_get(REDIRECT_PATH, self._page)
+        app.router.add_get(f"{MYACCOUNT_PREFIX}/mydashboard", self._page)
+        app.router.add_get(f"{MYACCOUNT_PREFIX}/mydashboard/my-meters-usage", self._page)
+        app.router.add_get(f"{MYACCOUNT_PREFIX}/twservice/Account/SignIn", self._sign_in)
+        app.router.add_post(f"{MYACCOUNT_PREFIX}/login", self._login)
+        app.router.add_get(
+            f"{MYACCOUNT_PREFIX}/ajax/waterMeter/getSmartWaterMeterConsumptions",
+            self._consumptions,
+        )
+        return app
+
+    async def start(self, host: str = "localhost", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", port))
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+        # Cookie jars refuse cookies for bare IP addresses, so use a host name.
+        self.base_url = f"http://{host}:{sock.getsockname()[1]}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests["total"] += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        return await handler(request)
+
+    async def _authorize(self, request: web.Request) -> web.Response:
+        self.requests["authorize"] += 1
+        response = web.Response(
+            text=(
+                "<html><body><form>"
+                f"<input type='hidden' id='id_token' value='{uuid.uuid4().hex}'/>"
+                "</form></body></html>"
+            ),
+            content_type="text/html",
+        )
+        response.set_cookie("x-ms-cpim-trans", uuid.uuid4().hex, path="/")
+        response.set_cookie("x-ms-cpim-csrf", uuid.uuid4().hex, path="/")
+        return response
+
+    async def _self_asserted(self, request: web.Request) -> web.Response:
+        self.requests["self_asserted"] += 1
+        form = await request.post()
+        if (
+            form.get("email") != self.config.email
+            or form.get("password") != self.config.password
+        ):
+            return web.json_response({"status": "400"}, status=400)
+        return web.json_response({"status": "200"})
+
+    async def _confirmed(self, request: web.Request) -> web.Response:
+        self.requests["confirmed"] += 1
+        code = uuid.uuid4().hex
+        raise web.HTTPFound(
+            f"{self.endpoints.redirect_uri}#code={code}&state={uuid.uuid4().hex}"
+        )
+
+    async def _token(self, request: web.Request) -> web.Response:
+        self.requests["token"] += 1
+        return web.json_response(
+            {
+                "access_token": uuid.uuid4().hex,
+                "id_token": uuid.uuid4().hex,
+                "refresh_token": uuid.uuid4().hex,
+                "token_type": "Bearer",
+                "expires_in": 3600,
+            }
+        )
+
+    async def _page(self, request: web.Request) -> web.Response:
+        self.requests["page"] += 1
+        return web.Response(text="<html></html>", content_type="text/html")
+
+    async def _sign_in(self, request: web.Request) -> web.Response:
+        self.requests["sign_in"] += 1
+        raise web.HTTPFound(
+            f"{B2C_PREFIX}/b2c_1_tw_website_signin/oauth2/v2.0/authorize"
+            f"?client_id=myaccount&state={uuid.uuid4().hex}&nonce={uuid.uuid4().hex}"
+        )
+
+    async def _login(self, request: web.Request) -> web.Response:
+        self.requests["login"] += 1
+        session = uuid.uuid4().hex
+        self._sessions.add(session)
+        response = web.Response(text="<html></html>", content_type="text/html")
+        response.set_cookie(SESSION_COOKIE, session, path="/")
+        return response
+
+    async def _consumptions(self, request: web.Request) -> web.Response:
+        self.requests["usage"] += 1
+        if request.cookies.get(SESSION_COOKIE) not in self._sessions:
+            # An expired session is bounced to the sign-in page.
+            raise web.HTTPFound(f"{MYACCOUNT_PREFIX}/twservice/Account/SignIn")
+        roll = self._random.random()
+        if roll < self.config.throttle_rate:
+            self.requests["throttled"] += 1
+            return web.Response(
+                status=429, headers={"Retry-After": str(self.config.retry_after)}
+            )
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            self.requests["errors"] += 1
+            return web.Response(status=500)
+
+        query = request.query
+        granularity = query.get("granularity")
+        if granularity not in ("H", "D", "M"):
+            return web.Response(status=400)
+        start = datetime.date(
+            int(query["startYear"]), int(query["startMonth"]), int(query["startDate"])
+        )
+        end = datetime.date(
+            int(query["endYear"]), int(query["endMonth"]), int(query["endDate"])
+        )
+        lines = self._hourly_lines(query.get("meter", ""), start, end)
+        if granularity != "H":
+            lines = _total_lines(lines, granularity)
+        return web.json_response(_usage_payload(lines))
+
+    def _hourly_lines(
+        self, meter: str, start: datetime.date, end: datetime.date
+    ) -> list[dict]:
+        """Return deterministic hourly lines for the published days in a range."""
+        published = datetime.date.today() - datetime.timedelta(
+            days=self.config.publish_delay_days
+        )
+        lines = []
+        day = start
+        while day <= min(end, published):
+            day_rng = random.Random(f"{meter}|{day.isoformat()}|{self.config.seed}")
+            read = float(day.toordinal() * 300)
+            for hour in range(24):
+                usage = float(day_rng.choice((0, 0, 0, 2, 5, 10, 25, 60)))
+                read += usage
+                if day_rng.random() < self.config.missing_hour_rate:
+                    continue
+                lines.append(
+                    {
+                        "Label": f"{hour:02d}:00",
+                        "Date": day,
+                        "Usage": usage,
+                        "Read": read,
+                        "IsEstimated": False,
+                        "MeterSerialNumberHis": meter,
+                    }
+                )
+            day += datetime.timedelta(days=1)
+        return lines
+
+
+def _total_lines(hourly_lines: list[dict], granularity: str) -> list[dict]:
+    """Sum hourly lines into one line per day or month."""
+    lines: dict[tuple, dict] = {}
+    for line in hourly_lines:
+        day = line["Date"]
+        if granularity == "D":
+            key, label = (day,), day.strftime("%d %b")
+        else:
+            key, label = (day.year, day.month), day.strftime("%b %Y")
+        total = lines.setdefault(
+            key,
+            {
+                "Label": label,
+                "Usage": 0.0,
+                "Read": 0.0,
+                "IsEstimated": False,
+                "MeterSerialNumberHis": line["MeterSerialNumberHis"],
+            },
+        )
+        total["Usage"] += line["Usage"]
+        total["Read"] = line["Read"]
+    return list(lines.values())
+
+
+def _usage_payload(lines: list[dict]) -> dict:
+    """Wrap lines in the getSmartWaterMeterConsumptions response body."""
+    return {
+        "IsError": False,
+        "IsDataAvailable": bool(lines),
+        "IsConsumptionAvailable": bool(lines),
+        "TargetUsage": 0.0,
+        "AverageUsage": 0.0,
+        "ActualUsage": sum(line["Usage"] for line in lines),
+        "MyUsage": "NA",
+        "AverageUsagePerPerson": 0.0,
+        "IsMO365Customer": False,
+        "IsMOPartialCustomer": False,
+        "IsMOCompleteCustomer": False,
+        "IsExtraMonthConsumptionMessage": False,
+        "Lines": [
+            {key: value for key, value in line.items() if key != "Date"}
+            for line in lines
+        ]
+        or None,
+        "AlertsValues": {},
+    }
+
+
+class FakeServerThread:
+    """Run a FakeThamesWaterServer on its own event loop in a daemon thread."""
+
+    def __init__(self, config: FakeServerConfig | None = None) -> None:
+        """Initialise the thread."""
+        self.server = FakeThamesWaterServer(config)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def __enter__(self) -> FakeThamesWaterServer:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self._loop).result()
+        return self.server
+
+    def __exit__(self, *exc_info) -> None:
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def main() -> None:
+    """Serve the fake endpoints until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--missing-hour-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeThamesWaterServer(
+        FakeServerConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            missing_hour_rate=args.missing_hour_rate,
+        )
+    )
+
+    async def _serve() -> None:
+        print(f"Serving on {await server.start(port=args.port)}")
+        print(server.endpoints)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
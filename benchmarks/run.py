@@ -0,0 +1,303 @@
+"""End-to-end benchmarks against the local fake Thames Water server.
+
+Each scenario reports the requests seen by the server, the requests and
+retries counted by the client, wall time and peak Python memory. The
+client scenarios only need aiohttp and requests; without Home Assistant the
+client modules are loaded without the integration's __init__ (see
+benchmarks/__init__.py). The coordinator scenarios need Home Assistant and
+pytest-homeassistant-custom-component installed and are skipped otherwise.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scenario client_30d --latency 0.05 --throttle-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+import datetime
+import json
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+
+from custom_components.thames_water.thameswaterclient import ThamesWater
+from custom_components.thames_water.thameswaterclient_async import AsyncThamesWater
+
+from .fake_server import FakeServerConfig, FakeServerThread, FakeThamesWaterServer
+
+ACCOUNT_NUMBER = 900000001
+METER_ID = "12345678"
+
+
+@dataclass
+class Result:
+    """Measurements of one scenario run."""
+
+    scenario: str
+    server_requests: int
+    client_requests: int
+    client_retries: int
+    throttled: int
+    wall_time: float
+    peak_memory_kib: float
+    detail: str = ""
+
+
+class Skipped(Exception):
+    """The scenario cannot run in this environment."""
+
+
+def _end_date(server: FakeThamesWaterServer) -> datetime.date:
+    """Return the newest day the server publishes."""
+    return datetime.date.today() - datetime.timedelta(
+        days=server.config.publish_delay_days
+    )
+
+
+def scenario_client_login(server: FakeThamesWaterServer) -> tuple[ThamesWater, str]:
+    """Full password login with the blocking client."""
+    client = ThamesWater(
+        server.config.email,
+        server.config.password,
+        ACCOUNT_NUMBER,
+        endpoints=server.endpoints,
+    )
+    return client, ""
+
+
+def scenario_client_30d(server: FakeThamesWaterServer) -> tuple[ThamesWater, str]:
+    """Login and 30 single-day requests with the blocking client."""
+    client, _ = scenario_client_login(server)
+    end = _end_date(server)
+    lines = 0
+    for offset in range(29, -1, -1):
+        day = end - datetime.timedelta(days=offset)
+        d = datetime.datetime(day.year, day.month, day.day)
+        lines += len(client.get_meter_usage(METER_ID, d, d).Lines or [])
+    return client, f"{lines} lines"
+
+
+async def _async_client(
+    server: FakeThamesWaterServer, session: aiohttp.ClientSession
+) -> AsyncThamesWater:
+    return await AsyncThamesWater.async_create(
+        session,
+        server.config.email,
+        server.config.password,
+        ACCOUNT_NUMBER,
+        endpoints=server.endpoints,
+    )
+
+
+async def scenario_async_backfill_365d(
+    server: FakeThamesWaterServer,
+) -> tuple[AsyncThamesWater, str]:
+    """Login and a year of 7-day windows, 4 at a time, with the asyncio client."""
+    session = aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(quote_cookie=False))
+    client = await _async_client(server, session)
+    end = _end_date(server)
+    semaphore = asyncio.Semaphore(4)
+
+    async def _window(offset: int) -> int:
+        first = end - datetime.timedelta(days=offset + 6)
+        last = end - datetime.timedelta(days=offset)
+        async with semaphore:
+            usage = await client.get_meter_usage(
+                METER_ID,
+                datetime.datetime(first.year, first.month, first.day),
+                datetime.datetime(last.year, last.month, last.day),
+            )
+        return len(usage.Lines or [])
+
+    try:
+        lines = sum(await asyncio.gather(*(_window(o) for o in range(0, 365, 7))))
+    finally:
+        await client.async_close()
+    return client, f"{lines} lines"
+
+
+async def _async_coordinator_run(
+    server: FakeThamesWaterServer,
+    run: Callable[..., Awaitable[str]],
+) -> tuple[object, str]:
+    """Run a coordinator scenario inside a test Home Assistant instance."""
+    try:
+        from pytest_homeassistant_custom_component.common import (
+            MockConfigEntry,
+            async_test_home_assistant,
+        )
+
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.setup import async_setup_component
+
+        from custom_components.thames_water.const import DOMAIN
+        from custom_components.thames_water.coordinator import ThamesWaterCoordinator
+        from custom_components.thames_water.hub import async_get_account
+    except ImportError as err:
+        raise Skipped(f"needs Home Assistant test helpers ({err.name})") from err
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            await async_setup_component(
+                hass,
+                "recorder",
+                {"recorder": {"db_url": f"sqlite:///{config_dir}/benchmark.db"}},
+            )
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={
+                    "username": server.config.email,
+                    "password": server.config.password,
+                    "account_number": str(ACCOUNT_NUMBER),
+                    "meter_id": METER_ID,
+                },
+            )
+            entry.add_to_hass(hass)
+            client_manager = async_get_account(hass, entry).client_manager
+            client_manager.endpoints = server.endpoints
+            coordinator = ThamesWaterCoordinator(hass, entry, client_manager)
+            await coordinator._async_setup()
+            try:
+                detail = await run(coordinator)
+                await get_instance(hass).async_block_till_done()
+            finally:
+                await coordinator.client_manager.async_close()
+            await hass.async_stop(force=True)
+    return coordinator.client_manager, detail
+
+
+async def scenario_coordinator_refresh_30d(
+    server: FakeThamesWaterServer,
+) -> tuple[object, str]:
+    """First coordinator refresh: login, 30 days and the statistics writes."""
+
+    async def _run(coordinator) -> str:
+        data = await coordinator._async_update_data()
+        return f"latest day {data.latest_day.date if data.latest_day else None}"
+
+    return await _async_coordinator_run(server, _run)
+
+
+async def scenario_coordinator_backfill_365d(
+    server: FakeThamesWaterServer,
+) -> tuple[object, str]:
+    """A year fetched and imported through the coordinator's backfill path."""
+
+    async def _run(coordinator) -> str:
+        end = _end_date(server)
+        days = await coordinator.async_fetch_days(end - datetime.timedelta(days=364), end)
+        total, _ = await coordinator.async_import_days(days, 0.0, {})
+        return f"{total:.0f} L imported"
+
+    return await _async_coordinator_run(server, _run)
+
+
+async def scenario_coordinator_monthly_3y(
+    server: FakeThamesWaterServer,
+) -> tuple[object, str]:
+    """Three years of monthly totals imported as provisional statistics."""
+
+    async def _run(coordinator) -> str:
+        end = _end_date(server)
+        periods = await coordinator.async_fetch_totals(
+            end - datetime.timedelta(days=3 * 365), end, "M"
+        )
+        if periods is None:
+            return "fetch failed"
+        total, _ = await coordinator.async_import_totals(periods, 0.0, {})
+        return f"{len(periods)} months, {total:.0f} L imported"
+
+    return await _async_coordinator_run(server, _run)
+
+
+SCENARIOS: dict[str, Callable] = {
+    "client_login": scenario_client_login,
+    "client_30d": scenario_client_30d,
+    "async_backfill_365d": scenario_async_backfill_365d,
+    "coordinator_refresh_30d": scenario_coordinator_refresh_30d,
+    "coordinator_backfill_365d": scenario_coordinator_backfill_365d,
+    "coordinator_monthly_3y": scenario_coordinator_monthly_3y,
+}
+
+
+def run_scenario(name: str, config: FakeServerConfig) -> Result:
+    """Run one scenario against a fresh fake server."""
+    scenario = SCENARIOS[name]
+    with FakeServerThread(config) as server:
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(scenario):
+                client, detail = asyncio.run(scenario(server))
+            else:
+                client, detail = scenario(server)
+                client.close()
+            wall_time = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        stats = client.request_stats
+        return Result(
+            scenario=name,
+            server_requests=server.requests["total"],
+            client_requests=stats.requests,
+            client_retries=stats.retries,
+            throttled=stats.throttled,
+            wall_time=wall_time,
+            peak_memory_kib=peak / 1024,
+            detail=detail,
+        )
+
+
+def main() -> None:
+    """Run the selected scenarios and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), dest="scenarios"
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--missing-hour-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args()
+
+    config = FakeServerConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        missing_hour_rate=args.missing_hour_rate,
+        seed=args.seed,
+    )
+
+    results: list[Result] = []
+    print(
+        f"{'scenario':<28}{'server':>8}{'client':>8}{'retries':>9}{'429s':>6}"
+        f"{'wall s':>9}{'peak KiB':>11}  detail"
+    )
+    for name in args.scenarios or SCENARIOS:
+        try:
+            result = run_scenario(name, config)
+        except Skipped as err:
+            print(f"{name:<28}skipped: {err}")
+            continue
+        results.append(result)
+        print(
+            f"{result.scenario:<28}{result.server_requests:>8}{result.client_requests:>8}"
+            f"{result.client_retries:>9}{result.throttled:>6}{result.wall_time:>9.2f}"
+            f"{result.peak_memory_kib:>11.0f}  {result.detail}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
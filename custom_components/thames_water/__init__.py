@@ -1,17 +1,64 @@
 """Init for the Thames Water integration."""
 
+import logging
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
 
+from .backfill import BACKFILL_STORAGE_VERSION
+from .cache import CACHE_STORAGE_VERSION
+from .client_manager import SESSION_STORAGE_VERSION
 from .const import DOMAIN
 from .coordinator import ThamesWaterCoordinator
+from .gaps import GAPS_STORAGE_VERSION
+from .leak import LEAK_STORAGE_VERSION
+from .hub import account_session_key, async_get_account, async_release_account
+from .rolling import ROLLING_STORAGE_VERSION
+from .schedule import SCHEDULE_STORAGE_VERSION
+from .services import async_setup_services
+
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR, Platform.NUMBER]
 
-PLATFORMS = [Platform.SENSOR, Platform.NUMBER]
+# Device identifier used before every meter got its own device.
+LEGACY_DEVICE_IDENTIFIER = (DOMAIN, "thames_water")
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the Thames Water component."""
+    async_setup_services(hass)
+    return True
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version > 1:
+        return False
+
+    if entry.minor_version < 2:
+        # Only one entry could exist before multi-meter support. It keeps its
+        # statistic IDs so the history in the Energy dashboard carries on,
+        # and its device becomes the device of its meter.
+        meter_id = entry.data["meter_id"]
+        device_registry = dr.async_get(hass)
+        device = device_registry.async_get_device(
+            identifiers={LEGACY_DEVICE_IDENTIFIER}
+        )
+        if device is not None:
+            device_registry.async_update_device(
+                device.id, new_identifiers={(DOMAIN, meter_id)}
+            )
+        hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, "legacy_statistic_ids": True},
+            minor_version=2,
+        )
+        _LOGGER.debug("Migrated Thames Water entry %s to version 1.2", entry.entry_id)
+
     return True
 
 
@@ -19,15 +66,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Thames Water from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = ThamesWaterCoordinator(hass, entry)
+    # Meters of the same account share one authenticated session.
+    account = entry.runtime_data = async_get_account(hass, entry)
+    coordinator = ThamesWaterCoordinator(hass, entry, account.client_manager)
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Forward platform setups first so their modules are imported before the
-    # first coordinator refresh runs (avoids blocking-import warnings in HA 2025+).
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    try:
+        # Forward platform setups first so their modules are imported before the
+        # first coordinator refresh runs (avoids blocking-import warnings in HA 2025+).
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+        # First refresh runs last; raises ConfigEntryNotReady on failure.
+        await coordinator.async_config_entry_first_refresh()
+    except BaseException:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await async_release_account(hass, entry)
+        raise
 
-    # First refresh runs last; raises ConfigEntryNotReady on failure.
-    await coordinator.async_config_entry_first_refresh()
+    account.async_add_coordinator(coordinator)
+
+    # Continue a backfill that was interrupted by a restart.
+    coordinator.backfill.async_resume()
 
     return True
 
@@ -37,4 +96,40 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await async_release_account(hass, entry)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Delete the stored session, cache, backfill checkpoint and learned state of an entry."""
+    # Sessions were stored per entry before they were shared per account.
+    await Store(
+        hass, SESSION_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.session"
+    ).async_remove()
+    account_number = str(entry.data["account_number"]).strip()
+    if not any(
+        str(other.data.get("account_number", "")).strip() == account_number
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        await Store(
+            hass, SESSION_STORAGE_VERSION, account_session_key(account_number)
+        ).async_remove()
+    await Store(
+        hass, CACHE_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.usage_cache"
+    ).async_remove()
+    await Store(
+        hass, BACKFILL_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.backfill"
+    ).async_remove()
+    await Store(
+        hass, GAPS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.gaps"
+    ).async_remove()
+    await Store(
+        hass, SCHEDULE_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.schedule"
+    ).async_remove()
+    await Store(
+        hass, LEAK_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.leak"
+    ).async_remove()
+    await Store(
+        hass, ROLLING_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.rolling"
+    ).async_remove()
@@ -0,0 +1,373 @@
+"""Resumable historical backfill for the Thames Water integration."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+from datetime import timedelta
+import logging
+from typing import TYPE_CHECKING, Literal
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .statistics import (
+    async_get_first_start,
+    async_get_sum_before,
+    async_rewrite_sums,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import ThamesWaterCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+BACKFILL_STORAGE_VERSION = 1
+BACKFILL_CHUNK_DAYS = 14
+BACKFILL_CHUNK_ATTEMPTS = 3
+BACKFILL_RETRY_DELAY = 300
+# Days loaded hourly at the end of a daily or monthly backfill.
+DEFAULT_REFINE_DAYS = 30
+
+
+def _day_start_utc(date: datetime.date) -> datetime.datetime:
+    """Return local midnight of a date in UTC."""
+    return dt_util.as_utc(dt_util.start_of_local_day(date))
+
+
+class ThamesWaterBackfill:
+    """Load a historical date range chunk by chunk in the background.
+
+    After every chunk the next date and the running sums are saved to a
+    Store, so a restart or network failure resumes where it stopped. Once
+    the range is written, the sums of any statistics after it are rewritten
+    so that they continue from the backfilled history.
+
+    A daily or monthly backfill first loads totals a calendar year at a time
+    as provisional statistics, then the refine_days at the end of the range
+    hourly. Backfilling a provisional range hourly later replaces it. Totals
+    stop before the first statistic already recorded in the coarse range, so
+    real hourly readings are never replaced by provisional ones.
+    """
+
+    def __init__(self, coordinator: ThamesWaterCoordinator) -> None:
+        """Initialise the backfill."""
+        self._coordinator = coordinator
+        self._hass: HomeAssistant = coordinator.hass
+        self._entry = coordinator.config_entry
+        self._store: Store[dict] = Store(
+            self._hass,
+            BACKFILL_STORAGE_VERSION,
+            f"{DOMAIN}.{self._entry.entry_id}.backfill",
+        )
+        self._checkpoint: dict | None = None
+        self._task: asyncio.Task | None = None
+        self._notification_id = f"{DOMAIN}_backfill_{self._entry.entry_id}"
+
+    @property
+    def running(self) -> bool:
+        """Return True while a backfill task is active."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def checkpoint(self) -> dict | None:
+        """Return the progress of the current or interrupted backfill."""
+        return self._checkpoint
+
+    async def async_load(self) -> None:
+        """Load a checkpoint left by an interrupted backfill."""
+        self._checkpoint = await self._store.async_load()
+
+    async def async_start(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        granularity: Literal["H", "D", "M"] = "H",
+        refine_days: int = DEFAULT_REFINE_DAYS,
+        restart: bool = False,
+    ) -> None:
+        """Start backfilling from start to end inclusive.
+
+        An interrupted backfill with the same parameters is resumed. One with
+        different parameters is only replaced when restart is set.
+        """
+        if self.running:
+            raise HomeAssistantError("A Thames Water backfill is already running")
+        refine_from = start
+        if granularity != "H":
+            refine_from = max(start, end - timedelta(days=refine_days - 1))
+            if granularity == "M":
+                # Monthly totals cover whole months only.
+                start = start.replace(day=1)
+                refine_from = refine_from.replace(day=1)
+        checkpoint = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "next": start.isoformat(),
+            "granularity": granularity,
+            "refine_from": refine_from.isoformat(),
+        }
+        if self._checkpoint is not None and not restart:
+            if any(
+                self._checkpoint.get(key) != checkpoint[key]
+                for key in ("start", "end", "granularity", "refine_from")
+            ):
+                raise ServiceValidationError(
+                    "An unfinished backfill of "
+                    f"{self._checkpoint['start']} to {self._checkpoint['end']} "
+                    "exists; repeat its parameters to resume it or set restart "
+                    "to replace it"
+                )
+            _LOGGER.info(
+                "Resuming the unfinished backfill of %s to %s",
+                self._checkpoint["start"],
+                self._checkpoint["end"],
+            )
+        else:
+            if self._checkpoint is not None:
+                _LOGGER.warning(
+                    "Discarding the unfinished backfill of %s to %s",
+                    self._checkpoint["start"],
+                    self._checkpoint["end"],
+                )
+            self._checkpoint = checkpoint
+            await self._store.async_save(self._checkpoint)
+        self._spawn()
+
+    def async_resume(self) -> None:
+        """Continue an interrupted backfill, if there is one."""
+        if self._checkpoint is not None and not self.running:
+            _LOGGER.info(
+                "Resuming backfill of %s to %s from %s",
+                self._checkpoint["start"],
+                self._checkpoint["end"],
+                self._checkpoint["next"],
+            )
+            self._spawn()
+
+    def _spawn(self) -> None:
+        """Run the backfill as a background task tied to the config entry."""
+        self._task = self._entry.async_create_background_task(
+            self._hass, self._async_run(), f"{DOMAIN} backfill {self._entry.entry_id}"
+        )
+
+    def _notify(self, message: str) -> None:
+        """Report progress in a persistent notification."""
+        persistent_notification.async_create(
+            self._hass,
+            message,
+            title="Thames Water backfill",
+            notification_id=self._notification_id,
+        )
+
+    async def _async_run(self) -> None:
+        """Fetch and import the remaining chunks, then fix up later sums."""
+        checkpoint = self._checkpoint
+        assert checkpoint is not None
+        coordinator = self._coordinator
+        start = datetime.date.fromisoformat(checkpoint["start"])
+        end = datetime.date.fromisoformat(checkpoint["end"])
+        granularity = checkpoint.get("granularity", "H")
+        refine_from = datetime.date.fromisoformat(
+            checkpoint.get("refine_from", checkpoint["start"])
+        )
+        total_days = (end - start).days + 1
+
+        try:
+            if "cost_sums" not in checkpoint:
+                range_start = _day_start_utc(start)
+                if start < refine_from:
+                    checkpoint["coarse_until"] = (
+                        await self._async_coarse_until(start, refine_from, granularity)
+                    ).isoformat()
+                cost_stat_ids = coordinator.cost_statistic_ids
+                checkpoint["sum"], *cost_sums = await asyncio.gather(
+                    async_get_sum_before(
+                        self._hass, coordinator.consumption_statistic_id, range_start
+                    ),
+                    *(
+                        async_get_sum_before(self._hass, stat_id, range_start)
+                        for stat_id in cost_stat_ids.values()
+                    ),
+                )
+                checkpoint["cost_sums"] = dict(zip(cost_stat_ids, cost_sums))
+
+            coarse_until = datetime.date.fromisoformat(
+                checkpoint.get("coarse_until", refine_from.isoformat())
+            )
+            current = datetime.date.fromisoformat(checkpoint["next"])
+            while current <= end:
+                if coarse_until <= current < refine_from:
+                    # Hourly statistics already exist from here on. They are
+                    # kept, and their sums continue from the loaded totals.
+                    async with coordinator.statistics_lock:
+                        await self._async_continue_sums(current, refine_from)
+                    current = refine_from
+                    checkpoint["next"] = current.isoformat()
+                    await self._store.async_save(checkpoint)
+                    continue
+                if current < refine_from:
+                    chunk_end = min(
+                        datetime.date(current.year, 12, 31),
+                        coarse_until - timedelta(days=1),
+                    )
+                    periods = await self._async_fetch_totals_chunk(
+                        current, chunk_end, granularity
+                    )
+                    async with coordinator.statistics_lock:
+                        checkpoint["sum"], checkpoint["cost_sums"] = (
+                            await coordinator.async_import_totals(
+                                periods, checkpoint["sum"], checkpoint["cost_sums"]
+                            )
+                        )
+                else:
+                    chunk_end = min(
+                        current + timedelta(days=BACKFILL_CHUNK_DAYS - 1), end
+                    )
+                    days = await self._async_fetch_chunk(current, chunk_end)
+                    async with coordinator.statistics_lock:
+                        checkpoint["sum"], checkpoint["cost_sums"] = (
+                            await coordinator.async_import_days(
+                                days, checkpoint["sum"], checkpoint["cost_sums"]
+                            )
+                        )
+
+                current = chunk_end + timedelta(days=1)
+                checkpoint["next"] = current.isoformat()
+                await self._store.async_save(checkpoint)
+
+                done_days = min((current - start).days, total_days)
+                self._notify(
+                    f"Loaded {done_days} of {total_days} days "
+                    f"({start.isoformat()} to {end.isoformat()})."
+                )
+
+            # Statistics written before the backfill carry sums that do not
+            # include it; rewrite them to continue from the backfilled total.
+            after = _day_start_utc(end + timedelta(days=1))
+            async with coordinator.statistics_lock:
+                await async_rewrite_sums(
+                    self._hass,
+                    coordinator.consumption_metadata,
+                    after,
+                    checkpoint["sum"],
+                )
+                for component, metadata in coordinator.cost_metadata.items():
+                    await async_rewrite_sums(
+                        self._hass,
+                        metadata,
+                        after,
+                        checkpoint["cost_sums"].get(component, 0.0),
+                    )
+        except asyncio.CancelledError:
+            # Unloading the entry; the checkpoint is kept for the next start.
+            raise
+        except Exception as err:
+            _LOGGER.error("Thames Water backfill stopped: %s", err)
+            self._notify(
+                f"Backfill stopped at {checkpoint['next']}: {err}. "
+                "Call the backfill service again or restart Home Assistant to resume."
+            )
+            return
+
+        self._checkpoint = None
+        await self._store.async_remove()
+        self._notify(
+            f"Finished loading {total_days} days ({start.isoformat()} to {end.isoformat()})."
+        )
+        _LOGGER.info("Thames Water backfill of %s to %s finished", start, end)
+
+    async def _async_coarse_until(
+        self,
+        start: datetime.date,
+        refine_from: datetime.date,
+        granularity: Literal["D", "M"],
+    ) -> datetime.date:
+        """Return the day the coarse phase stops before.
+
+        Provisional totals must not replace real hourly statistics, so the
+        coarse phase ends before the first day, or for monthly totals the
+        first month, that already has a consumption statistic.
+        """
+        first = await async_get_first_start(
+            self._hass,
+            self._coordinator.consumption_statistic_id,
+            _day_start_utc(start),
+            _day_start_utc(refine_from),
+        )
+        if first is None:
+            return refine_from
+        until = max(dt_util.as_local(first).date(), start)
+        if granularity == "M":
+            until = until.replace(day=1)
+        _LOGGER.info(
+            "Statistics already exist from %s, loading totals up to %s only",
+            first,
+            until,
+        )
+        return until
+
+    async def _async_continue_sums(
+        self, start: datetime.date, end: datetime.date
+    ) -> None:
+        """Rewrite the sums of existing rows from start to before end.
+
+        The checkpoint sums then continue after those rows.
+        """
+        checkpoint = self._checkpoint
+        assert checkpoint is not None
+        coordinator = self._coordinator
+        range_start, range_end = _day_start_utc(start), _day_start_utc(end)
+        checkpoint["sum"] = await async_rewrite_sums(
+            self._hass,
+            coordinator.consumption_metadata,
+            range_start,
+            checkpoint["sum"],
+            range_end,
+        )
+        for component, metadata in coordinator.cost_metadata.items():
+            checkpoint["cost_sums"][component] = await async_rewrite_sums(
+                self._hass,
+                metadata,
+                range_start,
+                checkpoint["cost_sums"].get(component, 0.0),
+                range_end,
+            )
+
+    async def _async_fetch_chunk(
+        self, start: datetime.date, end: datetime.date
+    ) -> list:
+        """Fetch a chunk, retrying while any of its days fail."""
+        for attempt in range(1, BACKFILL_CHUNK_ATTEMPTS + 1):
+            days = await self._coordinator.async_fetch_days(start, end)
+            if all(data is not None for _, data in days):
+                return days
+            if attempt < BACKFILL_CHUNK_ATTEMPTS:
+                _LOGGER.warning(
+                    "Backfill chunk %s to %s incomplete, retrying in %ss",
+                    start, end, BACKFILL_RETRY_DELAY,
+                )
+                await asyncio.sleep(BACKFILL_RETRY_DELAY)
+        raise HomeAssistantError(f"Could not fetch {start} to {end}")
+
+    async def _async_fetch_totals_chunk(
+        self, start: datetime.date, end: datetime.date, granularity: Literal["D", "M"]
+    ) -> list:
+        """Fetch the daily or monthly totals of a chunk, retrying on failure."""
+        for attempt in range(1, BACKFILL_CHUNK_ATTEMPTS + 1):
+            periods = await self._coordinator.async_fetch_totals(
+                start, end, granularity
+            )
+            if periods is not None:
+                return periods
+            if attempt < BACKFILL_CHUNK_ATTEMPTS:
+                _LOGGER.warning(
+                    "Backfill totals for %s to %s incomplete, retrying in %ss",
+                    start, end, BACKFILL_RETRY_DELAY,
+                )
+                await asyncio.sleep(BACKFILL_RETRY_DELAY)
+        raise HomeAssistantError(f"Could not fetch totals for {start} to {end}")
@@ -0,0 +1,118 @@
+"""Binary sensor platform for the Thames Water integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import ThamesWaterCoordinator
+from .entity import ThamesWaterEntity, meter_device_info
+from .leak import LeakState
+
+
+def _round(value: float | None) -> float | None:
+    """Round an attribute value to two decimals."""
+    return None if value is None else round(value, 2)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ThamesWaterBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Extends BinarySensorEntityDescription with leak state accessors."""
+
+    is_on_fn: Callable[[LeakState], bool | None]
+    attributes_fn: Callable[[LeakState], dict[str, Any]]
+
+
+BINARY_SENSOR_DESCRIPTIONS: tuple[ThamesWaterBinarySensorEntityDescription, ...] = (
+    ThamesWaterBinarySensorEntityDescription(
+        key="leak",
+        translation_key="leak",
+        device_class=BinarySensorDeviceClass.MOISTURE,
+        is_on_fn=lambda state: state.leak,
+        attributes_fn=lambda state: {
+            "continuous_flow_hours": state.flow_hours,
+            "min_flow_average": _round(state.min_flow_average),
+        },
+    ),
+    ThamesWaterBinarySensorEntityDescription(
+        key="unusual_night_usage",
+        translation_key="unusual_night_usage",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        is_on_fn=lambda state: state.unusual_night,
+        attributes_fn=lambda state: {
+            "last_night_usage": _round(state.last_night_usage),
+            "night_baseline": _round(state.night_baseline),
+            "nights": state.nights,
+        },
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> bool:
+    """Set up Thames Water binary sensor platform."""
+    coordinator: ThamesWaterCoordinator = hass.data[DOMAIN][entry.entry_id]
+    meter_id = entry.data.get("meter_id", "")
+
+    async_add_entities(
+        ThamesWaterLeakBinarySensor(coordinator, description, meter_id)
+        for description in BINARY_SENSOR_DESCRIPTIONS
+    )
+    return True
+
+
+class ThamesWaterLeakBinarySensor(
+    CoordinatorEntity[ThamesWaterCoordinator],
+    ThamesWaterEntity,
+    BinarySensorEntity,
+):
+    """Binary sensor driven by the meter's leak-detection state."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: ThamesWaterCoordinator,
+        description: ThamesWaterBinarySensorEntityDescription,
+        meter_id: str,
+    ) -> None:
+        """Initialise the binary sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{description.key}_{meter_id}"
+        self._attr_device_info = meter_device_info(meter_id)
+
+    @property
+    def _leak_state(self) -> LeakState | None:
+        """Return the leak state of the last refresh, once any hour was analysed."""
+        data = self.coordinator.data
+        if data is None or data.leak is None or data.leak.last_hour is None:
+            return None
+        return data.leak
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the detection result."""
+        state = self._leak_state
+        return None if state is None else self.entity_description.is_on_fn(state)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the rolling values behind the detection."""
+        state = self._leak_state
+        return None if state is None else self.entity_description.attributes_fn(state)
@@ -0,0 +1,126 @@
+"""Persistent per-day cache of Thames Water meter usage responses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import asdict
+import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .readings import expected_lines
+from .thameswaterclient import MeterUsage
+
+_LOGGER = logging.getLogger(__name__)
+
+# 2: lines are stored as raw [Label, Usage, Read] lists.
+CACHE_STORAGE_VERSION = 2
+CACHE_SAVE_DELAY = 30
+MAX_CACHE_ENTRIES = 1000
+
+# Complete days never change on the server, so only partial answers expire.
+INCOMPLETE_DAY_TTL = datetime.timedelta(hours=6)
+ERROR_DAY_TTL = datetime.timedelta(hours=1)
+
+
+def _cache_key(meter: str, date: datetime.date, granularity: str) -> str:
+    """Return the storage key for a (meter, date, granularity) entry."""
+    return f"{meter}|{date.isoformat()}|{granularity}"
+
+
+def _ttl_for(
+    usage: MeterUsage, date: datetime.date, granularity: str
+) -> datetime.timedelta | None:
+    """Return how long a payload stays valid, or None if it never expires."""
+    if usage.IsError or usage.IsDataAvailable is False or usage.Lines is None:
+        return ERROR_DAY_TTL
+    if granularity == "H" and len(usage.Lines) < expected_lines(
+        date, dt_util.get_default_time_zone()
+    ):
+        return INCOMPLETE_DAY_TTL
+    return None
+
+
+class _MeterUsageStore(Store[dict]):
+    """Store that drops entries written in an older layout."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict
+    ) -> dict[str, Any]:
+        """Start over rather than convert; the days are simply fetched again."""
+        return {"entries": {}}
+
+
+class MeterUsageCache:
+    """LRU cache of per-day MeterUsage payloads persisted in a Store.
+
+    Payloads are kept with raw (Label, Usage, Read) lines, as fetched by the
+    coordinator.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        storage_key: str,
+        max_entries: int = MAX_CACHE_ENTRIES,
+    ) -> None:
+        """Initialise the cache."""
+        self._store = _MeterUsageStore(hass, CACHE_STORAGE_VERSION, storage_key)
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    async def async_load(self) -> None:
+        """Load cached entries from disk, oldest-used first."""
+        stored = await self._store.async_load()
+        if stored:
+            self._entries = OrderedDict(stored.get("entries", {}))
+        _LOGGER.debug("Loaded %d cached meter usage days", len(self._entries))
+
+    def get(
+        self, meter: str, date: datetime.date, granularity: str = "H"
+    ) -> MeterUsage | None:
+        """Return the cached payload for a day, or None if missing or expired."""
+        key = _cache_key(meter, date, granularity)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires = entry.get("expires")
+        if expires is not None and expires <= dt_util.utcnow().timestamp():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        payload = dict(entry["payload"])
+        lines = payload["Lines"]
+        payload["Lines"] = None if lines is None else [tuple(line) for line in lines]
+        return MeterUsage(**payload)
+
+    def put(
+        self,
+        meter: str,
+        date: datetime.date,
+        usage: MeterUsage,
+        granularity: str = "H",
+    ) -> None:
+        """Cache a day's payload and schedule a save."""
+        key = _cache_key(meter, date, granularity)
+        ttl = _ttl_for(usage, date, granularity)
+        self._entries[key] = {
+            "payload": asdict(usage),
+            "expires": None if ttl is None else (dt_util.utcnow() + ttl).timestamp(),
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {"entries": self._entries}
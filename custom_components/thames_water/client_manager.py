@@ -0,0 +1,178 @@
+"""Lifecycle management for the authenticated Thames Water client."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import Literal
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
+
+from .thameswaterclient import (
+    DEFAULT_ENDPOINTS,
+    MeterUsage,
+    RequestStats,
+    ThamesWaterAuthError,
+    TokenBucket,
+)
+from .thameswaterclient_async import AsyncThamesWater
+
+_LOGGER = logging.getLogger(__name__)
+
+AUTH_TIMEOUT = 120
+# Covers the client's own retries and Retry-After waits.
+USAGE_TIMEOUT = 120
+SESSION_STORAGE_VERSION = 1
+
+
+class ThamesWaterClientManager:
+    """Keep one authenticated AsyncThamesWater session alive across refreshes.
+
+    Each client gets its own aiohttp session with a private cookie jar on top
+    of Home Assistant's shared connection pool. The client is created lazily
+    on first use and reused until a usage call fails with an authentication
+    error, at which point it is discarded and a fresh login is performed once
+    before retrying the call.
+
+    OAuth tokens and session cookies are persisted in a private Store so that
+    new clients, including the first one after a restart, resume the session
+    with the refresh_token grant and only fall back to the password flow when
+    that is rejected.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        account_number: str,
+        storage_key: str,
+    ) -> None:
+        """Initialise the manager."""
+        self._hass = hass
+        self._username = username
+        self._password = password
+        self._account_number = account_number
+        self._client: AsyncThamesWater | None = None
+        self._lock = asyncio.Lock()
+        self._store: Store[dict] = Store(
+            hass, SESSION_STORAGE_VERSION, storage_key, private=True
+        )
+        self._session_state: dict | None = None
+        self._session_loaded = False
+        # Shared by every client so limits and counters survive re-logins.
+        self.rate_limiter = TokenBucket()
+        self.request_stats = RequestStats()
+        self.endpoints = DEFAULT_ENDPOINTS
+
+    @property
+    def authenticated(self) -> bool:
+        """Return True if a live session is currently held."""
+        return self._client is not None
+
+    @callback
+    def async_update_credentials(self, username: str, password: str) -> None:
+        """Use new credentials for every login from now on.
+
+        The live session is kept, but the next login, including one by the
+        live client itself, uses the new credentials.
+        """
+        if (username, password) == (self._username, self._password):
+            return
+        _LOGGER.debug("Thames Water credentials changed")
+        self._username = username
+        self._password = password
+        if self._client is not None:
+            self._client.email = username
+            self._client.password = password
+
+    async def async_get_client(self) -> AsyncThamesWater:
+        """Return the live client, logging in if there is none."""
+        async with self._lock:
+            if self._client is None:
+                if not self._session_loaded:
+                    self._session_state = await self._store.async_load()
+                    self._session_loaded = True
+
+                _LOGGER.debug("Creating Thames Water client")
+                session = async_create_clientsession(
+                    self._hass, cookie_jar=aiohttp.CookieJar(quote_cookie=False)
+                )
+                try:
+                    async with asyncio.timeout(AUTH_TIMEOUT):
+                        self._client = await AsyncThamesWater.async_create(
+                            session,
+                            self._username,
+                            self._password,
+                            self._account_number,
+                            session_state=self._session_state,
+                            rate_limiter=self.rate_limiter,
+                            request_stats=self.request_stats,
+                            endpoints=self.endpoints,
+                        )
+                except BaseException:
+                    await session.close()
+                    raise
+                await self._async_save_session(self._client)
+            return self._client
+
+    async def _async_save_session(self, client: AsyncThamesWater) -> None:
+        """Persist the client's tokens and cookies."""
+        self._session_state = client.export_session()
+        await self._store.async_save(self._session_state)
+
+    async def async_get_meter_usage(
+        self,
+        meter: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        granularity: Literal["H", "D", "M"] = "H",
+        raw: bool = False,
+    ) -> MeterUsage:
+        """Fetch meter usage, re-authenticating once if the session expired."""
+        client = await self.async_get_client()
+        try:
+            return await self._async_call_usage(
+                client, meter, start, end, granularity, raw
+            )
+        except ThamesWaterAuthError as err:
+            _LOGGER.info("Thames Water session expired (%s), logging in again", err)
+            await self._async_invalidate(client)
+
+        client = await self.async_get_client()
+        return await self._async_call_usage(client, meter, start, end, granularity, raw)
+
+    async def _async_call_usage(
+        self,
+        client: AsyncThamesWater,
+        meter: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        granularity: Literal["H", "D", "M"],
+        raw: bool,
+    ) -> MeterUsage:
+        """Run a single usage request, cancelling it on timeout."""
+        async with asyncio.timeout(USAGE_TIMEOUT):
+            return await client.get_meter_usage(meter, start, end, granularity, raw)
+
+    async def _async_invalidate(self, client: AsyncThamesWater) -> None:
+        """Drop the given client unless another caller already replaced it."""
+        async with self._lock:
+            if self._client is client:
+                self._client = None
+                # The refresh token usually outlives the website session.
+                await self._async_save_session(client)
+        await client.async_close()
+
+    async def async_close(self) -> None:
+        """Close the session and release its connection pool."""
+        async with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            await self._async_save_session(client)
+            await client.async_close()
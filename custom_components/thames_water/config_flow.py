@@ -8,21 +8,27 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult
 
-from .const import DEFAULT_LITER_COST, DOMAIN
+from .const import (
+    DEFAULT_FETCH_WINDOW_DAYS,
+    DEFAULT_LITER_COST,
+    DEFAULT_MAX_CONCURRENT_FETCHES,
+    DOMAIN,
+    MAX_CONCURRENT_FETCHES,
+    MAX_FETCH_WINDOW_DAYS,
+)
 
 
 class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Thames Water."""
 
     VERSION = 1
+    # 2: one entry per meter, with per-meter statistic IDs and devices.
+    MINOR_VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-
         errors = {}
         if user_input is not None:
             errors = self._validate_input(user_input)
@@ -31,7 +37,10 @@ class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 unique_id = self._build_unique_id(user_input)
                 await self.async_set_unique_id(unique_id)
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(title="Thames Water", data=user_input)
+                return self.async_create_entry(
+                    title=f"Thames Water {user_input['meter_id'].strip()}",
+                    data=user_input,
+                )
 
         return self.async_show_form(
             step_id="user", data_schema=self._get_data_schema(), errors=errors
@@ -53,6 +62,10 @@ class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors = self._validate_input(user_input)
 
             if not errors:
+                # The account and meter identify the entry's statistics,
+                # devices and stored state, so only the rest can change.
+                await self.async_set_unique_id(self._build_unique_id(user_input))
+                self._abort_if_unique_id_mismatch(reason="meter_mismatch")
                 return self.async_update_reload_and_abort(
                     self._get_reconfigure_entry(),
                     data_updates=user_input,
@@ -88,6 +101,22 @@ class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except ValueError:
                 errors["fetch_hours"] = "invalid_fetch_hours"
 
+        window_days = user_input.get("fetch_window_days", DEFAULT_FETCH_WINDOW_DAYS)
+        try:
+            if not 1 <= int(window_days) <= MAX_FETCH_WINDOW_DAYS:
+                errors["fetch_window_days"] = "fetch_window_days_out_of_range"
+        except (TypeError, ValueError):
+            errors["fetch_window_days"] = "fetch_window_days_out_of_range"
+
+        concurrency = user_input.get(
+            "max_concurrent_fetches", DEFAULT_MAX_CONCURRENT_FETCHES
+        )
+        try:
+            if not 1 <= int(concurrency) <= MAX_CONCURRENT_FETCHES:
+                errors["max_concurrent_fetches"] = "max_concurrent_fetches_out_of_range"
+        except (TypeError, ValueError):
+            errors["max_concurrent_fetches"] = "max_concurrent_fetches_out_of_range"
+
         no_data_before_str = user_input.get("no_data_before", "").strip()
         if no_data_before_str:
             try:
@@ -135,6 +164,16 @@ class ThamesWaterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "fetch_hours",
                     default=defaults.get("fetch_hours", "15,23"),
                 ): str,
+                vol.Optional(
+                    "fetch_window_days",
+                    default=defaults.get("fetch_window_days", DEFAULT_FETCH_WINDOW_DAYS),
+                ): int,
+                vol.Optional(
+                    "max_concurrent_fetches",
+                    default=defaults.get(
+                        "max_concurrent_fetches", DEFAULT_MAX_CONCURRENT_FETCHES
+                    ),
+                ): int,
                 vol.Optional(
                     "no_data_before",
                     default=defaults.get("no_data_before", ""),
@@ -2,3 +2,11 @@
 
 DOMAIN = "thames_water"
 DEFAULT_LITER_COST = 0.0042067
+DEFAULT_FETCH_WINDOW_DAYS = 7
+MAX_FETCH_WINDOW_DAYS = 31
+DEFAULT_MAX_CONCURRENT_FETCHES = 4
+MAX_CONCURRENT_FETCHES = 10
+DEFAULT_FETCH_HOURS = [15, 23]
+
+# hass.data key of the ThamesWaterAccount objects, by account number.
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
@@ -3,32 +3,77 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, replace
 import datetime
 from datetime import timedelta
+from itertools import islice, repeat
 import logging
+import time
+from typing import Literal
 
 from homeassistant.components.recorder import get_instance
-from homeassistant.components.recorder.models import (
-    StatisticData,
-    StatisticMeanType,
-    StatisticMetaData,
-)
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
 from homeassistant.components.recorder.statistics import (
     async_add_external_statistics,
     get_last_statistics,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfVolume
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util import dt as dt_util
+from homeassistant.util import dt as dt_util, slugify
 
-from .const import DEFAULT_LITER_COST, DOMAIN
-from .thameswaterclient import ThamesWater
+from .backfill import ThamesWaterBackfill
+from .cache import MeterUsageCache
+from .client_manager import ThamesWaterClientManager
+from .const import (
+    DEFAULT_FETCH_WINDOW_DAYS,
+    DEFAULT_LITER_COST,
+    DEFAULT_MAX_CONCURRENT_FETCHES,
+    DOMAIN,
+    MAX_FETCH_WINDOW_DAYS,
+)
+from .gaps import (
+    GAP_ERROR,
+    GAP_MISSING,
+    GAP_NO_DATA,
+    GAP_PARTIAL,
+    GapIndex,
+)
+from .leak import LeakDetector, LeakState
+from .metrics import RefreshMetrics
+from .readings import ReadingsBuffer, day_utc_hours, expected_lines
+from .rolling import RollingAggregates, RollingUsage
+from .schedule import PublicationModel
+from .statistics import (
+    CONSUMPTION_STATISTIC,
+    READ_BATCH,
+    async_get_statistics_rows,
+    async_get_sum_before,
+    async_rewrite_sums,
+    consumption_metadata,
+    cost_metadata,
+    cost_statistic_ids,
+)
+from .tariff import Tariff
+from .thameswaterclient import MeterUsage, request_stats_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Throttling and transient HTTP errors are already retried by the client.
+FETCH_ATTEMPTS = 2
+FETCH_RETRY_DELAY = 5
+# Statistics are written a week of hours at a time to keep memory flat.
+STATISTICS_BATCH_HOURS = 168
+# Periods requested per call when loading daily or monthly totals.
+COARSE_WINDOW_PERIODS = {"D": MAX_FETCH_WINDOW_DAYS, "M": 12}
+# Days taken from the gap index on each refresh.
+REPAIR_DAYS_PER_REFRESH = 7
+# Refreshes look for days up to yesterday. Days are usually published about
+# three days late, but incomplete days are deferred rather than imported, so
+# asking early only finds a day sooner.
+NEWEST_DAY_OFFSET = timedelta(days=1)
+
 
 @dataclass
 class DayData:
@@ -47,75 +92,326 @@ class ThamesWaterData:
     latest_day: DayData | None
     latest_reading: float
     last_data_time: datetime.datetime
+    refresh: RefreshMetrics | None = None
+    leak: LeakState | None = None
+    rolling: RollingAggregates | None = None
 
 
-def _process_day_lines(
-    day_dt: datetime.datetime,
-    lines: list,
-    readings: list[dict],
-) -> tuple[float, DayData]:
-    """Process hourly lines for a day.
+# Lines are labelled with their time of day, "00:00" to "23:00". The labels
+# are mapped to minutes past midnight without going through the parser.
+_LABEL_MINUTES: dict[str, int] = {
+    f"{hour:02d}:{minute:02d}": hour * 60 + minute
+    for hour in range(24)
+    for minute in (0, 30)
+}
+
 
-    Appends to the shared readings list and returns (last_read, DayData).
+def _label_minutes(label: str) -> int | None:
+    """Return the minutes past midnight of a line label, or None if invalid."""
+    minutes = _LABEL_MINUTES.get(label)
+    if minutes is None:
+        t = dt_util.parse_time(label)
+        if t is None:
+            return None
+        minutes = t.hour * 60 + t.minute
+    return minutes
+
+
+def _process_days(
+    days: Iterable[tuple[datetime.datetime, list]],
+    readings: ReadingsBuffer,
+    after_hour: int | None = None,
+) -> tuple[float, DayData | None]:
+    """Process the hourly lines of consecutive days.
+
+    Appends to the shared readings buffer and returns (last_read, DayData)
+    of the last day processed. Rows at or before after_hour (a UTC epoch
+    hour) are never appended, and days that end by then are skipped whole.
+    A label that repeats within a day is taken to be the second pass through
+    the hour repeated when clocks go back, and readings that land on the
+    same UTC hour are merged.
     """
-    total_usage = 0.0
-    hourly_usages: list[float] = []
+    tz = dt_util.get_default_time_zone()
+    hours, usages = readings.hours, readings.usage
+    watermark = -1 if after_hour is None else after_hour
     last_read = 0.0
+    day_data: DayData | None = None
 
-    for line in lines:
-        time_str = line.Label
-        usage = line.Usage    # Hourly Consumption
-        last_read = line.Read # Total Meter Odometer Value
-
-        t = dt_util.parse_time(time_str)
-        if t is None:
-            _LOGGER.error("Error parsing time %s", time_str)
+    for day_dt, lines in days:
+        utc_hours = day_utc_hours(day_dt.date(), tz)
+        if utc_hours[-1][-1] <= watermark:
             continue
+        previous_minutes = -1
+        total_usage = 0.0
+        min_usage: float | None = None
 
-        naive_datetime = datetime.datetime(
-            day_dt.year, day_dt.month, day_dt.day, t.hour, t.minute
+        # Each line is a raw (Label, Usage, Read) tuple: the time of day, the
+        # hourly consumption and the total meter odometer value.
+        for label, usage, last_read in lines:
+            minutes = _label_minutes(label)
+            if minutes is None:
+                _LOGGER.error("Error parsing time %s", label)
+                continue
+
+            candidates = utc_hours[minutes // 60]
+            hour = candidates[-1] if minutes <= previous_minutes else candidates[0]
+            previous_minutes = minutes
+            if hour > watermark:
+                if hours and hours[-1] == hour:
+                    usages[-1] += usage
+                else:
+                    hours.append(hour)
+                    usages.append(usage)
+            total_usage += usage
+            if min_usage is None or usage < min_usage:
+                min_usage = usage
+
+        day_data = DayData(
+            date=day_dt.date(),
+            total_usage=total_usage, # Daily Consumption
+            min_usage=min_usage or 0.0,
+            last_read=last_read,
         )
-        readings.append({"dt": naive_datetime, "state": usage})
-        total_usage += usage
-        hourly_usages.append(usage)
 
-    min_usage = min(hourly_usages) if hourly_usages else 0.0
+    return last_read, day_data
+
+
+def _date_runs(
+    dates: Iterable[datetime.date],
+) -> list[tuple[datetime.date, datetime.date]]:
+    """Group sorted dates into (first, last) runs of consecutive days."""
+    runs: list[tuple[datetime.date, datetime.date]] = []
+    for date in dates:
+        if runs and runs[-1][1] + timedelta(days=1) == date:
+            runs[-1] = (runs[-1][0], date)
+        else:
+            runs.append((date, date))
+    return runs
+
+
+def _split_lines_by_day(
+    lines: list, window_dates: list[datetime.date]
+) -> list[list] | None:
+    """Split the hourly lines of a multi-day response into per-day buckets.
+
+    Labels only carry the time of day, so a new day starts whenever the hour
+    does not increase, except for the hour repeated when clocks go back.
+    Buckets are assigned to the window's days in order. Fewer buckets than
+    days are returned as they are, because a day missing entirely from the
+    middle of the response would shift every following day, so the caller
+    has to confirm which days they belong to. Returns None when a label
+    cannot be read or there are more buckets than days.
+    """
+    tz = dt_util.get_default_time_zone()
+    buckets: list[list] = []
+    previous_minutes: int | None = None
+    repeat_allowed = False
+    for line in lines:
+        minutes = _label_minutes(line[0])
+        if minutes is None:
+            return None
+        if previous_minutes is None or minutes <= previous_minutes:
+            hour = minutes // 60
+            if (
+                repeat_allowed
+                and hour == previous_minutes // 60
+                and len(day_utc_hours(window_dates[len(buckets) - 1], tz)[hour]) > 1
+            ):
+                repeat_allowed = False
+            else:
+                if len(buckets) == len(window_dates):
+                    return None
+                buckets.append([])
+                repeat_allowed = True
+        buckets[-1].append(line)
+        previous_minutes = minutes
+    return buckets
+
+
+def _iter_reading_batches(
+    days: Iterable[tuple[datetime.datetime, list]],
+    after_hour: int | None = None,
+    batch_hours: int = STATISTICS_BATCH_HOURS,
+) -> Iterator[ReadingsBuffer]:
+    """Lazily process consecutive days into buffers of about batch_hours rows.
+
+    Rows at or before after_hour (a UTC epoch hour) are skipped while the
+    days are processed.
+    """
+    days = iter(days)
+    batch_days = max(1, batch_hours // 24)
+    while chunk := list(islice(days, batch_days)):
+        batch = ReadingsBuffer()
+        _process_days(chunk, batch, after_hour)
+        if batch:
+            yield batch
+
+
+def _coarse_periods(
+    start: datetime.date, end: datetime.date, granularity: Literal["D", "M"]
+) -> list[tuple[datetime.date, datetime.date]]:
+    """Return the first and last day of every day or month from start to end.
+
+    Months are clipped to the range.
+    """
+    periods: list[tuple[datetime.date, datetime.date]] = []
+    current = start
+    while current <= end:
+        if granularity == "D":
+            last = current
+        else:
+            next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+            last = min(next_month - timedelta(days=1), end)
+        periods.append((current, last))
+        current = last + timedelta(days=1)
+    return periods
+
 
-    return last_read, DayData(
-        date=day_dt.date(),
-        total_usage=total_usage, # Daily Consumption
-        min_usage=min_usage,
-        last_read=last_read,
+# Coarse labels name a day or month, such as "05 Jun" or "Jun 2024". Month
+# names are matched here, so reading them does not depend on the locale.
+_MONTH_NUMBERS: dict[str, int] = {
+    name: number
+    for number, name in enumerate(
+        "jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1
     )
+}
+
+
+def _coarse_period_key(
+    date: datetime.date, granularity: Literal["D", "M"]
+) -> tuple[int, int]:
+    """Return the (month, day) or (year, month) a coarse label of a date names."""
+    return (date.month, date.day) if granularity == "D" else (date.year, date.month)
+
+
+def _coarse_label_key(
+    label: str, granularity: Literal["D", "M"]
+) -> tuple[int, int] | None:
+    """Return the (month, day) of a daily label or (year, month) of a monthly one.
+
+    Returns None for a label that cannot be read.
+    """
+    month: int | None = None
+    numbers: list[int] = []
+    for token in label.replace("-", " ").replace("/", " ").split():
+        if token.isdigit():
+            numbers.append(int(token))
+        elif token[:3].lower() in _MONTH_NUMBERS:
+            month = _MONTH_NUMBERS[token[:3].lower()]
+    if month is None or len(numbers) != 1:
+        return None
+    return (month, numbers[0]) if granularity == "D" else (numbers[0], month)
+
+
+def _align_coarse_lines(
+    lines: list,
+    window: list[tuple[datetime.date, datetime.date]],
+    granularity: Literal["D", "M"],
+) -> list[tuple[datetime.date, datetime.date, float]] | None:
+    """Match the lines of a coarse response to the periods of its window.
+
+    Lines are matched by their labels, so periods without a line, such as
+    those before the meter was installed, are left out. When the labels
+    cannot be read, lines are matched in order, and a response with fewer
+    lines than periods is taken to be missing the first ones. Returns None
+    if the lines cannot be matched.
+    """
+    keys = [_coarse_label_key(line[0], granularity) for line in lines]
+    if None not in keys:
+        totals = {key: line[1] for key, line in zip(keys, lines)}
+        periods = [
+            (first, last, totals[key])
+            for first, last in window
+            if (key := _coarse_period_key(first, granularity)) in totals
+        ]
+        return periods if len(periods) == len(lines) else None
+    if len(lines) > len(window):
+        return None
+    return [
+        (first, last, line[1])
+        for (first, last), line in zip(window[len(window) - len(lines) :], lines)
+    ]
+
+
+def _iter_total_batches(
+    periods: Iterable[tuple[datetime.date, datetime.date, float]],
+    batch_hours: int = STATISTICS_BATCH_HOURS,
+) -> Iterator[ReadingsBuffer]:
+    """Spread each period's total evenly over its hours, in buffers of rows."""
+    batch = ReadingsBuffer()
+    for first, last, total in periods:
+        start_hour = int(dt_util.start_of_local_day(first).timestamp()) // 3600
+        end_hour = (
+            int(dt_util.start_of_local_day(last + timedelta(days=1)).timestamp())
+            // 3600
+        )
+        num_hours = end_hour - start_hour
+        batch.hours.extend(range(start_hour, end_hour))
+        batch.usage.extend(repeat(total / num_hours, num_hours))
+        if len(batch) >= batch_hours:
+            yield batch
+            batch = ReadingsBuffer()
+    if batch:
+        yield batch
 
 
 def _generate_statistics_from_readings(
-    readings: list[dict],
-    cumulative_start: float = 0.0,
-    liter_cost: float | None = None,
-) -> list[StatisticData]:
-    """Convert pre-sorted hourly readings into StatisticData entries with cumulative sums."""
-    cumulative = cumulative_start
-    stats: list[StatisticData] = []
-    for elem in readings:
-        hour_ts = elem["dt"].replace(minute=0, second=0, microsecond=0)
-        value = elem["state"] if liter_cost is None else elem["state"] * liter_cost
-        cumulative += value
-        stats.append(
-            StatisticData(
-                start=dt_util.as_utc(hour_ts),
-                state=value,
-                sum=cumulative,
+    readings: ReadingsBuffer,
+    cumulative_start: float,
+    cost_cumulative_starts: dict[str, float],
+    tariff: Tariff,
+) -> tuple[list[StatisticData], dict[str, list[StatisticData]]]:
+    """Convert pre-sorted hourly readings into consumption and cost StatisticData.
+
+    The whole batch is priced by the tariff in one pass, returning one list
+    of cost statistics per component; StatisticData objects are only built
+    at the end.
+    """
+    totals = readings.running_totals()
+    starts = [dt_util.utc_from_timestamp(hour * 3600) for hour in readings.hours]
+    stats = [
+        StatisticData(start=start, state=usage, sum=cumulative_start + total)
+        for start, usage, total in zip(starts, readings.usage, totals)
+    ]
+    return stats, _generate_cost_statistics(
+        readings, starts, cost_cumulative_starts, tariff
+    )
+
+
+def _generate_cost_statistics(
+    readings: ReadingsBuffer,
+    starts: list[datetime.datetime],
+    cost_cumulative_starts: dict[str, float],
+    tariff: Tariff,
+) -> dict[str, list[StatisticData]]:
+    """Price hourly readings and return the cost StatisticData of every component."""
+    cost_stats: dict[str, list[StatisticData]] = {}
+    for component, costs in tariff.price(
+        readings, dt_util.get_default_time_zone()
+    ).items():
+        cumulative = cost_cumulative_starts.get(component, 0.0)
+        component_stats = cost_stats[component] = []
+        for start, cost in zip(starts, costs):
+            cumulative += cost
+            component_stats.append(
+                StatisticData(start=start, state=cost, sum=cumulative)
             )
-        )
-    return stats
+    return cost_stats
 
 
 class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
     """Coordinator for the Thames Water integration."""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-        """Initialise the coordinator."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        client_manager: ThamesWaterClientManager,
+    ) -> None:
+        """Initialise the coordinator for one meter.
+
+        The client manager is shared by every meter of the same account.
+        """
         super().__init__(
             hass,
             _LOGGER,
@@ -123,14 +419,645 @@ class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
             config_entry=config_entry,
             update_interval=None,  # Updates are triggered manually at scheduled hours.
         )
+        self.client_manager = client_manager
+        self.usage_cache = MeterUsageCache(
+            hass, f"{DOMAIN}.{config_entry.entry_id}.usage_cache"
+        )
+        self.gaps = GapIndex(hass, f"{DOMAIN}.{config_entry.entry_id}.gaps")
+        self.publication = PublicationModel(
+            hass, f"{DOMAIN}.{config_entry.entry_id}.schedule"
+        )
+        self.leak = LeakDetector(hass, f"{DOMAIN}.{config_entry.entry_id}.leak")
+        self.rolling = RollingUsage(
+            hass, f"{DOMAIN}.{config_entry.entry_id}.rolling"
+        )
+        meter_id = config_entry.data["meter_id"]
+        if config_entry.data.get("legacy_statistic_ids"):
+            # Entries from before multi-meter support keep their statistics.
+            suffix = name_suffix = ""
+        else:
+            suffix = f"_{slugify(meter_id)}"
+            name_suffix = f" {meter_id}"
+        self._statistic_suffix = suffix
+        self._statistic_name_suffix = name_suffix
+        self.consumption_statistic_id = f"{DOMAIN}:{CONSUMPTION_STATISTIC}{suffix}"
+        self.consumption_metadata = consumption_metadata(
+            self.consumption_statistic_id, name_suffix
+        )
+        # Serialises statistics writes between refreshes and backfills.
+        self.statistics_lock = asyncio.Lock()
+        self.backfill = ThamesWaterBackfill(self)
+        # Breakdown of the last refresh, successful or not, for diagnostics.
+        self.last_metrics: RefreshMetrics | None = None
+        # Newest day any lines were seen for, complete or not, which tells
+        # when days are published.
+        self.newest_published: datetime.date | None = None
+
+    async def _async_setup(self) -> None:
+        """Load persisted state before the first refresh."""
+        await self.usage_cache.async_load()
+        await self.gaps.async_load()
+        await self.publication.async_load()
+        await self.leak.async_load()
+        await self.rolling.async_load()
+        await self.backfill.async_load()
+
+    @property
+    def liter_cost(self) -> float:
+        """Return the configured cost per litre."""
+        return float(
+            self.config_entry.options.get(
+                "liter_cost",
+                self.config_entry.data.get("liter_cost", DEFAULT_LITER_COST),
+            )
+        )
+
+    @property
+    def tariff(self) -> Tariff:
+        """Return the configured tariff, or a flat rate of liter_cost."""
+        return Tariff.from_config(
+            self.config_entry.options.get("tariff"), self.liter_cost
+        )
+
+    @property
+    def cost_statistic_ids(self) -> dict[str, str]:
+        """Return the statistic ID of the total cost and each priced component.
+
+        The total keeps the plain cost ID. Components only get a statistic
+        while the tariff has a non-zero rate for them.
+        """
+        return cost_statistic_ids(
+            f"{DOMAIN}:", self._statistic_suffix, self.tariff.components
+        )
+
+    @property
+    def cost_metadata(self) -> dict[str, StatisticMetaData]:
+        """Return the metadata of the total cost and each priced component."""
+        return {
+            component: cost_metadata(
+                statistic_id, component, self._statistic_name_suffix
+            )
+            for component, statistic_id in self.cost_statistic_ids.items()
+        }
+
+    async def _async_fetch_usage(
+        self,
+        meter_id: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        semaphore: asyncio.Semaphore,
+        granularity: Literal["H", "D", "M"] = "H",
+    ) -> MeterUsage | None:
+        """Fetch usage for a date range, returning None if every attempt failed."""
+        for attempt in range(1, FETCH_ATTEMPTS + 1):
+            try:
+                async with semaphore:
+                    # Raw lines carry just the (Label, Usage, Read) fields used here.
+                    return await self.client_manager.async_get_meter_usage(
+                        meter_id, start, end, granularity, raw=True
+                    )
+            except TimeoutError:
+                _LOGGER.warning(
+                    "Timeout fetching data for %s to %s (attempt %d/%d)",
+                    start.date(), end.date(), attempt, FETCH_ATTEMPTS,
+                )
+            except Exception as err:
+                _LOGGER.warning(
+                    "Could not get data for %s to %s (attempt %d/%d): %s",
+                    start.date(), end.date(), attempt, FETCH_ATTEMPTS, err,
+                )
+            if attempt < FETCH_ATTEMPTS:
+                await asyncio.sleep(FETCH_RETRY_DELAY * attempt)
+        return None
+
+    async def _async_fetch_window(
+        self,
+        meter_id: str,
+        window_dates: list[datetime.date],
+        semaphore: asyncio.Semaphore,
+    ) -> list[tuple[datetime.datetime, MeterUsage | None]]:
+        """Fetch one window of consecutive days.
+
+        The window is requested in a single call and split back into per-day
+        MeterUsage buckets. A window answered without any data marks every
+        day as having none. When only the first days of the window were
+        published, just the days from the last bucket on are fetched again,
+        one at a time. Windows whose response cannot be split unambiguously
+        are re-fetched one day at a time. Days that could not be fetched are
+        returned with None.
+        """
+
+        async def _fetch_day(
+            date: datetime.date,
+        ) -> tuple[datetime.datetime, MeterUsage | None]:
+            d = datetime.datetime(date.year, date.month, date.day)
+            _LOGGER.debug("Fetching data for %s/%s/%s", d.day, d.month, d.year)
+            return d, await self._async_fetch_usage(meter_id, d, d, semaphore)
+
+        num_days = len(window_dates)
+        if num_days > 1:
+            first, last = window_dates[0], window_dates[-1]
+            start = datetime.datetime(first.year, first.month, first.day)
+            end = datetime.datetime(last.year, last.month, last.day)
+            _LOGGER.debug("Fetching data for %s to %s", first, last)
+
+            data = await self._async_fetch_usage(meter_id, start, end, semaphore)
+            if (
+                data is not None
+                and not data.IsError
+                and (data.IsDataAvailable is False or not data.Lines)
+            ):
+                no_data = replace(data, IsDataAvailable=False, Lines=None)
+                return [
+                    (datetime.datetime(date.year, date.month, date.day), no_data)
+                    for date in window_dates
+                ]
+            buckets = (
+                _split_lines_by_day(data.Lines, window_dates)
+                if data is not None and not data.IsError and data.Lines is not None
+                else None
+            )
+            if buckets:
+                # Days are published in order, so a short response is most
+                # likely the first days of the window. The last bucket may be
+                # a partial day, so its day and the rest are fetched again;
+                # that day also confirms the buckets before it were not
+                # shifted by a day missing from the middle.
+                complete = len(buckets) - 1 if len(buckets) < num_days else num_days
+                split = [
+                    (
+                        datetime.datetime(date.year, date.month, date.day),
+                        replace(data, Lines=bucket),
+                    )
+                    for date, bucket in zip(window_dates, buckets[:complete])
+                ]
+                if complete == num_days:
+                    return split
+                tail = await asyncio.gather(
+                    *(_fetch_day(date) for date in window_dates[complete:])
+                )
+                check = tail[0][1]
+                if (
+                    check is not None
+                    and not check.IsError
+                    and check.Lines is not None
+                    and [tuple(line) for line in check.Lines]
+                    == [tuple(line) for line in buckets[-1]]
+                ):
+                    return split + list(tail)
+                # The buckets were shifted; fetch the rest one day at a time.
+                _LOGGER.debug(
+                    "Could not split %s to %s into days, fetching one day at a time",
+                    first, last,
+                )
+                return list(
+                    await asyncio.gather(
+                        *(_fetch_day(date) for date in window_dates[:complete])
+                    )
+                ) + list(tail)
+
+            _LOGGER.debug(
+                "Could not split %s to %s into days, fetching one day at a time",
+                first, last,
+            )
+
+        return list(await asyncio.gather(*(_fetch_day(date) for date in window_dates)))
+
+    async def async_fetch_days(
+        self,
+        current_date: datetime.date,
+        end_date: datetime.date,
+        metrics: RefreshMetrics | None = None,
+    ) -> list[tuple[datetime.datetime, MeterUsage | None]]:
+        """Fetch every day from current_date to end_date with bounded concurrency.
+
+        Days held in the usage cache are served from it. The remaining days are
+        grouped into windows of fetch_window_days that are fetched in parallel,
+        at most max_concurrent_fetches requests at a time, and the per-day
+        results are reassembled in chronological order. Days that could not
+        be fetched are returned with None.
+        """
+        config = self.config_entry.data
+        meter_id = config["meter_id"]
+        window_days = int(config.get("fetch_window_days", DEFAULT_FETCH_WINDOW_DAYS))
+        max_concurrency = int(
+            config.get("max_concurrent_fetches", DEFAULT_MAX_CONCURRENT_FETCHES)
+        )
+
+        days: list[tuple[datetime.datetime, MeterUsage | None]] = []
+        windows: list[list[datetime.date]] = []
+        window: list[datetime.date] = []
+        while current_date <= end_date:
+            date = current_date
+            current_date += timedelta(days=1)
+
+            cached = self.usage_cache.get(meter_id, date)
+            if cached is not None:
+                days.append((datetime.datetime(date.year, date.month, date.day), cached))
+                if window:
+                    windows.append(window)
+                    window = []
+                continue
+
+            window.append(date)
+            if len(window) == window_days:
+                windows.append(window)
+                window = []
+        if window:
+            windows.append(window)
+
+        if days:
+            _LOGGER.debug("Using %d cached days", len(days))
+        if metrics is not None:
+            metrics.count("days_cached", len(days))
+            metrics.count("days_fetched", sum(len(window) for window in windows))
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results = await asyncio.gather(
+            *(self._async_fetch_window(meter_id, window, semaphore) for window in windows)
+        )
+
+        for window_result in results:
+            for d, data in window_result:
+                if data is not None:
+                    self.usage_cache.put(meter_id, d.date(), data)
+                elif metrics is not None:
+                    metrics.count("days_failed")
+                days.append((d, data))
+
+        days.sort(key=lambda day: day[0])
+        return days
+
+    async def _async_write_statistics(
+        self,
+        batches: Iterable[ReadingsBuffer],
+        initial_cumulative: float,
+        initial_cost_cumulatives: dict[str, float],
+        metrics: RefreshMetrics | None = None,
+        analyse: bool = False,
+    ) -> tuple[float, dict[str, float], int]:
+        """Inject consumption and cost statistics for chronological readings.
+
+        Batches are consumed lazily, carrying the cumulative sums from one
+        batch to the next. With analyse, each batch is also folded into the
+        leak detector and the rolling usage once written. Returns the consumption sum and the
+        sum of every cost component after the last reading, and the number
+        of readings written.
+        """
+        if metrics is None:
+            metrics = RefreshMetrics()
+        consumption_meta = self.consumption_metadata
+        cost_metas = self.cost_metadata
+        tariff = self.tariff
+        cumulative = initial_cumulative
+        cost_cumulatives = dict(initial_cost_cumulatives)
+        count = 0
+        batches = iter(batches)
+        tz = dt_util.get_default_time_zone()
+
+        while True:
+            # Day lines are parsed lazily as the next batch is drawn.
+            with metrics.phase("parse"):
+                batch = next(batches, None)
+            if batch is None:
+                break
+            with metrics.phase("statistics"):
+                stats, cost_stats = _generate_statistics_from_readings(
+                    batch, cumulative, cost_cumulatives, tariff
+                )
+
+            try:
+                with metrics.phase("recorder"):
+                    async_add_external_statistics(self.hass, consumption_meta, stats)
+                    for component, component_stats in cost_stats.items():
+                        async_add_external_statistics(
+                            self.hass, cost_metas[component], component_stats
+                        )
+            except Exception as err:
+                _LOGGER.error("Error writing statistics to database: %s", err)
+                raise UpdateFailed(f"Error writing statistics: {err}") from err
+
+            cumulative = stats[-1]["sum"]
+            for component, component_stats in cost_stats.items():
+                cost_cumulatives[component] = component_stats[-1]["sum"]
+            if analyse:
+                with metrics.phase("analyse"):
+                    self.leak.update(batch, tz)
+                    self.rolling.update(batch)
+            count += len(batch)
+            metrics.count("readings_written", len(batch))
+            # Let the event loop and recorder queue breathe between batches.
+            await asyncio.sleep(0)
+
+        return cumulative, cost_cumulatives, count
+
+    async def async_import_days(
+        self,
+        days: list[tuple[datetime.datetime, MeterUsage | None]],
+        initial_cumulative: float,
+        initial_cost_cumulatives: dict[str, float],
+        metrics: RefreshMetrics | None = None,
+    ) -> tuple[float, dict[str, float]]:
+        """Write statistics for already published history, such as a backfill chunk.
+
+        Every day with data is imported as-is, since the incomplete-day deferral
+        only matters at the tail of the data. Returns the sums after the last
+        imported hour.
+        """
+        batches = _iter_reading_batches(
+            (d, data.Lines)
+            for d, data in days
+            if data is not None and not data.IsError and data.Lines
+        )
+        cumulative, cost_cumulatives, _ = await self._async_write_statistics(
+            batches, initial_cumulative, initial_cost_cumulatives, metrics
+        )
+        return cumulative, cost_cumulatives
+
+    async def async_fetch_totals(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        granularity: Literal["D", "M"],
+    ) -> list[tuple[datetime.date, datetime.date, float]] | None:
+        """Fetch daily or monthly usage totals from start to end.
+
+        Each request covers up to COARSE_WINDOW_PERIODS days or months.
+        Lines are matched to periods by their labels; periods without a line
+        and windows without any data yield no periods. Returns (first day,
+        last day, total) per period, or None if any window could not be
+        fetched or matched.
+        """
+        config = self.config_entry.data
+        meter_id = config["meter_id"]
+        max_concurrency = int(
+            config.get("max_concurrent_fetches", DEFAULT_MAX_CONCURRENT_FETCHES)
+        )
+        periods = _coarse_periods(start, end, granularity)
+        window_size = COARSE_WINDOW_PERIODS[granularity]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _fetch_window(
+            window: list[tuple[datetime.date, datetime.date]],
+        ) -> list[tuple[datetime.date, datetime.date, float]] | None:
+            first, last = window[0][0], window[-1][1]
+            _LOGGER.debug("Fetching %s totals for %s to %s", granularity, first, last)
+            data = await self._async_fetch_usage(
+                meter_id,
+                datetime.datetime(first.year, first.month, first.day),
+                datetime.datetime(last.year, last.month, last.day),
+                semaphore,
+                granularity,
+            )
+            if data is None or data.IsError:
+                return None
+            if data.IsDataAvailable is False or not data.Lines:
+                return []
+            periods = _align_coarse_lines(data.Lines, window, granularity)
+            if periods is None:
+                _LOGGER.warning(
+                    "Could not match %d %s lines to the %d periods of %s to %s",
+                    len(data.Lines), granularity, len(window), first, last,
+                )
+            elif len(periods) < len(window):
+                _LOGGER.debug(
+                    "No %s totals for %d periods of %s to %s",
+                    granularity, len(window) - len(periods), first, last,
+                )
+            return periods
+
+        results = await asyncio.gather(
+            *(
+                _fetch_window(periods[index : index + window_size])
+                for index in range(0, len(periods), window_size)
+            )
+        )
+        if any(result is None for result in results):
+            return None
+        return [period for result in results for period in result]
+
+    async def async_import_totals(
+        self,
+        periods: list[tuple[datetime.date, datetime.date, float]],
+        initial_cumulative: float,
+        initial_cost_cumulatives: dict[str, float],
+        metrics: RefreshMetrics | None = None,
+    ) -> tuple[float, dict[str, float]]:
+        """Write provisional statistics for daily or monthly totals.
+
+        Each total is spread evenly over the hours of its period. Hourly
+        data imported later for the same hours replaces those rows. Returns
+        the sums after the last period.
+        """
+        cumulative, cost_cumulatives, _ = await self._async_write_statistics(
+            _iter_total_batches(periods),
+            initial_cumulative,
+            initial_cost_cumulatives,
+            metrics,
+        )
+        return cumulative, cost_cumulatives
+
+    async def _async_repair_gaps(self, metrics: RefreshMetrics) -> None:
+        """Re-fetch a few days from the gap index and rewrite their statistics.
+
+        Only the queued days are requested. Days with any lines are written
+        again, and the sums from the first of them onward are recomputed so
+        that later statistics include the recovered hours.
+        """
+        due = self.gaps.due(REPAIR_DAYS_PER_REFRESH)
+        if not due:
+            return
+        _LOGGER.debug("Repairing %d days: %s", len(due), ", ".join(map(str, due)))
+
+        fetched: list[tuple[datetime.datetime, MeterUsage | None]] = []
+        for first, last in _date_runs(due):
+            fetched.extend(await self.async_fetch_days(first, last))
+
+        tz = dt_util.get_default_time_zone()
+        repaired: list[tuple[datetime.datetime, list]] = []
+        for d, data in fetched:
+            if data is None:
+                self.gaps.record(d.date(), GAP_MISSING)
+            elif data.IsError:
+                self.gaps.record(d.date(), GAP_ERROR)
+            elif data.IsDataAvailable is False or data.Lines is None:
+                self.gaps.record(d.date(), GAP_NO_DATA)
+            else:
+                repaired.append((d, data.Lines))
+                if len(data.Lines) < expected_lines(d.date(), tz):
+                    self.gaps.record(d.date(), GAP_PARTIAL, len(data.Lines))
+                else:
+                    self.gaps.resolve(d.date())
+        if not repaired:
+            return
+
+        start = dt_util.as_utc(dt_util.start_of_local_day(repaired[0][0].date()))
+        cost_stat_ids = self.cost_statistic_ids
+        consumption_sum, *cost_sums = await asyncio.gather(
+            async_get_sum_before(self.hass, self.consumption_statistic_id, start),
+            *(
+                async_get_sum_before(self.hass, stat_id, start)
+                for stat_id in cost_stat_ids.values()
+            ),
+        )
+        cost_sums_by_component = dict(zip(cost_stat_ids, cost_sums))
+        await self._async_write_statistics(
+            _iter_reading_batches(repaired),
+            consumption_sum,
+            cost_sums_by_component,
+            metrics,
+            analyse=True,
+        )
+        await async_rewrite_sums(
+            self.hass, self.consumption_metadata, start, consumption_sum
+        )
+        for component, metadata in self.cost_metadata.items():
+            await async_rewrite_sums(
+                self.hass, metadata, start, cost_sums_by_component[component]
+            )
+        metrics.count("days_repaired", len(repaired))
+        _LOGGER.info("Rewrote statistics of %d repaired days", len(repaired))
+
+    async def async_recompute_costs(self, start: datetime.date) -> int:
+        """Reprice the cost statistics from a date onward with the current tariff.
+
+        Consumption is read back from the recorder a batch at a time and the
+        cost sums are rebuilt from the sums just before start, so no requests
+        are made to Thames Water. Returns the number of hours repriced.
+        """
+        hass = self.hass
+        # Make sure previously queued writes are visible before reading them back.
+        await get_instance(hass).async_block_till_done()
+
+        cursor = dt_util.as_utc(dt_util.start_of_local_day(start))
+        cost_metas = self.cost_metadata
+        cost_sums = await asyncio.gather(
+            *(
+                async_get_sum_before(hass, statistic_id, cursor)
+                for statistic_id in self.cost_statistic_ids.values()
+            )
+        )
+        cost_cumulatives = dict(zip(self.cost_statistic_ids, cost_sums))
+        tariff = self.tariff
+        now = dt_util.utcnow()
+        count = 0
+
+        while cursor <= now:
+            # Batches end at local midnight so no day's standing charge is split.
+            batch_end = dt_util.as_utc(
+                dt_util.start_of_local_day(
+                    dt_util.as_local(cursor + READ_BATCH + timedelta(hours=12)).date()
+                )
+            )
+            rows = await async_get_statistics_rows(
+                hass, self.consumption_statistic_id, cursor, batch_end
+            )
+            cursor = batch_end
+            if not rows:
+                continue
+
+            readings = ReadingsBuffer()
+            for row in rows:
+                readings.append(int(row["start"]) // 3600, row["state"] or 0.0)
+            starts = [dt_util.utc_from_timestamp(row["start"]) for row in rows]
+            cost_stats = _generate_cost_statistics(
+                readings, starts, cost_cumulatives, tariff
+            )
+            for component, component_stats in cost_stats.items():
+                async_add_external_statistics(
+                    hass, cost_metas[component], component_stats
+                )
+                cost_cumulatives[component] = component_stats[-1]["sum"]
+            count += len(readings)
+            await asyncio.sleep(0)
+
+        _LOGGER.info("Repriced %d hours of cost statistics from %s", count, start)
+        return count
 
     async def _async_update_data(self) -> ThamesWaterData:
         """Fetch data, compute aggregates, and inject external statistics."""
-        consumption_stat_id = f"{DOMAIN}:thameswater_consumption"
-        cost_stat_id = f"{DOMAIN}:thameswater_cost"
+        metrics = RefreshMetrics(started=dt_util.utcnow())
+        # Only the requests of this refresh are counted, not those of other
+        # meters or backfills sharing the account's client.
+        requests_token = request_stats_scope.set(metrics.requests)
+        started = time.perf_counter()
+        try:
+            if not await self._async_probe(metrics):
+                assert self.data is not None
+                _LOGGER.debug("Nothing published after %s", self.data.latest_day)
+                metrics.count("probes_empty")
+                return replace(self.data, refresh=metrics)
+            async with self.statistics_lock:
+                return await self._async_refresh_statistics(metrics)
+        finally:
+            metrics.duration = time.perf_counter() - started
+            request_stats_scope.reset(requests_token)
+            self.last_metrics = metrics
+            _LOGGER.debug("Refresh breakdown: %s", metrics.as_dict())
+
+    async def _async_probe(self, metrics: RefreshMetrics) -> bool:
+        """Return False if a cheap check shows nothing new was published.
+
+        With a live session and a known latest day, every day after it that
+        the refresh would ask for is requested at once, so a day that is
+        never published does not hide the days after it. The refresh only
+        runs when one of them could be imported, which takes a complete day:
+        incomplete days are deferred until a later day is complete, so they
+        are imported along with it. Without either, or
+        while gaps are due for repair, the full refresh always runs, so the
+        probe never causes a login of its own.
+        """
+        data = self.data
+        if (
+            data is None
+            or data.latest_day is None
+            or not self.client_manager.authenticated
+            or self.gaps.due(1)
+        ):
+            return True
+        first = data.latest_day.date + timedelta(days=1)
+        last = (dt_util.now() - NEWEST_DAY_OFFSET).date()
+        if first > last:
+            # The refresh would not ask for anything newer either.
+            return False
+        with metrics.phase("probe"):
+            # The days are cached, so a refresh that follows does not fetch
+            # them again.
+            days = await self.async_fetch_days(first, last)
+        self._note_published(days)
+        # A day that failed says nothing either way, so the refresh runs.
+        # Incomplete days are deferred until a later day is complete, so only
+        # a complete day lets the refresh import anything.
+        tz = dt_util.get_default_time_zone()
+        return any(
+            usage is None
+            or usage.IsError
+            or (
+                usage.Lines is not None
+                and len(usage.Lines) >= expected_lines(d.date(), tz)
+            )
+            for d, usage in days
+        )
+
+    def _note_published(
+        self, days: list[tuple[datetime.datetime, MeterUsage | None]]
+    ) -> None:
+        """Advance newest_published to the newest fetched day with lines."""
+        for d, usage in reversed(days):
+            if usage is not None and not usage.IsError and usage.Lines:
+                if self.newest_published is None or d.date() > self.newest_published:
+                    self.newest_published = d.date()
+                return
+
+    async def _async_refresh_statistics(
+        self, metrics: RefreshMetrics
+    ) -> ThamesWaterData:
+        """Fetch new readings after the last statistic and inject them."""
+        consumption_stat_id = self.consumption_statistic_id
+        cost_stat_ids = self.cost_statistic_ids
 
         last_stats = None
-        last_cost_stats = None
+        initial_cost_cumulatives: dict[str, float] = {}
 
         # --- Read last known statistics from the recorder (parallel) ---
         recorder = get_instance(self.hass)
@@ -141,35 +1068,48 @@ class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
                     recorder.async_add_executor_job(
                         get_last_statistics, self.hass, 1, consumption_stat_id, True, _STAT_KEYS
                     ),
-                    recorder.async_add_executor_job(
-                        get_last_statistics, self.hass, 1, cost_stat_id, True, _STAT_KEYS
+                    *(
+                        recorder.async_add_executor_job(
+                            get_last_statistics, self.hass, 1, stat_id, True, _STAT_KEYS
+                        )
+                        for stat_id in cost_stat_ids.values()
                     ),
                     return_exceptions=True,
                 )
         except TimeoutError:
             _LOGGER.warning("Timeout while fetching last statistics")
         else:
-            raw_last, raw_last_cost = results
+            raw_last, *raw_last_costs = results
             if isinstance(raw_last, Exception):
                 _LOGGER.error("Error fetching consumption statistics: %s", raw_last)
             elif raw_last.get(consumption_stat_id):
                 last_stats = raw_last[consumption_stat_id][0]
 
-            if isinstance(raw_last_cost, Exception):
-                _LOGGER.error("Error fetching cost statistics: %s", raw_last_cost)
-            elif raw_last_cost.get(cost_stat_id):
-                last_cost_stats = raw_last_cost[cost_stat_id][0]
+            for (component, stat_id), raw_last_cost in zip(
+                cost_stat_ids.items(), raw_last_costs
+            ):
+                if isinstance(raw_last_cost, Exception):
+                    _LOGGER.error(
+                        "Error fetching %s cost statistics: %s", component, raw_last_cost
+                    )
+                elif raw_last_cost.get(stat_id) and (
+                    raw_last_cost[stat_id][0].get("sum") is not None
+                ):
+                    initial_cost_cumulatives[component] = raw_last_cost[stat_id][0]["sum"]
 
         # --- Determine fetch date range ---
-        end_dt = dt_util.now() - timedelta(days=3)
+        end_dt = dt_util.now() - NEWEST_DAY_OFFSET
 
+        # Hours up to the watermark, the start of the last recorded statistic,
+        # are already in the recorder. Fetching resumes on the local day of
+        # the next hour, so a fully recorded day is never requested again.
         if last_stats and last_stats.get("sum") is not None and last_stats.get("start"):
-            last_stat_start_utc = dt_util.as_utc(
-                datetime.datetime.fromtimestamp(last_stats["start"])
+            after_hour = int(last_stats["start"]) // 3600
+            start_dt = dt_util.as_local(
+                dt_util.utc_from_timestamp((after_hour + 1) * 3600)
             )
-            start_dt = last_stat_start_utc
         else:
-            last_stat_start_utc = None
+            after_hour = None
             start_dt = end_dt - timedelta(days=30)
 
         current_date = start_dt.date()
@@ -185,17 +1125,10 @@ class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
             elif current_date < no_data_before:
                 current_date = no_data_before
 
-        # --- Authenticate ---
-        config = self.config_entry.data
+        # --- Authenticate (reuses the live session when there is one) ---
         try:
-            _LOGGER.debug("Creating Thames Water client")
-            async with asyncio.timeout(120):
-                tw_client = await self.hass.async_add_executor_job(
-                    ThamesWater,
-                    config["username"],
-                    config["password"],
-                    config["account_number"],
-                )
+            with metrics.phase("auth"):
+                await self.client_manager.async_get_client()
         except TimeoutError as err:
             raise UpdateFailed("Timeout creating Thames Water client") from err
         except asyncio.CancelledError:
@@ -204,61 +1137,47 @@ class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
             raise UpdateFailed(f"Error creating Thames Water client: {err}") from err
 
         # --- Fetch daily data ---
-        readings: list[dict] = []
+        import_days: list[tuple[datetime.datetime, list]] = []
         latest_reading = 0.0
         latest_day_data: DayData | None = None
         pending_incomplete_days: list[tuple[datetime.datetime, list]] = []
+        failed_days: list[tuple[datetime.date, str]] = []
+        tz = dt_util.get_default_time_zone()
 
-        meter_id = config["meter_id"]
-
-        while current_date <= end_date:
-            year, month, day = current_date.year, current_date.month, current_date.day
-            current_date += timedelta(days=1)
+        with metrics.phase("fetch"):
+            fetched_days = await self.async_fetch_days(current_date, end_date, metrics)
+        self._note_published(fetched_days)
 
-            d = datetime.datetime(year, month, day)
-            _LOGGER.debug("Fetching data for %s/%s/%s", day, month, year)
-
-            try:
-                async with asyncio.timeout(30):
-                    data = await self.hass.async_add_executor_job(
-                        tw_client.get_meter_usage,
-                        meter_id,
-                        d,
-                        d,
-                    )
-            except TimeoutError:
-                _LOGGER.warning(
-                    "Timeout fetching data for %s/%s/%s", day, month, year
-                )
-                break
-            except Exception as err:
-                _LOGGER.warning(
-                    "Could not get data for %s/%s/%s: %s", day, month, year, err
-                )
-                break
+        for d, data in fetched_days:
+            year, month, day = d.year, d.month, d.day
 
+            # Days that cannot be imported in full are skipped instead of
+            # blocking this refresh, and queued for repair once a later day
+            # has been imported (see below).
             if data is None:
-                _LOGGER.warning(
-                    "Skipping %s/%s/%s — no response payload", day, month, year
-                )
-                break
+                _LOGGER.warning("Skipping %s/%s/%s — could not fetch", day, month, year)
+                failed_days.append((d.date(), GAP_MISSING))
+                continue
             if data.IsError:
                 _LOGGER.warning(
                     "Skipping %s/%s/%s — Thames Water reported an error", day, month, year
                 )
+                failed_days.append((d.date(), GAP_ERROR))
                 continue
             if data.IsDataAvailable is False or data.Lines is None:
                 _LOGGER.warning(
                     "Skipping %s/%s/%s — Thames Water reported no data", day, month, year
                 )
+                failed_days.append((d.date(), GAP_NO_DATA))
                 continue
 
             lines = data.Lines
+            expected = expected_lines(d.date(), tz)
 
-            if len(lines) < 24:
+            if len(lines) < expected:
                 _LOGGER.warning(
-                    "Deferring %s/%s/%s — only %d/24 hours available",
-                    day, month, year, len(lines),
+                    "Deferring %s/%s/%s — only %d/%d hours available",
+                    day, month, year, len(lines), expected,
                 )
                 pending_incomplete_days.append((d, lines))
                 continue
@@ -267,42 +1186,45 @@ class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
             if pending_incomplete_days:
                 for prev_day, prev_lines in pending_incomplete_days:
                     _LOGGER.warning(
-                        "Assuming %s/%s/%s is broken (%d/24 hours) because %s/%s/%s is complete",
+                        "Importing %s/%s/%s with %d hours because %s/%s/%s is complete",
                         prev_day.day, prev_day.month, prev_day.year,
                         len(prev_lines), day, month, year,
                     )
-                    prev_read, prev_data = _process_day_lines(prev_day, prev_lines, readings)
-                    latest_reading = prev_read
-                    latest_day_data = prev_data
+                    import_days.append((prev_day, prev_lines))
+                    self.gaps.record(prev_day.date(), GAP_PARTIAL, len(prev_lines))
                 pending_incomplete_days = []
 
-            latest_reading, latest_day_data = _process_day_lines(d, lines, readings)
-
-        _LOGGER.info("Fetched %d historical hourly entries", len(readings))
+            import_days.append((d, lines))
+            self.gaps.resolve(d.date())
 
-        # Capture the actual newest datapoint timestamp before the readings list is
-        # filtered down to only new entries below.
-        last_raw_dt = readings[-1]["dt"] if readings else None
+        # Only days before the newest imported one are gaps. Those after it
+        # are most likely not published yet, and the next refresh asks for
+        # them again anyway, so they are left out of the repair queue.
+        newest_imported = import_days[-1][0].date() if import_days else None
+        for date, reason in failed_days:
+            if newest_imported is not None and date < newest_imported:
+                self.gaps.record(date, reason)
+            else:
+                self.gaps.resolve(date)
 
-        # --- Determine cumulative starting points ---
-        liter_cost = float(
-            self.config_entry.options.get(
-                "liter_cost",
-                self.config_entry.data.get("liter_cost", DEFAULT_LITER_COST),
-            )
+        _LOGGER.info(
+            "Fetched %d historical hourly entries",
+            sum(len(lines) for _, lines in import_days),
         )
 
-        if last_stat_start_utc is not None and last_stats and last_stats.get("sum") is not None:
-            initial_cumulative = last_stats["sum"]
-            readings = [r for r in readings if dt_util.as_utc(r["dt"]) > last_stat_start_utc]
-        else:
-            initial_cumulative = 0.0
+        # Only the newest imported day feeds the sensors; the readings of all
+        # days are generated lazily while the statistics are written.
+        last_raw_dt = None
+        if import_days:
+            last_day_readings = ReadingsBuffer()
+            latest_reading, latest_day_data = _process_days(
+                import_days[-1:], last_day_readings
+            )
+            if last_day_readings:
+                last_raw_dt = dt_util.utc_from_timestamp(last_day_readings.hours[-1] * 3600)
 
-        initial_cost_cumulative = (
-            last_cost_stats["sum"]
-            if last_cost_stats and last_cost_stats.get("sum") is not None
-            else 0.0
-        )
+        # --- Determine cumulative starting points ---
+        initial_cumulative = last_stats["sum"] if after_hour is not None else 0.0
 
         last_data_time = (
             dt_util.as_local(last_raw_dt)
@@ -310,53 +1232,33 @@ class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
             else dt_util.now()
         )
 
-        # Preserve previous values if there is nothing new to inject.
-        if not readings:
+        # --- Build and inject statistics ---
+        # readings are generated in chronological order (day by day), so no sort needed.
+        _, _, written = await self._async_write_statistics(
+            _iter_reading_batches(import_days, after_hour),
+            initial_cumulative,
+            initial_cost_cumulatives,
+            metrics,
+            analyse=True,
+        )
+
+        # --- Repair earlier gaps (low priority, after the new data) ---
+        with metrics.phase("repair"):
+            await self._async_repair_gaps(metrics)
+
+        # Preserve previous values if there was nothing new to inject.
+        if not written:
             _LOGGER.warning("No new readings available")
             prev = self.data
             return ThamesWaterData(
                 latest_day=latest_day_data or (prev.latest_day if prev else None),
                 latest_reading=latest_reading or (prev.latest_reading if prev else 0.0),
                 last_data_time=last_data_time if latest_day_data else (prev.last_data_time if prev else dt_util.now()),
+                refresh=metrics,
+                leak=replace(self.leak.state),
+                rolling=self.rolling.aggregates(),
             )
 
-        # --- Build and inject statistics ---
-        # readings is accumulated in chronological order (day by day), so no sort needed.
-        stats = _generate_statistics_from_readings(
-            readings, cumulative_start=initial_cumulative
-        )
-        cost_stats = _generate_statistics_from_readings(
-            readings, cumulative_start=initial_cost_cumulative, liter_cost=liter_cost
-        )
-
-        metadata_consumption = StatisticMetaData(
-            has_mean=False,
-            has_sum=True,
-            name="Thames Water Consumption",
-            source=DOMAIN,
-            statistic_id=consumption_stat_id,
-            unit_of_measurement=UnitOfVolume.LITERS,
-            mean_type=StatisticMeanType.NONE,
-            unit_class="volume",
-        )
-        metadata_cost = StatisticMetaData(
-            has_mean=False,
-            has_sum=True,
-            name="Thames Water Cost",
-            source=DOMAIN,
-            statistic_id=cost_stat_id,
-            unit_of_measurement="GBP",
-            mean_type=StatisticMeanType.NONE,
-            unit_class=None,
-        )
-
-        try:
-            async_add_external_statistics(self.hass, metadata_consumption, stats)
-            async_add_external_statistics(self.hass, metadata_cost, cost_stats)
-        except Exception as err:
-            _LOGGER.error("Error writing statistics to database: %s", err)
-            raise UpdateFailed(f"Error writing statistics: {err}") from err
-
         # Keep previous reading if this fetch didn't yield a new one.
         if latest_reading == 0.0 and self.data is not None:
             latest_reading = self.data.latest_reading
@@ -365,4 +1267,7 @@ class ThamesWaterCoordinator(DataUpdateCoordinator[ThamesWaterData]):
             latest_day=latest_day_data,
             latest_reading=latest_reading,
             last_data_time=last_data_time,
+            refresh=metrics,
+            leak=replace(self.leak.state),
+            rolling=self.rolling.aggregates(),
         )
@@ -0,0 +1,56 @@
+"""Diagnostics support for the Thames Water integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import ThamesWaterCoordinator
+
+TO_REDACT = {
+    "username",
+    "password",
+    "account_number",
+    "meter_id",
+    "unique_id",
+    "title",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: ThamesWaterCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client_manager = coordinator.client_manager
+    data = coordinator.data
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "last_refresh": (
+            coordinator.last_metrics.as_dict() if coordinator.last_metrics else None
+        ),
+        "last_update_success": coordinator.last_update_success,
+        "data": {
+            "latest_day": str(data.latest_day.date) if data and data.latest_day else None,
+            "last_data_time": data.last_data_time.isoformat() if data else None,
+        },
+        "client": {
+            "authenticated": client_manager.authenticated,
+            "rate_limit": client_manager.rate_limiter.rate,
+            "request_stats": asdict(client_manager.request_stats),
+        },
+        "usage_cache_entries": len(coordinator.usage_cache),
+        "gaps": coordinator.gaps.as_dict(),
+        "publication": coordinator.publication.as_dict(),
+        "leak": asdict(coordinator.leak.state),
+        "backfill": {
+            "running": coordinator.backfill.running,
+            "checkpoint": coordinator.backfill.checkpoint,
+        },
+    }
@@ -6,12 +6,16 @@ from homeassistant.helpers.entity import Entity
 from .const import DOMAIN
 
 
-class ThamesWaterEntity(Entity):
-    """Base class for Thames Water entities."""
-
-    _attr_device_info = DeviceInfo(
-        identifiers={(DOMAIN, "thames_water")},
+def meter_device_info(meter_id: str) -> DeviceInfo:
+    """Return the device that groups the entities of one meter."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, meter_id)},
         manufacturer="Thames Water",
         model="Smart Water Meter",
-        name="Thames Water Meter",
+        name=f"Thames Water Meter {meter_id}",
+        serial_number=meter_id,
     )
+
+
+class ThamesWaterEntity(Entity):
+    """Base class for Thames Water entities."""
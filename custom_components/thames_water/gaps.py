@@ -0,0 +1,101 @@
+"""Persistent index of days with missing or incomplete hourly data."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+GAPS_STORAGE_VERSION = 1
+GAPS_SAVE_DELAY = 30
+
+# Why a day is in the index: the request failed, Thames Water answered with
+# an error or without data, or fewer hours than the day has were published.
+GAP_MISSING = "missing"
+GAP_ERROR = "error"
+GAP_NO_DATA = "no_data"
+GAP_PARTIAL = "partial"
+
+# A day is re-fetched at most this often, and dropped after this many tries.
+REPAIR_INTERVAL = datetime.timedelta(hours=6)
+MAX_REPAIR_ATTEMPTS = 20
+
+
+class GapIndex:
+    """Days of one meter whose hourly data was partial, errored or missing.
+
+    Each entry records why the day is incomplete, how many hours it had,
+    how often it has been retried and when it was last checked. The
+    coordinator works through the entries as a low-priority repair queue.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage_key: str) -> None:
+        """Initialise the index."""
+        self._store: Store[dict] = Store(hass, GAPS_STORAGE_VERSION, storage_key)
+        self._entries: dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        """Return the number of days awaiting repair."""
+        return len(self._entries)
+
+    async def async_load(self) -> None:
+        """Load the index from disk."""
+        stored = await self._store.async_load()
+        if stored:
+            self._entries = stored.get("entries", {})
+        _LOGGER.debug("Loaded %d days awaiting repair", len(self._entries))
+
+    def record(self, date: datetime.date, reason: str, hours: int = 0) -> None:
+        """Record that a day is still incomplete after a fetch.
+
+        Days that stay incomplete after MAX_REPAIR_ATTEMPTS retries are
+        dropped, since Thames Water will most likely never fill them.
+        """
+        key = date.isoformat()
+        previous = self._entries.get(key)
+        attempts = 0 if previous is None else previous["attempts"] + 1
+        if attempts >= MAX_REPAIR_ATTEMPTS:
+            _LOGGER.warning(
+                "Giving up on %s after %d attempts (%s, %d hours)",
+                key, attempts, reason, hours,
+            )
+            del self._entries[key]
+        else:
+            self._entries[key] = {
+                "reason": reason,
+                "hours": hours,
+                "attempts": attempts,
+                "checked": dt_util.utcnow().timestamp(),
+            }
+        self._async_schedule_save()
+
+    def resolve(self, date: datetime.date) -> None:
+        """Remove a day that is now complete."""
+        if self._entries.pop(date.isoformat(), None) is not None:
+            self._async_schedule_save()
+
+    def due(self, limit: int) -> list[datetime.date]:
+        """Return up to limit days not checked within REPAIR_INTERVAL, oldest first."""
+        checked_before = (dt_util.utcnow() - REPAIR_INTERVAL).timestamp()
+        return [
+            datetime.date.fromisoformat(key)
+            for key in sorted(self._entries)
+            if self._entries[key]["checked"] <= checked_before
+        ][:limit]
+
+    def as_dict(self) -> dict[str, dict]:
+        """Return the entries, keyed by ISO date."""
+        return dict(self._entries)
+
+    def _async_schedule_save(self) -> None:
+        """Schedule a save of the index."""
+        self._store.async_delay_save(self._data_to_save, GAPS_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {"entries": self._entries}
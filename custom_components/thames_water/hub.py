@@ -0,0 +1,222 @@
+"""Shared per-account state for the Thames Water integration."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+from datetime import timedelta
+import logging
+import random
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .client_manager import ThamesWaterClientManager
+from .const import DATA_ACCOUNTS, DEFAULT_FETCH_HOURS, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import ThamesWaterCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Meters due within this window of each other share one refresh and login.
+REFRESH_GROUP_WINDOW = timedelta(minutes=10)
+
+
+def account_session_key(account_number: str) -> str:
+    """Return the storage key of an account's shared session."""
+    return f"{DOMAIN}.account_{account_number}.session"
+
+
+def fetch_hours(entry: ConfigEntry) -> list[int]:
+    """Return the hours at which an entry wants new data fetched."""
+    if not entry.data.get("fetch_hours"):
+        return DEFAULT_FETCH_HOURS
+    try:
+        return [int(h.strip()) for h in entry.data["fetch_hours"].split(",")]
+    except (ValueError, AttributeError):
+        _LOGGER.warning("Invalid fetch_hours configuration, using defaults")
+        return DEFAULT_FETCH_HOURS
+
+
+def next_fetch_hour(
+    now: datetime.datetime, hours: list[int], minute: int
+) -> datetime.datetime:
+    """Return the next local time at one of the fetch hours, in UTC."""
+    local_now = dt_util.as_local(now)
+    for days in range(2):
+        midnight = dt_util.start_of_local_day(local_now.date() + timedelta(days=days))
+        for hour in sorted(h for h in hours if 0 <= h < 24):
+            candidate = midnight.replace(hour=hour, minute=minute)
+            if candidate > local_now:
+                return dt_util.as_utc(candidate)
+    return now + timedelta(days=1)
+
+
+def _published_day(coordinator: ThamesWaterCoordinator) -> datetime.date | None:
+    """Return the newest day a coordinator has seen published."""
+    if coordinator.newest_published is not None:
+        return coordinator.newest_published
+    data = coordinator.data
+    return data.latest_day.date if data and data.latest_day else None
+
+
+class ThamesWaterAccount:
+    """The meters of one Thames Water account.
+
+    Every meter of the account shares one client manager, and with it one
+    login, rate limiter and set of request counters. Each meter is refreshed
+    just after its next day is expected to be published, as learned by its
+    PublicationModel, falling back to the fixed fetch hours until enough
+    publications have been seen. Meters due within REFRESH_GROUP_WINDOW of
+    each other are refreshed together, so the first refresh logs in and the
+    others reuse its session.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        account_number: str,
+    ) -> None:
+        """Initialise the account."""
+        self._hass = hass
+        self.account_number = account_number
+        self.client_manager = ThamesWaterClientManager(
+            hass,
+            username,
+            password,
+            account_number,
+            account_session_key(account_number),
+        )
+        self.coordinators: dict[str, ThamesWaterCoordinator] = {}
+        self.next_refresh: dict[str, datetime.datetime] = {}
+        self._minute = random.randint(0, 10)
+        self._unsub_schedule: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_coordinator(self, coordinator: ThamesWaterCoordinator) -> None:
+        """Add a meter to the shared refresh schedule."""
+        entry_id = coordinator.config_entry.entry_id
+        self.coordinators[entry_id] = coordinator
+        self.next_refresh[entry_id] = self._next_refresh_of(
+            coordinator, dt_util.utcnow()
+        )
+        self._async_schedule()
+
+    async def async_remove_coordinator(self, entry_id: str) -> bool:
+        """Remove a meter, closing the session after the last one.
+
+        Returns True when no meters are left.
+        """
+        self.coordinators.pop(entry_id, None)
+        self.next_refresh.pop(entry_id, None)
+        self._async_schedule()
+        if self.coordinators:
+            return False
+        await self.client_manager.async_close()
+        return True
+
+    def _next_refresh_of(
+        self, coordinator: ThamesWaterCoordinator, now: datetime.datetime
+    ) -> datetime.datetime:
+        """Return when a meter should next be refreshed."""
+        fallback = next_fetch_hour(
+            now, fetch_hours(coordinator.config_entry), self._minute
+        )
+        return coordinator.publication.next_refresh(
+            _published_day(coordinator), now, fallback
+        )
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Arm a timer for the earliest meter refresh."""
+        if self._unsub_schedule is not None:
+            self._unsub_schedule()
+            self._unsub_schedule = None
+        if self.next_refresh:
+            self._unsub_schedule = async_track_point_in_utc_time(
+                self._hass, self._async_refresh_due, min(self.next_refresh.values())
+            )
+
+    async def _async_refresh_due(self, now: datetime.datetime) -> None:
+        """Refresh every meter that is due, then schedule the next refresh."""
+        self._unsub_schedule = None
+        due = {
+            entry_id: coordinator
+            for entry_id, coordinator in self.coordinators.items()
+            if self.next_refresh[entry_id] <= now + REFRESH_GROUP_WINDOW
+        }
+        previous = {entry_id: _published_day(c) for entry_id, c in due.items()}
+        results = await asyncio.gather(
+            *(coordinator.async_request_refresh() for coordinator in due.values()),
+            return_exceptions=True,
+        )
+        now = dt_util.utcnow()
+        for (entry_id, coordinator), result in zip(due.items(), results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                _LOGGER.error(
+                    "Unexpected error during scheduled Thames Water refresh of %s: %s",
+                    coordinator.config_entry.title,
+                    result,
+                )
+            if entry_id not in self.coordinators:
+                continue
+            # A failed refresh says nothing about what was published.
+            if not isinstance(result, Exception) and coordinator.last_update_success:
+                latest = _published_day(coordinator)
+                if latest is not None and (
+                    previous[entry_id] is None or latest > previous[entry_id]
+                ):
+                    coordinator.publication.observe(latest, now)
+                else:
+                    coordinator.publication.miss(now)
+            self.next_refresh[entry_id] = self._next_refresh_of(coordinator, now)
+            _LOGGER.debug(
+                "Next refresh of %s at %s",
+                coordinator.config_entry.title,
+                self.next_refresh[entry_id],
+            )
+        self._async_schedule()
+
+
+@callback
+def async_get_account(hass: HomeAssistant, entry: ConfigEntry) -> ThamesWaterAccount:
+    """Return the shared account of an entry, creating it on first use.
+
+    An existing account takes over the entry's credentials, so a reconfigured
+    password applies to every meter of the account without a restart.
+    """
+    accounts: dict[str, ThamesWaterAccount] = hass.data.setdefault(DATA_ACCOUNTS, {})
+    account_number = str(entry.data["account_number"]).strip()
+    if account_number not in accounts:
+        accounts[account_number] = ThamesWaterAccount(
+            hass,
+            entry.data["username"],
+            entry.data["password"],
+            account_number,
+        )
+    else:
+        accounts[account_number].client_manager.async_update_credentials(
+            entry.data["username"], entry.data["password"]
+        )
+    return accounts[account_number]
+
+
+async def async_release_account(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Detach an entry from its account, dropping the account when it is unused.
+
+    The account is the one the entry was set up with, kept in its runtime
+    data, so it is released even if the entry's data has changed since.
+    """
+    account: ThamesWaterAccount = entry.runtime_data
+    if await account.async_remove_coordinator(entry.entry_id):
+        accounts: dict[str, ThamesWaterAccount] = hass.data.get(DATA_ACCOUNTS, {})
+        if accounts.get(account.account_number) is account:
+            del accounts[account.account_number]
@@ -0,0 +1,157 @@
+"""Incremental leak detection over hourly Thames Water readings."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import datetime
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .readings import ReadingsBuffer
+
+_LOGGER = logging.getLogger(__name__)
+
+LEAK_STORAGE_VERSION = 1
+LEAK_SAVE_DELAY = 10
+
+# Local hours [start, end) that make up the night window.
+NIGHT_START_HOUR = 1
+NIGHT_END_HOUR = 5
+# Span of the rolling averages, in days.
+BASELINE_DAYS = 14
+EWMA_ALPHA = 2 / (BASELINE_DAYS + 1)
+# Hours of uninterrupted flow that indicate a leak.
+CONTINUOUS_FLOW_HOURS = 24
+# Litres per hour the quietest hour of the day keeps using on average.
+MIN_FLOW_LEAK = 2.0
+# A night is unusual above this multiple of the baseline and this many litres,
+# once the baseline has seen MIN_NIGHTS nights.
+NIGHT_FLOW_FACTOR = 2.0
+NIGHT_FLOW_FLOOR = 5.0
+MIN_NIGHTS = 7
+
+
+def _ewma(average: float | None, value: float) -> float:
+    """Fold a value into an exponentially weighted moving average."""
+    return value if average is None else average + EWMA_ALPHA * (value - average)
+
+
+@dataclass
+class LeakState:
+    """Rolling leak-detection state, updated one hourly row at a time.
+
+    Every field is a scalar, so updating costs the same however long the
+    history is, and new rows never require re-reading old ones.
+    """
+
+    # Last UTC epoch hour folded in; older rows are ignored.
+    last_hour: int | None = None
+    # Consecutive hours with non-zero usage, ending at last_hour.
+    flow_hours: int = 0
+    # Local day number of last_hour, its smallest hourly usage so far, and
+    # the usage of its night window while the window is still open.
+    day: int | None = None
+    day_min_flow: float | None = None
+    night_usage: float = 0.0
+    night_open: bool = False
+    # Rolling averages and the outcome of the last completed night.
+    min_flow_average: float | None = None
+    night_baseline: float | None = None
+    nights: int = 0
+    last_night_usage: float | None = None
+    unusual_night: bool = False
+
+    @property
+    def continuous_flow(self) -> bool:
+        """Return True if water has flowed for CONTINUOUS_FLOW_HOURS without a break."""
+        return self.flow_hours >= CONTINUOUS_FLOW_HOURS
+
+    @property
+    def leak(self) -> bool:
+        """Return True if the flow never stops, right now or on most days."""
+        return self.continuous_flow or (
+            self.min_flow_average is not None
+            and self.min_flow_average >= MIN_FLOW_LEAK
+        )
+
+    def update(self, readings: ReadingsBuffer, tz: datetime.tzinfo) -> int:
+        """Fold chronological readings after last_hour into the state.
+
+        A missing hour ends the current flow streak. Returns the number of
+        rows used.
+        """
+        used = 0
+        for hour, local_hour, usage in zip(
+            readings.hours, readings.local_hours(tz), readings.usage
+        ):
+            if self.last_hour is not None:
+                if hour <= self.last_hour:
+                    continue
+                if hour != self.last_hour + 1:
+                    self.flow_hours = 0
+            self.last_hour = hour
+            used += 1
+            self.flow_hours = self.flow_hours + 1 if usage > 0 else 0
+
+            day, hour_of_day = divmod(local_hour, 24)
+            if day != self.day:
+                self._end_night()
+                if self.day_min_flow is not None:
+                    self.min_flow_average = _ewma(
+                        self.min_flow_average, self.day_min_flow
+                    )
+                self.day = day
+                self.day_min_flow = usage
+                self.night_usage = 0.0
+                self.night_open = hour_of_day < NIGHT_END_HOUR
+            else:
+                self.day_min_flow = min(self.day_min_flow, usage)
+
+            if NIGHT_START_HOUR <= hour_of_day < NIGHT_END_HOUR:
+                self.night_usage += usage
+            elif hour_of_day >= NIGHT_END_HOUR:
+                self._end_night()
+        return used
+
+    def _end_night(self) -> None:
+        """Judge the night window that just closed, then fold it into the baseline."""
+        if not self.night_open:
+            return
+        self.night_open = False
+        usage = self.night_usage
+        self.unusual_night = (
+            self.nights >= MIN_NIGHTS
+            and self.night_baseline is not None
+            and usage > max(NIGHT_FLOW_FLOOR, self.night_baseline * NIGHT_FLOW_FACTOR)
+        )
+        self.night_baseline = _ewma(self.night_baseline, usage)
+        self.nights += 1
+        self.last_night_usage = usage
+
+
+class LeakDetector:
+    """Persisted LeakState of one meter, fed by the statistics writer."""
+
+    def __init__(self, hass: HomeAssistant, storage_key: str) -> None:
+        """Initialise the detector."""
+        self._store: Store[dict] = Store(hass, LEAK_STORAGE_VERSION, storage_key)
+        self.state = LeakState()
+
+    async def async_load(self) -> None:
+        """Load the state from disk."""
+        stored = await self._store.async_load()
+        if stored:
+            self.state = LeakState(**stored["state"])
+
+    def update(self, readings: ReadingsBuffer, tz: datetime.tzinfo) -> None:
+        """Fold new readings into the state and schedule a save."""
+        if self.state.update(readings, tz):
+            self._store.async_delay_save(self._data_to_save, LEAK_SAVE_DELAY)
+            if self.state.leak:
+                _LOGGER.debug("Possible leak: %s", self.state)
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {"state": asdict(self.state)}
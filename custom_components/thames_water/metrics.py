@@ -0,0 +1,56 @@
+"""Per-refresh timing and counters for the Thames Water integration."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import datetime
+import time
+
+from .thameswaterclient import RequestStats
+
+
+@dataclass
+class RefreshMetrics:
+    """Wall time per phase and counters of one refresh or import."""
+
+    started: datetime.datetime | None = None
+    duration: float = 0.0
+    phase_time: dict[str, float] = field(default_factory=dict)
+    phase_calls: Counter[str] = field(default_factory=Counter)
+    counters: Counter[str] = field(default_factory=Counter)
+    requests: RequestStats = field(default_factory=RequestStats)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the enclosed block to a phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_time[name] = (
+                self.phase_time.get(name, 0.0) + time.perf_counter() - started
+            )
+            self.phase_calls[name] += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        self.counters[name] += amount
+
+    def as_dict(self) -> dict:
+        """Return a JSON-serialisable breakdown."""
+        return {
+            "started": self.started.isoformat() if self.started else None,
+            "duration": round(self.duration, 3),
+            "phases": {
+                name: {"time": round(seconds, 3), "calls": self.phase_calls[name]}
+                for name, seconds in self.phase_time.items()
+            },
+            "counters": dict(self.counters),
+            "requests": {
+                key: round(value, 3) if isinstance(value, float) else value
+                for key, value in asdict(self.requests).items()
+            },
+        }
@@ -9,7 +9,7 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DEFAULT_LITER_COST
-from .entity import ThamesWaterEntity
+from .entity import ThamesWaterEntity, meter_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,6 +67,7 @@ class ThamesWaterLiterCost(ThamesWaterEntity, NumberEntity):
                 )
                 self._value = DEFAULT_LITER_COST
         self._attr_unique_id = f"{config_entry.entry_id}_liter_cost"
+        self._attr_device_info = meter_device_info(config_entry.data["meter_id"])
 
     @property
     def native_value(self) -> float:
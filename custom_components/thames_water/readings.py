@@ -0,0 +1,144 @@
+"""Columnar buffer of hourly readings for the Thames Water integration."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+import datetime
+from datetime import timedelta
+from functools import lru_cache
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with Home Assistant
+    np = None
+
+
+def _utc_offset_hours(hour: int, tz: datetime.tzinfo) -> int:
+    """Return the UTC offset of a time zone, in hours, at a UTC epoch hour."""
+    offset = datetime.datetime.fromtimestamp(hour * 3600, tz).utcoffset()
+    return int(offset.total_seconds()) // 3600 if offset else 0
+
+
+def utc_offset_segments(
+    first_hour: int, last_hour: int, tz: datetime.tzinfo
+) -> list[tuple[int, int]]:
+    """Return (start_hour, offset_hours) segments covering first_hour..last_hour.
+
+    The offset is sampled once per day and each DST transition is located by
+    bisection, so the cost grows with the number of days, not rows.
+    """
+    segments = [(first_hour, _utc_offset_hours(first_hour, tz))]
+    hour = first_hour
+    while hour < last_hour:
+        step = min(hour + 24, last_hour)
+        if _utc_offset_hours(step, tz) != segments[-1][1]:
+            lo, hi = hour, step
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _utc_offset_hours(mid, tz) == segments[-1][1]:
+                    lo = mid
+                else:
+                    hi = mid
+            segments.append((hi, _utc_offset_hours(hi, tz)))
+        hour = step
+    return segments
+
+
+@lru_cache(maxsize=512)
+def day_utc_hours(
+    date: datetime.date, tz: datetime.tzinfo
+) -> tuple[tuple[int, ...], ...]:
+    """Return the UTC epoch hours of each local hour of a day.
+
+    Entry h holds the UTC hours whose local time falls in hour h: one on
+    ordinary days, two for the repeated hour of a 25-hour day. The hour
+    skipped on a 23-hour day maps onto the hour that follows it. UTC offsets
+    are only looked up at the day's transitions, not per hour.
+    """
+    midnight = datetime.datetime(date.year, date.month, date.day, tzinfo=tz)
+    first = int(midnight.timestamp()) // 3600
+    last = int((midnight + timedelta(days=1)).timestamp()) // 3600
+    segments = utc_offset_segments(first, last, tz)
+    local_midnight = first + segments[0][1]
+
+    hours: list[list[int]] = [[] for _ in range(24)]
+    for index, (start, offset) in enumerate(segments):
+        end = segments[index + 1][0] if index + 1 < len(segments) else last
+        for hour in range(start, end):
+            wall = hour + offset - local_midnight
+            if 0 <= wall < 24:
+                hours[wall].append(hour)
+    for wall, utc_hours in enumerate(hours):
+        if not utc_hours:
+            utc_hours.append(first + wall)
+    return tuple(tuple(utc_hours) for utc_hours in hours)
+
+
+def expected_lines(date: datetime.date, tz: datetime.tzinfo) -> int:
+    """Return the number of hourly lines a complete day has.
+
+    A 23-hour day can have 23 lines; a 25-hour day is complete with 24.
+    """
+    return min(24, len({hour for hours in day_utc_hours(date, tz) for hour in hours}))
+
+
+class ReadingsBuffer:
+    """Hourly readings stored as parallel arrays of UTC epoch hours and usage.
+
+    Rows must be appended in chronological order.
+    """
+
+    __slots__ = ("hours", "usage")
+
+    def __init__(self) -> None:
+        """Initialise an empty buffer."""
+        self.hours = array("q")
+        self.usage = array("d")
+
+    def __len__(self) -> int:
+        """Return the number of hourly rows."""
+        return len(self.hours)
+
+    def append(self, hour: int, usage: float) -> None:
+        """Append one hourly row."""
+        self.hours.append(hour)
+        self.usage.append(usage)
+
+    def extend(self, other: ReadingsBuffer) -> None:
+        """Append every row of another buffer."""
+        self.hours.extend(other.hours)
+        self.usage.extend(other.usage)
+
+    def running_totals(self) -> list[float]:
+        """Return the running total of usage at every row in one pass."""
+        if np is not None:
+            return np.cumsum(np.frombuffer(self.usage, dtype=np.float64)).tolist()
+        return list(accumulate(self.usage))
+
+    def scaled_usage(self, factor: float) -> list[float]:
+        """Return every row's usage multiplied by factor."""
+        if np is not None:
+            return (np.frombuffer(self.usage, dtype=np.float64) * factor).tolist()
+        return [usage * factor for usage in self.usage]
+
+    def local_hours(self, tz: datetime.tzinfo) -> array:
+        """Return every row's local wall-clock time as an epoch hour.
+
+        local_hour // 24 is the local day number and local_hour % 24 the
+        local hour of day.
+        """
+        local = array("q")
+        if not self.hours:
+            return local
+        segments = utc_offset_segments(self.hours[0], self.hours[-1], tz)
+        if len(segments) == 1:
+            offset = segments[0][1]
+            local.extend(hour + offset for hour in self.hours)
+            return local
+        starts = [start for start, _ in segments]
+        local.extend(
+            hour + segments[bisect_right(starts, hour) - 1][1] for hour in self.hours
+        )
+        return local
@@ -0,0 +1,177 @@
+"""Rolling usage aggregates over the last days of hourly readings."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .readings import ReadingsBuffer
+
+ROLLING_STORAGE_VERSION = 1
+ROLLING_SAVE_DELAY = 10
+
+ROLLING_DAYS = 30
+WEEK_HOURS = 7 * 24
+CAPACITY_HOURS = ROLLING_DAYS * 24
+
+
+@dataclass(frozen=True, slots=True)
+class RollingAggregates:
+    """Usage totals of the windows ending at the newest hour.
+
+    A window is None until the buffer covers all of its hours.
+    """
+
+    last_7_days: float | None
+    previous_7_days: float | None
+    last_30_days: float | None
+
+    @property
+    def average_daily_7_days(self) -> float | None:
+        """Return the average daily usage of the last 7 days."""
+        return None if self.last_7_days is None else self.last_7_days / 7
+
+    @property
+    def change_vs_previous_week(self) -> float | None:
+        """Return the change of the last 7 days against the 7 before, in percent."""
+        if self.last_7_days is None or not self.previous_7_days:
+            return None
+        return (self.last_7_days - self.previous_7_days) / self.previous_7_days * 100
+
+
+class RollingUsage:
+    """Ring buffer of the last ROLLING_DAYS of hourly usage, persisted in a Store.
+
+    Slot hour % CAPACITY_HOURS holds the usage of that UTC epoch hour, and a
+    mask records which slots hold a reading. The totals of the last week,
+    the week before and the whole buffer, and how many of their hours are
+    covered, are kept up to date as hours are added and evicted, so reading
+    them is O(1) and never queries the recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage_key: str) -> None:
+        """Initialise an empty buffer."""
+        self._store: Store[dict] = Store(hass, ROLLING_STORAGE_VERSION, storage_key)
+        self._usage = array("d", bytes(8 * CAPACITY_HOURS))
+        self._covered = array("B", bytes(CAPACITY_HOURS))
+        self._last_hour: int | None = None
+        self._week = 0.0
+        self._previous_week = 0.0
+        self._total = 0.0
+        self._week_hours = 0
+        self._previous_week_hours = 0
+        self._total_hours = 0
+
+    async def async_load(self) -> None:
+        """Load the buffer from disk and recompute its totals."""
+        stored = await self._store.async_load()
+        if not stored or stored.get("last_hour") is None:
+            return
+        self._usage = array("d", stored["usage"])
+        self._last_hour = last_hour = stored["last_hour"]
+        if "covered" in stored:
+            self._covered = array("B", stored["covered"])
+        else:
+            # Written before coverage was tracked: every hour from first_hour on.
+            self._covered = array("B", bytes(CAPACITY_HOURS))
+            for hour in range(
+                max(stored["first_hour"], last_hour - CAPACITY_HOURS + 1), last_hour + 1
+            ):
+                self._covered[hour % CAPACITY_HOURS] = 1
+        self._week = self._previous_week = self._total = 0.0
+        self._week_hours = self._previous_week_hours = self._total_hours = 0
+        for age in range(CAPACITY_HOURS):
+            slot = (last_hour - age) % CAPACITY_HOURS
+            self._add_at_age(age, self._usage[slot], self._covered[slot])
+
+    def aggregates(self) -> RollingAggregates:
+        """Return the current window totals."""
+        return RollingAggregates(
+            last_7_days=self._week if self._week_hours == WEEK_HOURS else None,
+            previous_7_days=(
+                self._previous_week
+                if self._previous_week_hours == WEEK_HOURS
+                else None
+            ),
+            last_30_days=self._total if self._total_hours == CAPACITY_HOURS else None,
+        )
+
+    def update(self, readings: ReadingsBuffer) -> None:
+        """Add chronological readings and schedule a save.
+
+        Hours newer than the buffer advance it, leaving skipped hours
+        uncovered until they are filled in. Hours still inside the buffer,
+        such as repaired ones, replace the stored value.
+        """
+        for hour, usage in zip(readings.hours, readings.usage):
+            self._set(hour, usage)
+        if readings:
+            self._store.async_delay_save(self._data_to_save, ROLLING_SAVE_DELAY)
+
+    def _set(self, hour: int, usage: float) -> None:
+        """Store the usage of one hour, updating the totals."""
+        if self._last_hour is None or hour - self._last_hour >= CAPACITY_HOURS:
+            # Nothing in the buffer overlaps this hour; start over.
+            self._clear(hour)
+        if hour > self._last_hour:
+            while self._last_hour < hour - 1:
+                self._advance(0.0, 0)
+            self._advance(usage, 1)
+            return
+        age = self._last_hour - hour
+        if age >= CAPACITY_HOURS:
+            return
+        slot = hour % CAPACITY_HOURS
+        self._add_at_age(age, usage - self._usage[slot], 1 - self._covered[slot])
+        self._usage[slot] = usage
+        self._covered[slot] = 1
+
+    def _clear(self, hour: int) -> None:
+        """Empty the buffer so that the given hour is the next one."""
+        self._usage = array("d", bytes(8 * CAPACITY_HOURS))
+        self._covered = array("B", bytes(CAPACITY_HOURS))
+        self._week = self._previous_week = self._total = 0.0
+        self._week_hours = self._previous_week_hours = self._total_hours = 0
+        self._last_hour = hour - 1
+
+    def _advance(self, usage: float, covered: int) -> None:
+        """Append the hour after the newest, evicting the oldest."""
+        hour = self._last_hour + 1
+        usage_at, covered_at = self._usage, self._covered
+        # The slot still holds the hour CAPACITY_HOURS ago, which drops out.
+        slot = hour % CAPACITY_HOURS
+        self._total += usage - usage_at[slot]
+        self._total_hours += covered - covered_at[slot]
+        # The hour a week ago moves into the previous week, and the hour two
+        # weeks ago leaves it.
+        week_slot = (hour - WEEK_HOURS) % CAPACITY_HOURS
+        previous_slot = (hour - 2 * WEEK_HOURS) % CAPACITY_HOURS
+        self._week += usage - usage_at[week_slot]
+        self._week_hours += covered - covered_at[week_slot]
+        self._previous_week += usage_at[week_slot] - usage_at[previous_slot]
+        self._previous_week_hours += covered_at[week_slot] - covered_at[previous_slot]
+        usage_at[slot] = usage
+        covered_at[slot] = covered
+        self._last_hour = hour
+
+    def _add_at_age(self, age: int, amount: float, hours: int) -> None:
+        """Add usage and covered hours to the totals whose window holds this age."""
+        self._total += amount
+        self._total_hours += hours
+        if age < WEEK_HOURS:
+            self._week += amount
+            self._week_hours += hours
+        elif age < 2 * WEEK_HOURS:
+            self._previous_week += amount
+            self._previous_week_hours += hours
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {
+            "last_hour": self._last_hour,
+            "usage": self._usage.tolist(),
+            "covered": self._covered.tolist(),
+        }
@@ -0,0 +1,138 @@
+"""Learned publication times for scheduling Thames Water refreshes."""
+
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+import logging
+from statistics import median
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEDULE_STORAGE_VERSION = 1
+SCHEDULE_SAVE_DELAY = 10
+
+# Publication lags kept, and needed before the fixed fetch hours are dropped.
+MAX_OBSERVATIONS = 14
+MIN_OBSERVATIONS = 3
+# First look this long before the expected release, so that the estimate can
+# move earlier as well as later. The lead doubles, up to MAX_LEAD, for every
+# day in a row that was already out at the first look.
+RELEASE_MARGIN = timedelta(minutes=15)
+MAX_LEAD = timedelta(hours=4)
+# Wait between refreshes that find nothing new, doubling up to the maximum.
+INITIAL_BACKOFF = timedelta(hours=1)
+MAX_BACKOFF = timedelta(hours=12)
+MIN_DELAY = timedelta(minutes=5)
+
+
+def _day_end(date: datetime.date) -> datetime.datetime:
+    """Return the local midnight that ends a day, in UTC."""
+    return dt_util.as_utc(dt_util.start_of_local_day(date + timedelta(days=1)))
+
+
+class PublicationModel:
+    """When the next day of one meter's readings is likely to be published.
+
+    Every refresh that finds a new day records how long after the end of
+    that day it was published. Only a bound is known: it appeared after the
+    last refresh that missed it and before the one that saw it, so the
+    midpoint of the two is recorded, or the time it was seen if nothing
+    missed it. The median of the recent lags predicts when the following
+    day appears. Refreshes that find nothing back off exponentially until
+    new data arrives.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage_key: str) -> None:
+        """Initialise the model."""
+        self._store: Store[dict] = Store(hass, SCHEDULE_STORAGE_VERSION, storage_key)
+        self._lags: list[float] = []
+        self._misses = 0
+        self._last_miss: float | None = None
+        self._early = 0
+
+    async def async_load(self) -> None:
+        """Load the recorded lags from disk."""
+        stored = await self._store.async_load()
+        if stored:
+            self._lags = stored.get("lags", [])
+            self._misses = stored.get("misses", 0)
+            self._last_miss = stored.get("last_miss")
+            self._early = stored.get("early", 0)
+
+    @property
+    def expected_lag(self) -> timedelta | None:
+        """Return the expected publication lag, or None until enough are known."""
+        if len(self._lags) < MIN_OBSERVATIONS:
+            return None
+        return timedelta(seconds=median(self._lags))
+
+    def observe(self, date: datetime.date, seen: datetime.datetime) -> None:
+        """Record that a day was first seen at a point in time."""
+        day_end = _day_end(date).timestamp()
+        published = seen.timestamp()
+        if self._last_miss is not None and self._last_miss > day_end:
+            published = (self._last_miss + published) / 2
+            self._early = 0
+        else:
+            self._early += 1
+        lag = published - day_end
+        self._lags = [*self._lags, lag][-MAX_OBSERVATIONS:]
+        self._misses = 0
+        self._last_miss = None
+        _LOGGER.debug(
+            "Day %s published about %.1f hours after it ended", date, lag / 3600
+        )
+        self._async_save()
+
+    def miss(self, checked: datetime.datetime) -> None:
+        """Record a refresh at a point in time that found no new day."""
+        self._misses += 1
+        self._last_miss = checked.timestamp()
+        self._async_save()
+
+    def next_refresh(
+        self,
+        latest_day: datetime.date | None,
+        now: datetime.datetime,
+        fallback: datetime.datetime,
+    ) -> datetime.datetime:
+        """Return when to look for the day after latest_day.
+
+        Without a latest day or enough observations, fallback is used.
+        """
+        lag = self.expected_lag
+        if latest_day is None or lag is None:
+            return fallback
+        lead = min(RELEASE_MARGIN * 2**self._early, MAX_LEAD)
+        expected = _day_end(latest_day + timedelta(days=1)) + lag - lead
+        if not self._misses:
+            return max(expected, now + MIN_DELAY)
+        backoff = min(INITIAL_BACKOFF * 2 ** (self._misses - 1), MAX_BACKOFF)
+        return max(expected, now + backoff)
+
+    def as_dict(self) -> dict:
+        """Return the model for diagnostics."""
+        lag = self.expected_lag
+        return {
+            "observations": len(self._lags),
+            "expected_lag_hours": round(lag.total_seconds() / 3600, 2) if lag else None,
+            "misses": self._misses,
+        }
+
+    def _async_save(self) -> None:
+        """Schedule a save of the model."""
+        self._store.async_delay_save(self._data_to_save, SCHEDULE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {
+            "lags": self._lags,
+            "misses": self._misses,
+            "last_miss": self._last_miss,
+            "early": self._early,
+        }
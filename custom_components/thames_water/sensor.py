@@ -2,11 +2,9 @@
 
 from __future__ import annotations
 
-import asyncio
 from collections.abc import Callable
 from dataclasses import dataclass
 import logging
-import random
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -16,18 +14,16 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfVolume
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime, UnitOfVolume
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import ThamesWaterCoordinator, ThamesWaterData
-from .entity import ThamesWaterEntity
+from .entity import ThamesWaterEntity, meter_device_info
 
 _LOGGER = logging.getLogger(__name__)
-UPDATE_HOURS = [15, 23]
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -56,12 +52,71 @@ SENSOR_DESCRIPTIONS: tuple[ThamesWaterSensorEntityDescription, ...] = (
         suggested_display_precision=0,
         value_fn=lambda data: data.latest_day.min_usage if data.latest_day else None,
     ),
+    ThamesWaterSensorEntityDescription(
+        key="average_daily_usage_7d",
+        translation_key="average_daily_usage_7d",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: (
+            data.rolling.average_daily_7_days if data.rolling else None
+        ),
+    ),
+    ThamesWaterSensorEntityDescription(
+        key="usage_30d",
+        translation_key="usage_30d",
+        native_unit_of_measurement=UnitOfVolume.LITERS,
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: data.rolling.last_30_days if data.rolling else None,
+    ),
+    ThamesWaterSensorEntityDescription(
+        key="usage_change_vs_last_week",
+        translation_key="usage_change_vs_last_week",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda data: (
+            data.rolling.change_vs_previous_week if data.rolling else None
+        ),
+    ),
     ThamesWaterSensorEntityDescription(
         key="last_data_date",
         translation_key="last_data_date",
         device_class=SensorDeviceClass.TIMESTAMP,
         value_fn=lambda data: data.last_data_time,
     ),
+    ThamesWaterSensorEntityDescription(
+        key="last_refresh_duration",
+        translation_key="last_refresh_duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.refresh.duration if data.refresh else None,
+    ),
+    ThamesWaterSensorEntityDescription(
+        key="refresh_http_requests",
+        translation_key="refresh_http_requests",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: data.refresh.requests.requests if data.refresh else None,
+    ),
+    ThamesWaterSensorEntityDescription(
+        key="refresh_days_fetched",
+        translation_key="refresh_days_fetched",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: (
+            data.refresh.counters["days_fetched"] if data.refresh else None
+        ),
+    ),
 )
 
 
@@ -82,37 +137,6 @@ async def async_setup_entry(
         ],
     ]
     async_add_entities(entities)
-
-    # Schedule refreshes at the configured hours each day.
-    if entry.data.get("fetch_hours"):
-        try:
-            update_hours = [
-                int(h.strip()) for h in entry.data["fetch_hours"].split(",")
-            ]
-        except (ValueError, AttributeError):
-            _LOGGER.warning("Invalid fetch_hours configuration, using defaults")
-            update_hours = UPDATE_HOURS
-    else:
-        update_hours = UPDATE_HOURS
-
-    rand_minute = random.randint(0, 10)
-
-    async def _refresh_callback(ts) -> None:
-        try:
-            await coordinator.async_request_refresh()
-        except asyncio.CancelledError:
-            raise
-        except Exception as err:
-            _LOGGER.error("Unexpected error during scheduled Thames Water refresh: %s", err)
-
-    unsubscribe = async_track_time_change(
-        hass,
-        _refresh_callback,
-        hour=update_hours,
-        minute=rand_minute,
-        second=0,
-    )
-    entry.async_on_unload(unsubscribe)
     return True
 
 
@@ -138,6 +162,7 @@ class ThamesWaterSensor(
         """Initialise the sensor."""
         super().__init__(coordinator)
         self._attr_unique_id = f"meter_read_{meter_id}"
+        self._attr_device_info = meter_device_info(meter_id)
 
     @property
     def native_value(self) -> float | None:
@@ -166,6 +191,7 @@ class ThamesWaterCoordinatorSensor(
         super().__init__(coordinator)
         self.entity_description = description
         self._attr_unique_id = f"{description.key}_{meter_id}"
+        self._attr_device_info = meter_device_info(meter_id)
 
     @property
     def native_value(self) -> Any:
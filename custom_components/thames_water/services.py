@@ -0,0 +1,123 @@
+"""Services for the Thames Water integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .backfill import DEFAULT_REFINE_DAYS
+from .const import DOMAIN
+from .coordinator import ThamesWaterCoordinator
+from .tariff import TARIFF_SCHEMA, Tariff
+
+SERVICE_BACKFILL = "backfill"
+SERVICE_RECOMPUTE_COST = "recompute_cost"
+SERVICE_SET_TARIFF = "set_tariff"
+
+# Backfill granularities and the Thames Water API code of each.
+GRANULARITIES = {"hourly": "H", "daily": "D", "monthly": "M"}
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required("start_date"): cv.date,
+        vol.Optional("end_date"): cv.date,
+        vol.Optional("granularity", default="hourly"): vol.In(GRANULARITIES),
+        vol.Optional("refine_days", default=DEFAULT_REFINE_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional("restart", default=False): cv.boolean,
+        vol.Optional("config_entry_id"): cv.string,
+    }
+)
+
+RECOMPUTE_COST_SCHEMA = vol.Schema(
+    {
+        vol.Required("start_date"): cv.date,
+        vol.Optional("config_entry_id"): cv.string,
+    }
+)
+
+SET_TARIFF_SCHEMA = vol.Schema(
+    {
+        vol.Optional("periods"): TARIFF_SCHEMA,
+        vol.Optional("config_entry_id"): cv.string,
+    }
+)
+
+
+def _get_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[ThamesWaterCoordinator]:
+    """Return the coordinators targeted by a service call."""
+    coordinators: dict[str, ThamesWaterCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get("config_entry_id")
+    if entry_id is None:
+        return list(coordinators.values())
+    if entry_id not in coordinators:
+        raise ServiceValidationError(f"Thames Water entry {entry_id} is not loaded")
+    return [coordinators[entry_id]]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Thames Water services."""
+
+    async def _async_backfill(call: ServiceCall) -> None:
+        start = call.data["start_date"]
+        # Thames Water publishes data with a delay of about three days.
+        end = call.data.get("end_date") or (dt_util.now() - timedelta(days=3)).date()
+        if start > end:
+            raise ServiceValidationError("start_date must not be after end_date")
+
+        for coordinator in _get_coordinators(hass, call):
+            await coordinator.backfill.async_start(
+                start,
+                end,
+                GRANULARITIES[call.data["granularity"]],
+                call.data["refine_days"],
+                call.data["restart"],
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, _async_backfill, schema=BACKFILL_SCHEMA
+    )
+
+    async def _async_set_tariff(call: ServiceCall) -> None:
+        periods = call.data.get("periods")
+        for coordinator in _get_coordinators(hass, call):
+            entry = coordinator.config_entry
+            options = dict(entry.options)
+            if periods:
+                # Round-trip through Tariff to store dates as ISO strings.
+                options["tariff"] = Tariff.from_config(
+                    periods, coordinator.liter_cost
+                ).as_config()
+            else:
+                # Without periods, cost falls back to the flat liter cost.
+                options.pop("tariff", None)
+            hass.config_entries.async_update_entry(entry, options=options)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_TARIFF, _async_set_tariff, schema=SET_TARIFF_SCHEMA
+    )
+
+    async def _async_recompute_cost(call: ServiceCall) -> None:
+        start = call.data["start_date"]
+        if start > dt_util.now().date():
+            raise ServiceValidationError("start_date must not be in the future")
+
+        for coordinator in _get_coordinators(hass, call):
+            async with coordinator.statistics_lock:
+                await coordinator.async_recompute_costs(start)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECOMPUTE_COST,
+        _async_recompute_cost,
+        schema=RECOMPUTE_COST_SCHEMA,
+    )
@@ -0,0 +1,203 @@
+"""Recorder statistics helpers for the Thames Water integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import datetime
+from datetime import timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .tariff import COST_COMPONENTS
+
+_LOGGER = logging.getLogger(__name__)
+
+CONSUMPTION_STATISTIC = "thameswater_consumption"
+COST_STATISTIC = "thameswater_cost"
+COST_STATISTIC_NAMES = {
+    "total": "Thames Water Cost",
+    "water": "Thames Water Clean Water Cost",
+    "wastewater": "Thames Water Wastewater Cost",
+    "standing": "Thames Water Standing Charge",
+}
+
+# Rows before a point in time are searched for this far back at a time, down
+# to SUM_SEARCH_START; no Thames Water smart meter data predates it.
+SUM_LOOKBACK = timedelta(days=366)
+SUM_SEARCH_START = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC)
+READ_BATCH = timedelta(days=30)
+
+
+def consumption_metadata(statistic_id: str, name_suffix: str = "") -> StatisticMetaData:
+    """Return the metadata of the hourly consumption statistic."""
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"Thames Water Consumption{name_suffix}",
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement=UnitOfVolume.LITERS,
+        mean_type=StatisticMeanType.NONE,
+        unit_class="volume",
+    )
+
+
+def cost_statistic_ids(
+    prefix: str, suffix: str = "", components: Iterable[str] = COST_COMPONENTS
+) -> dict[str, str]:
+    """Return the statistic ID of the total cost and of the given components."""
+    return {
+        "total": f"{prefix}{COST_STATISTIC}{suffix}",
+        **{
+            component: f"{prefix}{COST_STATISTIC}_{component}{suffix}"
+            for component in components
+        },
+    }
+
+
+def cost_metadata(
+    statistic_id: str, component: str = "total", name_suffix: str = ""
+) -> StatisticMetaData:
+    """Return the metadata of an hourly cost statistic."""
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"{COST_STATISTIC_NAMES[component]}{name_suffix}",
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement="GBP",
+        mean_type=StatisticMeanType.NONE,
+        unit_class=None,
+    )
+
+
+async def async_get_statistics_rows(
+    hass: HomeAssistant,
+    statistic_id: str,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> list[dict]:
+    """Return the hourly rows of a statistic that start in [start, end)."""
+    result = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start,
+        end,
+        {statistic_id},
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+    return result.get(statistic_id, [])
+
+
+async def async_get_sum_before(
+    hass: HomeAssistant,
+    statistic_id: str,
+    before: datetime.datetime,
+) -> float:
+    """Return the cumulative sum of the last row starting before a point in time.
+
+    The newest row is used when it starts before that time. Otherwise
+    earlier rows are searched SUM_LOOKBACK at a time, however far back the
+    previous row is. Returns 0.0 if there is no earlier row.
+    """
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+    )
+    if not last.get(statistic_id):
+        return 0.0
+    row = last[statistic_id][0]
+    if row["start"] >= before.timestamp():
+        row = None
+        end = before
+        while row is None and end > SUM_SEARCH_START:
+            rows = await async_get_statistics_rows(
+                hass, statistic_id, end - SUM_LOOKBACK, end
+            )
+            row = rows[-1] if rows else None
+            end -= SUM_LOOKBACK
+    if row is None or row.get("sum") is None:
+        return 0.0
+    return row["sum"]
+
+
+async def async_get_first_start(
+    hass: HomeAssistant,
+    statistic_id: str,
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> datetime.datetime | None:
+    """Return the start of the first row in [start, end), or None if there is none.
+
+    The range is searched SUM_LOOKBACK at a time from its start.
+    """
+    cursor = start
+    while cursor < end:
+        window_end = min(cursor + SUM_LOOKBACK, end)
+        rows = await async_get_statistics_rows(hass, statistic_id, cursor, window_end)
+        if rows:
+            return dt_util.utc_from_timestamp(rows[0]["start"])
+        cursor = window_end
+    return None
+
+
+async def async_rewrite_sums(
+    hass: HomeAssistant,
+    metadata: StatisticMetaData,
+    start: datetime.datetime,
+    initial_sum: float,
+    end: datetime.datetime | None = None,
+) -> float:
+    """Recompute the cumulative sum of every row from start onward.
+
+    Each row's sum becomes initial_sum plus the running total of the states,
+    written back a batch at a time. With end, only rows starting before it
+    are rewritten. This is idempotent, so an interrupted rewrite can simply
+    be run again. Returns the final sum.
+    """
+    # Make sure previously queued writes are visible before reading them back.
+    await get_instance(hass).async_block_till_done()
+
+    cumulative = initial_sum
+    now = dt_util.utcnow()
+    cursor = start
+    while cursor <= now and (end is None or cursor < end):
+        batch_end = cursor + READ_BATCH
+        if end is not None:
+            batch_end = min(batch_end, end)
+        rows = await async_get_statistics_rows(
+            hass, metadata["statistic_id"], cursor, batch_end
+        )
+        stats: list[StatisticData] = []
+        for row in rows:
+            cumulative += row["state"] or 0.0
+            stats.append(
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(row["start"]),
+                    state=row["state"],
+                    sum=cumulative,
+                )
+            )
+        if stats:
+            async_add_external_statistics(hass, metadata, stats)
+        cursor = batch_end
+    _LOGGER.debug(
+        "Rewrote %s sums from %s, final sum %s", metadata["statistic_id"], start, cumulative
+    )
+    return cumulative
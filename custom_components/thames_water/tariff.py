@@ -0,0 +1,231 @@
+"""Tariff engine that prices hourly readings for the Thames Water integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+import datetime
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.helpers import config_validation as cv
+
+from .readings import ReadingsBuffer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with Home Assistant
+    np = None
+
+# Cost components, each written as its own statistic. "total" is their sum.
+COST_COMPONENTS = ("water", "wastewater", "standing")
+
+# Thames Water assumes 95% of the water supplied is returned to the sewer.
+DEFAULT_SEWER_RETURN = 0.95
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+BAND_SCHEMA = vol.Schema(
+    {
+        vol.Required("start_hour"): vol.All(vol.Coerce(int), vol.Range(min=0, max=23)),
+        vol.Required("end_hour"): vol.All(vol.Coerce(int), vol.Range(min=1, max=24)),
+        vol.Required("multiplier"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+PERIOD_SCHEMA = vol.Schema(
+    {
+        vol.Required("effective_from"): cv.date,
+        vol.Required("clean_water_rate"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("wastewater_rate", default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional("sewer_return", default=DEFAULT_SEWER_RETURN): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        vol.Optional("standing_charge", default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional("bands", default=[]): [BAND_SCHEMA],
+    }
+)
+
+TARIFF_SCHEMA = vol.All(cv.ensure_list, [PERIOD_SCHEMA], vol.Length(min=1))
+
+
+@dataclass(frozen=True, slots=True)
+class TimeOfUseBand:
+    """Multiplier applied to volumetric rates between two local hours."""
+
+    start_hour: int
+    end_hour: int
+    multiplier: float
+
+    def covers(self, hour: int) -> bool:
+        """Return True if the band covers a local hour of day."""
+        if self.start_hour < self.end_hour:
+            return self.start_hour <= hour < self.end_hour
+        # Bands such as 22 to 6 wrap around midnight.
+        return hour >= self.start_hour or hour < self.end_hour
+
+
+@dataclass(frozen=True, slots=True)
+class TariffPeriod:
+    """Charges that apply from a local date until the next period starts.
+
+    Rates are in GBP per litre and the standing charge in GBP per day.
+    """
+
+    effective_from: datetime.date
+    clean_water_rate: float
+    wastewater_rate: float = 0.0
+    sewer_return: float = DEFAULT_SEWER_RETURN
+    standing_charge: float = 0.0
+    bands: tuple[TimeOfUseBand, ...] = ()
+
+    def multiplier(self, hour: int) -> float:
+        """Return the volumetric rate multiplier for a local hour of day."""
+        for band in self.bands:
+            if band.covers(hour):
+                return band.multiplier
+        return 1.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the period in the form stored in the config entry options."""
+        return {
+            "effective_from": self.effective_from.isoformat(),
+            "clean_water_rate": self.clean_water_rate,
+            "wastewater_rate": self.wastewater_rate,
+            "sewer_return": self.sewer_return,
+            "standing_charge": self.standing_charge,
+            "bands": [
+                {
+                    "start_hour": band.start_hour,
+                    "end_hour": band.end_hour,
+                    "multiplier": band.multiplier,
+                }
+                for band in self.bands
+            ],
+        }
+
+
+class Tariff:
+    """Price hourly readings with a schedule of tariff periods.
+
+    Each period is expanded once into 24-entry rate tables indexed by local
+    hour of day, so pricing a batch is a period lookup and a few element-wise
+    multiplications rather than per-reading rule evaluation. Only components
+    with a non-zero rate in some period are priced; they are listed in
+    components.
+    """
+
+    def __init__(self, periods: list[TariffPeriod]) -> None:
+        """Initialise the tariff from one or more periods."""
+        if not periods:
+            raise ValueError("A tariff needs at least one period")
+        self.periods = sorted(periods, key=lambda period: period.effective_from)
+        self._period_days = [
+            period.effective_from.toordinal() - _EPOCH_ORDINAL for period in self.periods
+        ]
+        water_rates = []
+        wastewater_rates = []
+        for period in self.periods:
+            multipliers = [period.multiplier(hour) for hour in range(24)]
+            water_rates.append([period.clean_water_rate * m for m in multipliers])
+            wastewater_rates.append(
+                [period.wastewater_rate * period.sewer_return * m for m in multipliers]
+            )
+        # The daily standing charge is added once, to the first reading of
+        # each local day, however many hours the day has or was recorded.
+        standing_rates = [period.standing_charge for period in self.periods]
+        self.components = tuple(
+            component
+            for component, rates in (
+                ("water", water_rates),
+                ("wastewater", wastewater_rates),
+                ("standing", [standing_rates]),
+            )
+            if any(rate > 0 for period_rates in rates for rate in period_rates)
+        )
+        if np is not None:
+            self._water_rates = np.array(water_rates, dtype=np.float64)
+            self._wastewater_rates = np.array(wastewater_rates, dtype=np.float64)
+            self._standing_rates = np.array(standing_rates, dtype=np.float64)
+        else:
+            self._water_rates = water_rates
+            self._wastewater_rates = wastewater_rates
+            self._standing_rates = standing_rates
+
+    @classmethod
+    def from_config(cls, config: list[dict] | None, liter_cost: float) -> Tariff:
+        """Build a tariff from stored periods, or a flat rate of liter_cost."""
+        if not config:
+            return cls([TariffPeriod(datetime.date.min, liter_cost)])
+        return cls(
+            [
+                TariffPeriod(
+                    effective_from=period["effective_from"],
+                    clean_water_rate=period["clean_water_rate"],
+                    wastewater_rate=period["wastewater_rate"],
+                    sewer_return=period["sewer_return"],
+                    standing_charge=period["standing_charge"],
+                    bands=tuple(TimeOfUseBand(**band) for band in period["bands"]),
+                )
+                for period in TARIFF_SCHEMA(config)
+            ]
+        )
+
+    def as_config(self) -> list[dict[str, Any]]:
+        """Return the periods in the form stored in the config entry options."""
+        return [period.as_dict() for period in self.periods]
+
+    def price(
+        self, readings: ReadingsBuffer, tz: datetime.tzinfo
+    ) -> dict[str, list[float]]:
+        """Return the per-reading cost of every priced component and their total.
+
+        Only the components in self.components are returned. The standing
+        charge falls on the first reading of each local day in the batch, so
+        batches must not split a local day.
+        """
+        local_hours = readings.local_hours(tz)
+        if np is not None:
+            local = np.frombuffer(local_hours, dtype=np.int64)
+            usage = np.frombuffer(readings.usage, dtype=np.float64)
+            day = local // 24
+            period = np.searchsorted(self._period_days, day, side="right") - 1
+            np.maximum(period, 0, out=period)
+            hour_of_day = local % 24
+            first_of_day = np.ones(len(day), dtype=bool)
+            first_of_day[1:] = day[1:] != day[:-1]
+            costs = {
+                "water": usage * self._water_rates[period, hour_of_day],
+                "wastewater": usage * self._wastewater_rates[period, hour_of_day],
+                "standing": np.where(first_of_day, self._standing_rates[period], 0.0),
+            }
+            total = costs["water"] + costs["wastewater"] + costs["standing"]
+            return {
+                **{component: costs[component].tolist() for component in self.components},
+                "total": total.tolist(),
+            }
+
+        costs: dict[str, list[float]] = {
+            component: [] for component in (*COST_COMPONENTS, "total")
+        }
+        previous_day = None
+        for local, usage in zip(local_hours, readings.usage):
+            day = local // 24
+            period = max(bisect_right(self._period_days, day) - 1, 0)
+            hour_of_day = local % 24
+            water = usage * self._water_rates[period][hour_of_day]
+            wastewater = usage * self._wastewater_rates[period][hour_of_day]
+            standing = self._standing_rates[period] if day != previous_day else 0.0
+            previous_day = day
+            costs["water"].append(water)
+            costs["wastewater"].append(wastewater)
+            costs["standing"].append(standing)
+            costs["total"].append(water + wastewater + standing)
+        return {
+            component: costs[component] for component in (*self.components, "total")
+        }
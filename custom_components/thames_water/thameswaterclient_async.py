@@ -0,0 +1,508 @@
+import asyncio
+import base64
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import datetime
+import hashlib
+from http.cookies import Morsel
+import logging
+import os
+import time
+from typing import Literal
+import uuid
+
+import aiohttp
+from yarl import URL
+
+from .thameswaterclient import (
+    DEFAULT_ENDPOINTS,
+    MAX_ATTEMPTS,
+    RETRY_STATUSES,
+    Endpoints,
+    MeterUsage,
+    RequestStats,
+    ThamesWaterAuthError,
+    TokenBucket,
+    json_loads,
+    meter_usage_params,
+    parse_meter_usage,
+    retry_delay,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+MAX_REDIRECTS = 10
+
+
+class AsyncThamesWater:
+    """asyncio variant of ThamesWater built on an aiohttp ClientSession.
+
+    The session should have its own cookie jar, since the B2C flow relies on
+    cookies that must not leak between accounts.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        email: str,
+        password: str,
+        account_number: int,
+        client_id: str = "cedfde2d-79a7-44fd-9833-cae769640d3d",  # specific to Thames Water
+        rate_limiter: TokenBucket | None = None,
+        request_stats: RequestStats | None = None,
+        endpoints: Endpoints = DEFAULT_ENDPOINTS,
+    ):
+        self.s = session
+        self.email = email
+        self.password = password
+        self.account_number = account_number
+        self.client_id = client_id
+        self.oauth_request_tokens: dict = {}
+        self.oauth_response_tokens: dict = {}
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.request_stats = request_stats or RequestStats()
+        self.endpoints = endpoints
+
+    @classmethod
+    async def async_create(
+        cls,
+        session: aiohttp.ClientSession,
+        email: str,
+        password: str,
+        account_number: int,
+        session_state: dict | None = None,
+        rate_limiter: TokenBucket | None = None,
+        request_stats: RequestStats | None = None,
+        endpoints: Endpoints = DEFAULT_ENDPOINTS,
+    ) -> "AsyncThamesWater":
+        """Create an authenticated client, resuming session_state if possible."""
+        client = cls(
+            session,
+            email,
+            password,
+            account_number,
+            rate_limiter=rate_limiter,
+            request_stats=request_stats,
+            endpoints=endpoints,
+        )
+        # Only replay the password flow when there is no resumable session.
+        if not session_state or not await client._resume(session_state):
+            await client._authenticate()
+        return client
+
+    async def async_close(self):
+        await self.s.close()
+
+    @asynccontextmanager
+    async def _request(
+        self, method: str, url: str | URL, **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a rate-limited request, retrying throttling and transient errors."""
+        attempt = 0
+        while True:
+            attempt += 1
+            await asyncio.sleep(self.rate_limiter.reserve())
+            self.request_stats.add("requests")
+            try:
+                r = await self.s.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, TimeoutError) as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                delay = retry_delay(attempt)
+                _LOGGER.debug("Request to %s failed (%s), retrying in %.1fs", url, e, delay)
+            else:
+                if r.status not in RETRY_STATUSES or attempt == MAX_ATTEMPTS:
+                    if r.status != 429:
+                        self.rate_limiter.succeeded()
+                    try:
+                        yield r
+                    finally:
+                        r.release()
+                    return
+                if r.status == 429:
+                    self.request_stats.add("throttled")
+                    self.rate_limiter.throttled()
+                delay = retry_delay(attempt, r.headers.get("Retry-After"))
+                r.release()
+                _LOGGER.debug(
+                    "Request to %s returned %s, retrying in %.1fs", url, r.status, delay
+                )
+            self.request_stats.add("retries")
+            await asyncio.sleep(delay)
+
+    def _generate_pkce(self):
+        self.pkce_verifier = (
+            base64.urlsafe_b64encode(os.urandom(32)).decode("utf-8").rstrip("=")
+        )
+        self.pkce_challenge = (
+            base64.urlsafe_b64encode(
+                hashlib.sha256(self.pkce_verifier.encode()).digest()
+            )
+            .decode("utf-8")
+            .rstrip("=")
+        )
+
+    def _cookie(self, name: str) -> str:
+        for cookie in self.s.cookie_jar:
+            if cookie.key == name:
+                return cookie.value
+        raise KeyError(name)
+
+    async def _authorize_b2c_1_tw_website_signin(self) -> tuple[str, str]:
+        url = f"{self.endpoints.b2c_url}/b2c_1_tw_website_signin/oauth2/v2.0/authorize"
+
+        params = {
+            "client_id": self.client_id,
+            "scope": "openid profile offline_access",
+            "response_type": "code",
+            "redirect_uri": self.endpoints.redirect_uri,
+            "response_mode": "fragment",
+            "code_challenge": self.pkce_challenge,
+            "code_challenge_method": "S256",
+            "nonce": str(uuid.uuid4()),
+            "state": str(uuid.uuid4()),
+        }
+
+        async with self._request("GET", url, params=params, timeout=REQUEST_TIMEOUT) as r:
+            r.raise_for_status()
+        return self._cookie("x-ms-cpim-trans"), self._cookie("x-ms-cpim-csrf")
+
+    async def _self_asserted_b2c_1_tw_website_signin(
+        self, trans_token: str, csrf_token: str
+    ):
+        url = f"{self.endpoints.b2c_url}/B2C_1_tw_website_signin/SelfAsserted"
+
+        params = {
+            "tx": f"StateProperties={trans_token}",
+            "p": "B2C_1_tw_website_signin",
+        }
+
+        data = {
+            "request_type": "RESPONSE",
+            "email": self.email,
+            "password": self.password,
+        }
+
+        headers = {
+            "user-agent": USER_AGENT,
+            "x-csrf-token": csrf_token,
+        }
+
+        async with self._request(
+            "POST",
+            url,
+            params=params,
+            data=data,
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+        ) as r:
+            r.raise_for_status()
+
+    async def _confirmed_b2c_1_tw_website_signin(
+        self, trans_token: str, csrf_token: str
+    ) -> str:
+        url = URL(
+            f"{self.endpoints.b2c_url}"
+            "/B2C_1_tw_website_signin/api/CombinedSigninAndSignup/confirmed"
+        )
+
+        headers = {"user-agent": USER_AGENT}
+
+        params = {
+            "rememberMe": "false",
+            "tx": f"StateProperties={trans_token}",
+            "csrf_token": csrf_token,
+            "p": "B2C_1_tw_website_signin",
+        }
+
+        # The authorization code is returned in the fragment of the final
+        # redirect, which aiohttp does not expose, so follow redirects by hand.
+        request_params: dict | None = params
+        for _ in range(MAX_REDIRECTS):
+            async with self._request(
+                "GET",
+                url,
+                headers=headers,
+                params=request_params,
+                allow_redirects=False,
+                timeout=REQUEST_TIMEOUT,
+            ) as r:
+                r.raise_for_status()
+                location = r.headers.get("Location")
+            if location is None:
+                break
+            url = url.join(URL(location))
+            request_params = None
+            if url.fragment:
+                break
+
+        confirmed_signup_structured_response = {
+            item.split("=")[0]: item.split("=")[1]
+            for item in url.raw_fragment.split("&")
+        }
+        return confirmed_signup_structured_response["code"]
+
+    async def _get_oauth2_code_b2c_1_tw_website_signin(self, confirmation_code: str):
+        url = f"{self.endpoints.b2c_url}/b2c_1_tw_website_signin/oauth2/v2.0/token"
+
+        headers = {
+            "content-type": "application/x-www-form-urlencoded;charset=utf-8",
+            "user-agent": USER_AGENT,
+        }
+
+        data = {
+            "client_id": self.client_id,
+            "redirect_uri": self.endpoints.redirect_uri,
+            "scope": "openid offline_access profile",
+            "grant_type": "authorization_code",
+            "client_info": "1",
+            "x-client-SKU": "msal.js.browser",
+            "x-client-VER": "3.1.0",
+            "x-ms-lib-capability": "retry-after, h429",
+            "x-client-current-telemetry": "5|865,0,,,|,",
+            "x-client-last-telemetry": "5|0|||0,0",
+            "code_verifier": self.pkce_verifier,
+            "code": confirmation_code,
+        }
+
+        async with self._request(
+            "POST",
+            url,
+            headers=headers,
+            data=data,
+            timeout=REQUEST_TIMEOUT,
+        ) as r:
+            r.raise_for_status()
+            self.oauth_request_tokens = await r.json(content_type=None)
+
+    async def _refresh_oauth2_token_b2c_1_tw_website_signin(self):
+        url = f"{self.endpoints.b2c_url}/b2c_1_tw_website_signin/oauth2/v2.0/token"
+
+        data = {
+            "client_id": self.client_id,
+            "scope": "openid profile offline_access",
+            "grant_type": "refresh_token",
+            "client_info": "1",
+            "x-client-SKU": "msal.js.browser",
+            "x-client-VER": "3.1.0",
+            "x-ms-lib-capability": "retry-after, h429",
+            "x-client-current-telemetry": "5|61,0,,,|@azure/msal-react,2.0.3",
+            "x-client-last-telemetry": "5|0|||0,0",
+            "refresh_token": self.oauth_request_tokens["refresh_token"],
+        }
+
+        headers = {"content-type": "application/x-www-form-urlencoded;charset=utf-8"}
+
+        # Mirrors the blocking client, which sends the form body on a GET.
+        async with self._request(
+            "GET",
+            url,
+            headers=headers,
+            data=data,
+            timeout=REQUEST_TIMEOUT,
+        ) as r:
+            r.raise_for_status()
+            self.oauth_response_tokens = await r.json(content_type=None)
+
+    async def _login(self, state: str, id_token: str):
+        url = f"{self.endpoints.myaccount_url}/login"
+
+        data = {
+            "state": state,
+            "id_token": id_token,
+        }
+
+        headers = {
+            "user-agent": USER_AGENT,
+            "content-type": "application/x-www-form-urlencoded",
+        }
+
+        async with self._request(
+            "POST",
+            url,
+            data=data,
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+        ) as r:
+            r.raise_for_status()
+
+    async def _establish_myaccount_session(self):
+        headers = {
+            "user-agent": USER_AGENT,
+            "Referer": f"{self.endpoints.myaccount_url}/twservice/Account/SignIn?useremail=",
+        }
+
+        async with self._request(
+            "GET",
+            f"{self.endpoints.myaccount_url}/mydashboard",
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+        ) as r:
+            r.raise_for_status()
+
+        async with self._request(
+            "GET",
+            f"{self.endpoints.myaccount_url}/mydashboard/my-meters-usage",
+            params={"contractAccountNumber": str(self.account_number)},
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+        ) as r:
+            r.raise_for_status()
+
+        async with self._request(
+            "GET",
+            f"{self.endpoints.myaccount_url}/twservice/Account/SignIn?useremail=",
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+        ) as r:
+            r.raise_for_status()
+            signin_url = r.url
+            text = await r.text()
+
+        state = signin_url.query["state"]
+        id_token = text.split("id='id_token' value='")[1].split("'/>")[0]
+        async with self._request("GET", signin_url, timeout=REQUEST_TIMEOUT) as r:
+            await r.read()
+        await self._login(state, id_token)
+        self.s.cookie_jar.update_cookies(
+            {"b2cAuthenticated": "true"}, URL(self.endpoints.myaccount_url)
+        )
+
+    async def _authenticate(self):
+        _LOGGER.info("Starting authentication for account %s", self.account_number)
+        started = time.perf_counter()
+        self.request_stats.add("logins")
+        try:
+            self._generate_pkce()
+            trans_token, csrf_token = await self._authorize_b2c_1_tw_website_signin()
+            await self._self_asserted_b2c_1_tw_website_signin(trans_token, csrf_token)
+            confirmation_code = await self._confirmed_b2c_1_tw_website_signin(
+                trans_token, csrf_token
+            )
+            await self._get_oauth2_code_b2c_1_tw_website_signin(confirmation_code)
+            await self._refresh_oauth2_token_b2c_1_tw_website_signin()
+            await self._establish_myaccount_session()
+            _LOGGER.info("Authentication successful for account %s", self.account_number)
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Authentication failed: %s", e)
+            raise
+        except (KeyError, IndexError) as e:
+            _LOGGER.error("Failed to parse authentication response: %s", e)
+            raise
+        finally:
+            self.request_stats.add("login_time", time.perf_counter() - started)
+
+    async def _resume(self, session_state: dict) -> bool:
+        """Resume a stored session with the refresh_token grant instead of the password.
+
+        Returns False if the stored tokens or cookies are no longer accepted.
+        """
+        _LOGGER.info("Resuming stored session for account %s", self.account_number)
+        started = time.perf_counter()
+        self.request_stats.add("resumes")
+        try:
+            for cookie in session_state["cookies"]:
+                myaccount_url = URL(self.endpoints.myaccount_url)
+                domain = cookie.get("domain") or myaccount_url.host
+                morsel: Morsel = Morsel()
+                morsel.set(cookie["name"], cookie["value"], cookie["value"])
+                morsel["domain"] = domain
+                morsel["path"] = cookie.get("path", "/")
+                self.s.cookie_jar.update_cookies(
+                    {cookie["name"]: morsel}, myaccount_url.with_host(domain.lstrip("."))
+                )
+            self.oauth_request_tokens = dict(session_state["tokens"])
+            await self._refresh_oauth2_token_b2c_1_tw_website_signin()
+            if "refresh_token" in self.oauth_response_tokens:
+                self.oauth_request_tokens["refresh_token"] = self.oauth_response_tokens[
+                    "refresh_token"
+                ]
+            await self._establish_myaccount_session()
+        except (aiohttp.ClientError, KeyError, IndexError, ValueError) as e:
+            _LOGGER.info("Stored session could not be resumed: %s", e)
+            self.s.cookie_jar.clear()
+            return False
+        finally:
+            self.request_stats.add("resume_time", time.perf_counter() - started)
+        _LOGGER.info("Resumed session for account %s", self.account_number)
+        return True
+
+    def export_session(self) -> dict:
+        """Return the token set and cookies needed to resume this session later.
+
+        The format is shared with ThamesWater.export_session.
+        """
+        tokens = dict(self.oauth_request_tokens)
+        if "refresh_token" in self.oauth_response_tokens:
+            tokens["refresh_token"] = self.oauth_response_tokens["refresh_token"]
+        return {
+            "tokens": tokens,
+            "cookies": [
+                {
+                    "name": cookie.key,
+                    "value": cookie.value,
+                    "domain": cookie["domain"],
+                    "path": cookie["path"] or "/",
+                }
+                for cookie in self.s.cookie_jar
+            ],
+        }
+
+    async def get_meter_usage(
+        self,
+        meter: int,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        granularity: Literal["H", "D", "M"] = "H",
+        raw: bool = False,
+    ) -> MeterUsage:
+        _LOGGER.info("Fetching meter usage for meter %s from %s to %s", meter, start.date(), end.date())
+        url = f"{self.endpoints.myaccount_url}/ajax/waterMeter/getSmartWaterMeterConsumptions"
+
+        params = {
+            key: str(value)
+            for key, value in meter_usage_params(meter, start, end, granularity).items()
+        }
+
+        headers = {
+            "user-agent": USER_AGENT,
+            "Referer": f"{self.endpoints.myaccount_url}/mydashboard/my-meters-usage",
+            "X-Requested-With": "XMLHttpRequest",
+        }
+
+        started = time.perf_counter()
+        self.request_stats.add("usage_calls")
+        try:
+            async with self._request(
+                "GET",
+                url,
+                params=params,
+                headers=headers,
+                timeout=REQUEST_TIMEOUT,
+            ) as r:
+                if r.status in (401, 403) or r.history:
+                    # An expired session is bounced to the sign-in page.
+                    raise ThamesWaterAuthError(
+                        f"Meter usage request was redirected or refused ({r.status})"
+                    )
+                r.raise_for_status()
+                if "text/html" in r.headers.get("content-type", ""):
+                    raise ThamesWaterAuthError("Meter usage request returned an HTML page")
+
+                result = parse_meter_usage(json_loads(await r.read()), raw)
+            _LOGGER.info(
+                "Retrieved %d readings for meter %s",
+                len(result.Lines or []),
+                meter,
+            )
+            return result
+        except aiohttp.ClientError as e:
+            _LOGGER.error("Failed to get meter usage: %s", e)
+            raise
+        except (KeyError, ValueError) as e:
+            _LOGGER.error("Failed to parse meter usage response: %s", e)
+            raise
+        finally:
+            self.request_stats.add("usage_time", time.perf_counter() - started)
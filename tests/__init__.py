@@ -0,0 +1,35 @@
+"""Tests for the Thames Water integration."""
+
+from __future__ import annotations
+
+from custom_components.thames_water.thameswaterclient import MeterUsage
+
+
+def meter_usage(
+    lines: list | None, *, available: bool = True, error: bool = False
+) -> MeterUsage:
+    """Return a meter usage response holding raw (Label, Usage, Read) lines."""
+    return MeterUsage(
+        IsError=error,
+        IsDataAvailable=available,
+        IsConsumptionAvailable=available,
+        TargetUsage=0.0,
+        AverageUsage=0.0,
+        ActualUsage=0.0,
+        MyUsage="NA",
+        AverageUsagePerPerson=0.0,
+        IsMO365Customer=False,
+        IsMOPartialCustomer=False,
+        IsMOCompleteCustomer=False,
+        IsExtraMonthConsumptionMessage=False,
+        Lines=lines,
+    )
+
+
+def hourly_lines(
+    labels: list[str] | None = None, usage: float = 1.0
+) -> list[tuple[str, float, float]]:
+    """Return raw lines for the given labels, by default a whole 24-hour day."""
+    if labels is None:
+        labels = [f"{hour:02d}:00" for hour in range(24)]
+    return [(label, usage, usage * (index + 1)) for index, label in enumerate(labels)]
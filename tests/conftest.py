@@ -0,0 +1,20 @@
+"""Fixtures for the Thames Water tests."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import datetime
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+
+@pytest.fixture
+def london() -> Iterator[datetime.tzinfo]:
+    """Run a test in the UK time zone, which Thames Water data is labelled in."""
+    tz = dt_util.get_time_zone("Europe/London")
+    previous = dt_util.get_default_time_zone()
+    dt_util.set_default_time_zone(tz)
+    yield tz
+    dt_util.set_default_time_zone(previous)
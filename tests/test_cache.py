@@ -0,0 +1,82 @@
+"""Tests for the meter usage cache."""
+
+from __future__ import annotations
+
+import datetime
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water.cache import (
+    ERROR_DAY_TTL,
+    INCOMPLETE_DAY_TTL,
+    MeterUsageCache,
+)
+
+from . import hourly_lines, meter_usage
+
+KEY = "thames_water.test.usage_cache"
+METER = "5678"
+DAY = datetime.date(2024, 6, 1)
+SPRING_FORWARD = datetime.date(2024, 3, 31)
+
+
+async def test_complete_day_never_expires(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, london
+) -> None:
+    """A complete day is kept as it was fetched, with lines as tuples."""
+    cache = MeterUsageCache(hass, KEY)
+    usage = meter_usage(hourly_lines())
+    cache.put(METER, DAY, usage)
+
+    freezer.tick(datetime.timedelta(days=1000))
+
+    assert cache.get(METER, DAY) == usage
+    assert cache.get(METER, DAY, "D") is None
+
+
+async def test_23_hour_day_is_complete(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, london
+) -> None:
+    """A 23-hour day with 23 lines does not expire."""
+    cache = MeterUsageCache(hass, KEY)
+    labels = [f"{hour:02d}:00" for hour in range(24) if hour != 1]
+    cache.put(METER, SPRING_FORWARD, meter_usage(hourly_lines(labels)))
+
+    freezer.tick(INCOMPLETE_DAY_TTL * 10)
+
+    assert cache.get(METER, SPRING_FORWARD) is not None
+
+
+async def test_incomplete_and_failed_days_expire(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, london
+) -> None:
+    """Partial days and days without data are fetched again later."""
+    cache = MeterUsageCache(hass, KEY)
+    partial_day = DAY + datetime.timedelta(days=1)
+    cache.put(METER, DAY, meter_usage(None, available=False))
+    cache.put(METER, partial_day, meter_usage(hourly_lines(["00:00", "01:00"])))
+
+    freezer.tick(ERROR_DAY_TTL)
+    assert cache.get(METER, DAY) is None
+    assert cache.get(METER, partial_day) is not None
+
+    freezer.tick(INCOMPLETE_DAY_TTL)
+    assert cache.get(METER, partial_day) is None
+    assert len(cache) == 0
+
+
+async def test_least_recently_used_evicted(hass: HomeAssistant, london) -> None:
+    """Above max_entries the least recently used day is dropped."""
+    cache = MeterUsageCache(hass, KEY, max_entries=2)
+    days = [DAY + datetime.timedelta(days=offset) for offset in range(3)]
+    cache.put(METER, days[0], meter_usage(hourly_lines()))
+    cache.put(METER, days[1], meter_usage(hourly_lines()))
+    assert cache.get(METER, days[0]) is not None
+
+    cache.put(METER, days[2], meter_usage(hourly_lines()))
+
+    assert len(cache) == 2
+    assert cache.get(METER, days[1]) is None
+    assert cache.get(METER, days[0]) is not None
@@ -0,0 +1,271 @@
+"""Tests for the Thames Water coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water.const import DOMAIN
+from custom_components.thames_water.coordinator import (
+    DayData,
+    ThamesWaterCoordinator,
+    ThamesWaterData,
+    _align_coarse_lines,
+    _process_days,
+    _split_lines_by_day,
+)
+from custom_components.thames_water.metrics import RefreshMetrics
+from custom_components.thames_water.readings import ReadingsBuffer, day_utc_hours
+
+from . import hourly_lines, meter_usage
+
+COORDINATOR = "custom_components.thames_water.coordinator"
+
+FALL_BACK = datetime.date(2024, 10, 27)
+FALL_BACK_LABELS = ["00:00", "01:00", "01:00"] + [
+    f"{hour:02d}:00" for hour in range(2, 24)
+]
+
+
+def _dates(first: datetime.date, days: int) -> list[datetime.date]:
+    """Return consecutive dates."""
+    return [first + datetime.timedelta(days=day) for day in range(days)]
+
+
+def _day(date: datetime.date) -> datetime.datetime:
+    """Return the naive midnight the coordinator keys days by."""
+    return datetime.datetime(date.year, date.month, date.day)
+
+
+async def _coordinator(hass: HomeAssistant) -> ThamesWaterCoordinator:
+    """Return a coordinator for a meter without a Thames Water connection."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "username": "user@example.com",
+            "password": "secret",
+            "account_number": "1234",
+            "meter_id": "5678",
+            "liter_cost": "0.002",
+        },
+        unique_id="1234:5678",
+    )
+    entry.add_to_hass(hass)
+    client_manager = MagicMock(authenticated=True)
+    client_manager.async_get_client = AsyncMock()
+    return ThamesWaterCoordinator(hass, entry, client_manager)
+
+
+def test_split_whole_days(london) -> None:
+    """A window of complete days splits into one bucket per day."""
+    dates = _dates(datetime.date(2024, 6, 1), 2)
+    lines = hourly_lines() + hourly_lines(usage=2.0)
+
+    buckets = _split_lines_by_day(lines, dates)
+
+    assert buckets == [lines[:24], lines[24:]]
+
+
+def test_split_25_hour_day(london) -> None:
+    """The repeated label of a 25-hour day stays within its day."""
+    dates = [FALL_BACK, FALL_BACK + datetime.timedelta(days=1)]
+    lines = hourly_lines(FALL_BACK_LABELS) + hourly_lines()
+
+    buckets = _split_lines_by_day(lines, dates)
+
+    assert [len(bucket) for bucket in buckets] == [25, 24]
+
+
+def test_split_partly_published_window(london) -> None:
+    """A window answered with its first days only returns those buckets."""
+    dates = _dates(datetime.date(2024, 6, 1), 3)
+    lines = hourly_lines() + hourly_lines([f"{hour:02d}:00" for hour in range(6)])
+
+    buckets = _split_lines_by_day(lines, dates)
+
+    assert [len(bucket) for bucket in buckets] == [24, 6]
+
+
+def test_split_rejects_unreadable_responses(london) -> None:
+    """More days than requested, or an unreadable label, cannot be split."""
+    dates = _dates(datetime.date(2024, 6, 1), 2)
+    assert _split_lines_by_day(hourly_lines() * 3, dates) is None
+    assert _split_lines_by_day(hourly_lines(["00:00", "noon"]), dates) is None
+
+
+def test_process_25_hour_day(london) -> None:
+    """Both passes through the repeated hour land on their own UTC hours."""
+    readings = ReadingsBuffer()
+
+    last_read, day_data = _process_days(
+        [(_day(FALL_BACK), hourly_lines(FALL_BACK_LABELS))], readings
+    )
+
+    utc_hours = [hour for hours in day_utc_hours(FALL_BACK, london) for hour in hours]
+    assert readings.hours.tolist() == utc_hours
+    assert day_data.total_usage == 25.0
+    assert last_read == 25.0
+
+
+def test_process_days_after_watermark(london) -> None:
+    """Rows up to the watermark are dropped and days before it skipped."""
+    first, second = _dates(datetime.date(2024, 6, 1), 2)
+    second_hours = day_utc_hours(second, london)
+    readings = ReadingsBuffer()
+
+    _, day_data = _process_days(
+        [(_day(first), hourly_lines()), (_day(second), hourly_lines())],
+        readings,
+        after_hour=second_hours[5][0],
+    )
+
+    assert readings.hours.tolist() == [hours[0] for hours in second_hours[6:]]
+    assert day_data.date == second
+    # The whole day is still summarised for the sensors.
+    assert day_data.total_usage == 24.0
+
+    readings = ReadingsBuffer()
+    _, day_data = _process_days(
+        [(_day(first), hourly_lines())], readings, after_hour=second_hours[0][0]
+    )
+    assert not readings
+    assert day_data is None
+
+
+def test_align_coarse_lines_by_label() -> None:
+    """Periods before the meter was installed have no line and are left out."""
+    window = [(date, date) for date in _dates(datetime.date(2024, 5, 30), 4)]
+    lines = [("01 Jun", 120.0, 0.0), ("02 Jun", 130.0, 0.0)]
+
+    periods = _align_coarse_lines(lines, window, "D")
+
+    assert periods == [
+        (datetime.date(2024, 6, 1), datetime.date(2024, 6, 1), 120.0),
+        (datetime.date(2024, 6, 2), datetime.date(2024, 6, 2), 130.0),
+    ]
+
+
+def test_align_coarse_months() -> None:
+    """Monthly labels are matched to the months of the window."""
+    window = [
+        (datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)),
+        (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)),
+    ]
+    periods = _align_coarse_lines([("Feb 2024", 3000.0, 0.0)], window, "M")
+    assert periods == [(*window[1], 3000.0)]
+
+
+def test_align_coarse_lines_without_labels() -> None:
+    """Unreadable labels are matched in order, missing the first periods."""
+    window = [(date, date) for date in _dates(datetime.date(2024, 6, 1), 3)]
+
+    periods = _align_coarse_lines([("?", 1.0, 0.0), ("?", 2.0, 0.0)], window, "D")
+
+    assert periods == [(*window[1], 1.0), (*window[2], 2.0)]
+    assert _align_coarse_lines([("?", 1.0, 0.0)] * 4, window, "D") is None
+
+
+def test_align_coarse_lines_outside_window() -> None:
+    """Labels naming periods outside the window cannot be matched."""
+    window = [(date, date) for date in _dates(datetime.date(2024, 6, 1), 2)]
+    assert _align_coarse_lines([("05 Jul", 1.0, 0.0)], window, "D") is None
+
+
+async def test_fetch_window_refetches_only_the_tail(
+    hass: HomeAssistant, london
+) -> None:
+    """A partly published window keeps its complete days and refetches the rest."""
+    coordinator = await _coordinator(hass)
+    dates = _dates(datetime.date(2024, 6, 1), 3)
+    partial = hourly_lines([f"{hour:02d}:00" for hour in range(6)])
+
+    async def fetch(meter_id, start, end, semaphore):
+        if start != end:
+            return meter_usage(hourly_lines() + partial)
+        if start.date() == dates[1]:
+            return meter_usage(partial)
+        return meter_usage(None, available=False)
+
+    coordinator._async_fetch_usage = AsyncMock(side_effect=fetch)
+
+    days = await coordinator._async_fetch_window("5678", dates, asyncio.Semaphore(2))
+
+    assert [d.date() for d, _ in days] == dates
+    assert [len(usage.Lines or ()) for _, usage in days] == [24, 6, 0]
+    calls = coordinator._async_fetch_usage.mock_calls
+    assert sorted(call.args[1].date() for call in calls) == dates
+
+
+async def test_probe_ignores_incomplete_days(hass: HomeAssistant, london) -> None:
+    """Only a complete or failed day makes the probe run a refresh."""
+    coordinator = await _coordinator(hass)
+    latest = datetime.date(2024, 6, 1)
+    coordinator.data = ThamesWaterData(
+        latest_day=DayData(latest, 24.0, 1.0, 24.0),
+        latest_reading=24.0,
+        last_data_time=datetime.datetime(2024, 6, 1, 23, tzinfo=london),
+    )
+    partial = meter_usage(hourly_lines([f"{hour:02d}:00" for hour in range(6)]))
+    no_data = meter_usage(None, available=False)
+    second, third = _dates(latest + datetime.timedelta(days=1), 2)
+
+    coordinator.async_fetch_days = AsyncMock(
+        return_value=[(_day(second), partial), (_day(third), no_data)]
+    )
+    assert not await coordinator._async_probe(RefreshMetrics())
+    assert coordinator.newest_published == second
+
+    coordinator.async_fetch_days = AsyncMock(
+        return_value=[(_day(second), partial), (_day(third), partial)]
+    )
+    assert not await coordinator._async_probe(RefreshMetrics())
+
+    coordinator.async_fetch_days = AsyncMock(
+        return_value=[(_day(second), partial), (_day(third), None)]
+    )
+    assert await coordinator._async_probe(RefreshMetrics())
+
+    complete = meter_usage(hourly_lines())
+    coordinator.async_fetch_days = AsyncMock(
+        return_value=[(_day(second), partial), (_day(third), complete)]
+    )
+    assert await coordinator._async_probe(RefreshMetrics())
+
+
+async def test_refresh_keeps_unpublished_days_out_of_gaps(
+    hass: HomeAssistant, london
+) -> None:
+    """Only failed days before the newest imported day are queued for repair."""
+    coordinator = await _coordinator(hass)
+    dates = _dates(datetime.date(2024, 6, 1), 5)
+    no_data = meter_usage(None, available=False)
+    coordinator.async_fetch_days = AsyncMock(
+        return_value=[
+            (_day(dates[0]), meter_usage(hourly_lines())),
+            (_day(dates[1]), no_data),
+            (_day(dates[2]), meter_usage(hourly_lines())),
+            (_day(dates[3]), no_data),
+            (_day(dates[4]), meter_usage(hourly_lines(["00:00", "01:00"]))),
+        ]
+    )
+    recorder = MagicMock()
+    recorder.async_add_executor_job = AsyncMock(return_value={})
+
+    with (
+        patch(f"{COORDINATOR}.get_instance", return_value=recorder),
+        patch(f"{COORDINATOR}.async_add_external_statistics") as add_statistics,
+        patch.object(coordinator, "_async_repair_gaps", AsyncMock()),
+    ):
+        data = await coordinator._async_refresh_statistics(RefreshMetrics())
+
+    assert list(coordinator.gaps.as_dict()) == [dates[1].isoformat()]
+    assert data.latest_day.date == dates[2]
+    consumption = add_statistics.mock_calls[0].args[2]
+    assert len(consumption) == 48
+    assert consumption[-1]["sum"] == 48.0
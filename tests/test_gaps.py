@@ -0,0 +1,84 @@
+"""Tests for the gap index."""
+
+from __future__ import annotations
+
+import datetime
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water.gaps import (
+    GAP_MISSING,
+    GAP_NO_DATA,
+    GAP_PARTIAL,
+    GAPS_STORAGE_VERSION,
+    MAX_REPAIR_ATTEMPTS,
+    REPAIR_INTERVAL,
+    GapIndex,
+)
+
+KEY = "thames_water.test.gaps"
+FIRST = datetime.date(2024, 6, 1)
+SECOND = datetime.date(2024, 6, 2)
+
+
+async def test_due_after_repair_interval(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A day is only due again once REPAIR_INTERVAL has passed, oldest first."""
+    gaps = GapIndex(hass, KEY)
+    gaps.record(SECOND, GAP_PARTIAL, 20)
+    gaps.record(FIRST, GAP_MISSING)
+    assert len(gaps) == 2
+    assert gaps.due(5) == []
+
+    freezer.tick(REPAIR_INTERVAL)
+    assert gaps.due(5) == [FIRST, SECOND]
+    assert gaps.due(1) == [FIRST]
+
+    gaps.record(FIRST, GAP_MISSING)
+    assert gaps.due(5) == [SECOND]
+    assert gaps.as_dict()[FIRST.isoformat()]["attempts"] == 1
+
+
+async def test_resolve(hass: HomeAssistant) -> None:
+    """A complete day leaves the index."""
+    gaps = GapIndex(hass, KEY)
+    gaps.record(FIRST, GAP_NO_DATA)
+    gaps.resolve(FIRST)
+    gaps.resolve(SECOND)
+    assert len(gaps) == 0
+
+
+async def test_gives_up_after_max_attempts(hass: HomeAssistant) -> None:
+    """A day still incomplete after MAX_REPAIR_ATTEMPTS retries is dropped."""
+    gaps = GapIndex(hass, KEY)
+    for _ in range(MAX_REPAIR_ATTEMPTS):
+        gaps.record(FIRST, GAP_PARTIAL, 12)
+    assert gaps.as_dict()[FIRST.isoformat()]["attempts"] == MAX_REPAIR_ATTEMPTS - 1
+
+    gaps.record(FIRST, GAP_PARTIAL, 12)
+    assert len(gaps) == 0
+
+
+async def test_load(hass: HomeAssistant, hass_storage: dict) -> None:
+    """Stored entries are loaded."""
+    hass_storage[KEY] = {
+        "version": GAPS_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": KEY,
+        "data": {
+            "entries": {
+                FIRST.isoformat(): {
+                    "reason": GAP_MISSING,
+                    "hours": 0,
+                    "attempts": 3,
+                    "checked": 0.0,
+                }
+            }
+        },
+    }
+    gaps = GapIndex(hass, KEY)
+    await gaps.async_load()
+    assert gaps.due(5) == [FIRST]
@@ -0,0 +1,81 @@
+"""Tests for the incremental leak detection."""
+
+from __future__ import annotations
+
+import datetime
+
+from custom_components.thames_water.leak import (
+    CONTINUOUS_FLOW_HOURS,
+    MIN_NIGHTS,
+    LeakState,
+)
+from custom_components.thames_water.readings import ReadingsBuffer
+
+UTC = datetime.UTC
+# 2024-01-01T00:00Z as an epoch hour.
+START = 473352
+
+
+def _readings(usage: list[float], start: int = START) -> ReadingsBuffer:
+    """Return consecutive hourly readings from start."""
+    readings = ReadingsBuffer()
+    for offset, value in enumerate(usage):
+        readings.append(start + offset, value)
+    return readings
+
+
+def test_continuous_flow() -> None:
+    """Water flowing every hour for a day is a leak."""
+    state = LeakState()
+    state.update(_readings([1.0] * (CONTINUOUS_FLOW_HOURS - 1)), UTC)
+    assert not state.continuous_flow
+
+    state.update(_readings([1.0], START + CONTINUOUS_FLOW_HOURS - 1), UTC)
+    assert state.continuous_flow
+    assert state.leak
+
+
+def test_missing_hour_ends_flow() -> None:
+    """A gap in the readings restarts the flow streak."""
+    state = LeakState()
+    state.update(_readings([1.0] * 12), UTC)
+    state.update(_readings([1.0] * 12, START + 13), UTC)
+    assert state.flow_hours == 12
+
+    state.update(_readings([0.0], START + 25), UTC)
+    assert state.flow_hours == 0
+
+
+def test_old_rows_are_ignored() -> None:
+    """Rows at or before the last hour folded in are skipped."""
+    state = LeakState()
+    readings = _readings([1.0] * 30)
+    assert state.update(readings, UTC) == 30
+    assert state.update(readings, UTC) == 0
+    assert state.last_hour == START + 29
+
+
+def test_minimum_flow_average() -> None:
+    """A day whose quietest hour still uses water raises the average."""
+    state = LeakState()
+    state.update(_readings([3.0] * 24 * 3 + [0.0]), UTC)
+    assert state.min_flow_average == 3.0
+    assert state.leak
+
+
+def test_unusual_night() -> None:
+    """A night well above the baseline is flagged once the window closes."""
+    state = LeakState()
+    quiet_day = [0.0] + [1.0] * 4 + [10.0] * 19
+    state.update(_readings(quiet_day * (MIN_NIGHTS + 1)), UTC)
+    assert state.nights == MIN_NIGHTS + 1
+    assert state.night_baseline == 4.0
+    assert not state.unusual_night
+
+    busy_start = START + 24 * (MIN_NIGHTS + 1)
+    state.update(_readings([0.0] + [10.0] * 4, busy_start), UTC)
+    assert not state.unusual_night
+
+    state.update(_readings([10.0], busy_start + 5), UTC)
+    assert state.unusual_night
+    assert state.last_night_usage == 40.0
@@ -0,0 +1,87 @@
+"""Tests for the hourly readings helpers."""
+
+from __future__ import annotations
+
+import datetime
+from zoneinfo import ZoneInfo
+
+from custom_components.thames_water.readings import (
+    ReadingsBuffer,
+    day_utc_hours,
+    expected_lines,
+    utc_offset_segments,
+)
+
+LONDON = ZoneInfo("Europe/London")
+# Clocks go forward at 01:00 GMT and back at 02:00 BST on these days.
+SPRING_FORWARD = datetime.date(2024, 3, 31)
+FALL_BACK = datetime.date(2024, 10, 27)
+
+
+def _epoch_hour(*args: int) -> int:
+    """Return the UTC epoch hour of a UTC date and hour."""
+    return int(datetime.datetime(*args, tzinfo=datetime.UTC).timestamp()) // 3600
+
+
+def test_ordinary_day() -> None:
+    """Every local hour of an ordinary day maps onto one UTC hour."""
+    midnight = _epoch_hour(2024, 5, 31, 23)
+    hours = day_utc_hours(datetime.date(2024, 6, 1), LONDON)
+    assert hours == tuple((midnight + hour,) for hour in range(24))
+    assert expected_lines(datetime.date(2024, 6, 1), LONDON) == 24
+
+
+def test_23_hour_day() -> None:
+    """The skipped hour maps onto the hour after it, leaving 23 UTC hours."""
+    midnight = _epoch_hour(2024, 3, 31, 0)
+    hours = day_utc_hours(SPRING_FORWARD, LONDON)
+    assert hours[0] == (midnight,)
+    assert hours[1] == hours[2] == (midnight + 1,)
+    assert hours[23] == (midnight + 22,)
+    assert expected_lines(SPRING_FORWARD, LONDON) == 23
+
+
+def test_25_hour_day() -> None:
+    """The repeated hour maps onto two UTC hours; 24 lines complete the day."""
+    midnight = _epoch_hour(2024, 10, 26, 23)
+    hours = day_utc_hours(FALL_BACK, LONDON)
+    assert hours[0] == (midnight,)
+    assert hours[1] == (midnight + 1, midnight + 2)
+    assert hours[23] == (midnight + 24,)
+    assert sum(len(utc_hours) for utc_hours in hours) == 25
+    assert expected_lines(FALL_BACK, LONDON) == 24
+
+
+def test_utc_offset_segments() -> None:
+    """A DST change splits the range where the offset changes."""
+    first = _epoch_hour(2024, 10, 26, 0)
+    last = _epoch_hour(2024, 10, 28, 0)
+    assert utc_offset_segments(first, last, LONDON) == [
+        (first, 1),
+        (_epoch_hour(2024, 10, 27, 1), 0),
+    ]
+    assert utc_offset_segments(first, first + 5, LONDON) == [(first, 1)]
+
+
+def test_local_hours_across_dst() -> None:
+    """Local hours skip the hour clocks jump over."""
+    midnight = _epoch_hour(2024, 3, 31, 0)
+    readings = ReadingsBuffer()
+    for hour in range(midnight, midnight + 4):
+        readings.append(hour, 1.0)
+
+    local = readings.local_hours(LONDON)
+
+    assert [hour % 24 for hour in local] == [0, 2, 3, 4]
+    assert {hour // 24 for hour in local} == {
+        SPRING_FORWARD.toordinal() - datetime.date(1970, 1, 1).toordinal()
+    }
+
+
+def test_running_totals() -> None:
+    """Running totals accumulate usage row by row."""
+    readings = ReadingsBuffer()
+    for hour, usage in enumerate((1.0, 2.0, 3.5)):
+        readings.append(hour, usage)
+    assert readings.running_totals() == [1.0, 3.0, 6.5]
+    assert ReadingsBuffer().local_hours(LONDON).tolist() == []
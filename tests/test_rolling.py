@@ -0,0 +1,118 @@
+"""Tests for the rolling usage buffer."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water.readings import ReadingsBuffer
+from custom_components.thames_water.rolling import (
+    CAPACITY_HOURS,
+    ROLLING_STORAGE_VERSION,
+    WEEK_HOURS,
+    RollingUsage,
+)
+
+KEY = "thames_water.test.rolling"
+# 2024-01-01T00:00Z as an epoch hour.
+START = 473352
+
+
+def _readings(hours: range, usage: float = 1.0) -> ReadingsBuffer:
+    """Return the same usage for every hour of a range."""
+    readings = ReadingsBuffer()
+    for hour in hours:
+        readings.append(hour, usage)
+    return readings
+
+
+async def test_windows_need_every_hour(hass: HomeAssistant) -> None:
+    """A window is only reported once all of its hours hold a reading."""
+    rolling = RollingUsage(hass, KEY)
+    rolling.update(_readings(range(START, START + WEEK_HOURS - 1)))
+    assert rolling.aggregates().last_7_days is None
+
+    rolling.update(_readings(range(START + WEEK_HOURS - 1, START + WEEK_HOURS)))
+    aggregates = rolling.aggregates()
+    assert aggregates.last_7_days == WEEK_HOURS
+    assert aggregates.previous_7_days is None
+    assert aggregates.last_30_days is None
+
+
+async def test_oldest_hours_are_evicted(hass: HomeAssistant) -> None:
+    """Only the last CAPACITY_HOURS count towards the totals."""
+    rolling = RollingUsage(hass, KEY)
+    rolling.update(_readings(range(START, START + 48), 100.0))
+    rolling.update(_readings(range(START + 48, START + 48 + CAPACITY_HOURS)))
+
+    aggregates = rolling.aggregates()
+
+    assert aggregates.last_30_days == CAPACITY_HOURS
+    assert aggregates.last_7_days == aggregates.previous_7_days == WEEK_HOURS
+    assert aggregates.change_vs_previous_week == 0.0
+
+
+async def test_skipped_hours_stay_uncovered(hass: HomeAssistant) -> None:
+    """Repairing an old hour does not cover the skipped hours after it."""
+    rolling = RollingUsage(hass, KEY)
+    newest_week = range(START + 2 * WEEK_HOURS, START + 3 * WEEK_HOURS)
+    rolling.update(_readings(newest_week))
+    rolling.update(_readings(range(START + 10, START + 11), 5.0))
+
+    assert rolling.aggregates().last_7_days == WEEK_HOURS
+    assert rolling.aggregates().previous_7_days is None
+
+    rolling.update(_readings(range(START + WEEK_HOURS, START + 2 * WEEK_HOURS), 2.0))
+    assert rolling.aggregates().previous_7_days == 2 * WEEK_HOURS
+
+
+async def test_repaired_hour_replaces_value(hass: HomeAssistant) -> None:
+    """Writing an hour again replaces its usage instead of adding to it."""
+    rolling = RollingUsage(hass, KEY)
+    rolling.update(_readings(range(START, START + WEEK_HOURS)))
+    rolling.update(_readings(range(START + 3, START + 4), 10.0))
+    assert rolling.aggregates().last_7_days == WEEK_HOURS + 9
+
+
+async def test_reload(hass: HomeAssistant, hass_storage: dict) -> None:
+    """Totals are rebuilt from the stored buffer."""
+    rolling = RollingUsage(hass, KEY)
+    rolling.update(_readings(range(START, START + CAPACITY_HOURS), 2.0))
+    # A few skipped hours leave the last week uncovered.
+    late = START + CAPACITY_HOURS + 5
+    rolling.update(_readings(range(late, late + 1)))
+    hass_storage[KEY] = {
+        "version": ROLLING_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": KEY,
+        "data": rolling._data_to_save(),
+    }
+
+    reloaded = RollingUsage(hass, KEY)
+    await reloaded.async_load()
+
+    assert reloaded.aggregates() == rolling.aggregates()
+    assert reloaded.aggregates().last_7_days is None
+
+
+async def test_reload_without_coverage(hass: HomeAssistant, hass_storage: dict) -> None:
+    """Buffers saved before coverage was tracked count from their first hour."""
+    last_hour = START + CAPACITY_HOURS - 1
+    usage = [0.0] * CAPACITY_HOURS
+    for hour in range(last_hour - WEEK_HOURS + 1, last_hour + 1):
+        usage[hour % CAPACITY_HOURS] = 1.0
+    hass_storage[KEY] = {
+        "version": ROLLING_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": KEY,
+        "data": {
+            "first_hour": last_hour - WEEK_HOURS + 1,
+            "last_hour": last_hour,
+            "usage": usage,
+        },
+    }
+
+    rolling = RollingUsage(hass, KEY)
+    await rolling.async_load()
+
+    assert rolling.aggregates().last_7_days == WEEK_HOURS
+    assert rolling.aggregates().previous_7_days is None
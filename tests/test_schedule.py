@@ -0,0 +1,110 @@
+"""Tests for the learned publication schedule."""
+
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.thames_water.schedule import (
+    INITIAL_BACKOFF,
+    MAX_LEAD,
+    MIN_OBSERVATIONS,
+    RELEASE_MARGIN,
+    SCHEDULE_STORAGE_VERSION,
+    PublicationModel,
+)
+
+KEY = "thames_water.test.schedule"
+FIRST_DAY = datetime.date(2024, 6, 1)
+
+
+def _day_end(date: datetime.date) -> datetime.datetime:
+    """Return the local midnight that ends a day, in UTC."""
+    return dt_util.as_utc(dt_util.start_of_local_day(date + timedelta(days=1)))
+
+
+def _observe_days(
+    model: PublicationModel, days: int, lag: timedelta, missed: bool = True
+) -> datetime.date:
+    """Publish consecutive days lag after they end; return the last one."""
+    for offset in range(days):
+        date = FIRST_DAY + timedelta(days=offset)
+        if missed:
+            model.miss(_day_end(date) + lag - timedelta(hours=1))
+        model.observe(date, _day_end(date) + lag + timedelta(hours=1))
+    return date
+
+
+async def test_fallback_until_enough_observations(
+    hass: HomeAssistant, london
+) -> None:
+    """The fixed fetch hours are used until MIN_OBSERVATIONS days were seen."""
+    model = PublicationModel(hass, KEY)
+    latest = _observe_days(model, MIN_OBSERVATIONS - 1, timedelta(hours=50))
+    now = _day_end(latest)
+    fallback = now + timedelta(hours=3)
+
+    assert model.expected_lag is None
+    assert model.next_refresh(latest, now, fallback) == fallback
+    assert model.next_refresh(None, now, fallback) == fallback
+
+
+async def test_lag_from_bounds(hass: HomeAssistant, london) -> None:
+    """The midpoint between the last miss and the sighting is learned."""
+    model = PublicationModel(hass, KEY)
+    latest = _observe_days(model, MIN_OBSERVATIONS, timedelta(hours=50))
+    now = _day_end(latest) + timedelta(hours=51)
+
+    assert model.expected_lag == timedelta(hours=50)
+    assert model.next_refresh(latest, now, now) == (
+        _day_end(latest + timedelta(days=1)) + timedelta(hours=50) - RELEASE_MARGIN
+    )
+
+
+async def test_lead_grows_while_days_are_early(hass: HomeAssistant, london) -> None:
+    """Days already out at the first look widen the lead, up to MAX_LEAD."""
+    model = PublicationModel(hass, KEY)
+    latest = _observe_days(model, MIN_OBSERVATIONS, timedelta(hours=50), missed=False)
+    now = _day_end(latest)
+    expected = _day_end(latest + timedelta(days=1)) + timedelta(hours=51)
+
+    lead = RELEASE_MARGIN * 2**MIN_OBSERVATIONS
+    assert model.next_refresh(latest, now, now) == expected - lead
+
+    latest = _observe_days(model, 20, timedelta(hours=50), missed=False)
+    now = _day_end(latest)
+    expected = _day_end(latest + timedelta(days=1)) + timedelta(hours=51)
+    assert model.next_refresh(latest, now, now) == expected - MAX_LEAD
+
+
+async def test_misses_back_off(hass: HomeAssistant, london) -> None:
+    """Refreshes that find nothing wait longer each time."""
+    model = PublicationModel(hass, KEY)
+    latest = _observe_days(model, MIN_OBSERVATIONS, timedelta(hours=50))
+    now = _day_end(latest + timedelta(days=1)) + timedelta(hours=60)
+
+    model.miss(now)
+    assert model.next_refresh(latest, now, now) == now + INITIAL_BACKOFF
+    model.miss(now)
+    assert model.next_refresh(latest, now, now) == now + 2 * INITIAL_BACKOFF
+    assert model.as_dict()["misses"] == 2
+
+
+async def test_reload(hass: HomeAssistant, hass_storage: dict, london) -> None:
+    """The learned lags survive a restart."""
+    model = PublicationModel(hass, KEY)
+    _observe_days(model, MIN_OBSERVATIONS, timedelta(hours=50))
+    hass_storage[KEY] = {
+        "version": SCHEDULE_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": KEY,
+        "data": model._data_to_save(),
+    }
+
+    reloaded = PublicationModel(hass, KEY)
+    await reloaded.async_load()
+
+    assert reloaded.as_dict() == model.as_dict()
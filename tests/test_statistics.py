@@ -0,0 +1,98 @@
+"""Tests for the recorder statistics helpers."""
+
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.thames_water.statistics import (
+    async_get_first_start,
+    async_get_sum_before,
+    cost_statistic_ids,
+)
+
+STATISTICS = "custom_components.thames_water.statistics"
+STATISTIC_ID = "thames_water:thameswater_consumption"
+BEFORE = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+
+
+def _recorder(last: dict) -> MagicMock:
+    """Return a recorder whose get_last_statistics returns last."""
+    recorder = MagicMock()
+    recorder.async_add_executor_job = AsyncMock(return_value=last)
+    return recorder
+
+
+def _last(when: datetime.datetime, total: float) -> dict:
+    """Return a get_last_statistics result with one row."""
+    return {STATISTIC_ID: [{"start": when.timestamp(), "sum": total}]}
+
+
+def _rows_at(*rows: tuple[datetime.datetime, float]):
+    """Return a fake async_get_statistics_rows holding the given rows."""
+
+    async def get_rows(hass, statistic_id, start, end):
+        return [
+            {"start": when.timestamp(), "sum": total}
+            for when, total in rows
+            if start <= when < end
+        ]
+
+    return get_rows
+
+
+async def test_sum_before_uses_newest_row(hass: HomeAssistant) -> None:
+    """The newest row is used when it starts before the point in time."""
+    last = _last(BEFORE - timedelta(hours=1), 9.0)
+    with patch(f"{STATISTICS}.get_instance", return_value=_recorder(last)):
+        assert await async_get_sum_before(hass, STATISTIC_ID, BEFORE) == 9.0
+
+
+async def test_sum_before_searches_past_a_year(hass: HomeAssistant) -> None:
+    """An earlier row is found however far back it is."""
+    last = _last(BEFORE + timedelta(days=5), 99.0)
+    rows = _rows_at((BEFORE - timedelta(days=1000), 42.0))
+    with (
+        patch(f"{STATISTICS}.get_instance", return_value=_recorder(last)),
+        patch(f"{STATISTICS}.async_get_statistics_rows", side_effect=rows),
+    ):
+        assert await async_get_sum_before(hass, STATISTIC_ID, BEFORE) == 42.0
+
+
+async def test_sum_before_without_earlier_rows(hass: HomeAssistant) -> None:
+    """Without any earlier row the sum starts at zero."""
+    last = _last(BEFORE + timedelta(days=5), 99.0)
+    with (
+        patch(f"{STATISTICS}.get_instance", return_value=_recorder(last)),
+        patch(f"{STATISTICS}.async_get_statistics_rows", side_effect=_rows_at()),
+    ):
+        assert await async_get_sum_before(hass, STATISTIC_ID, BEFORE) == 0.0
+    with patch(f"{STATISTICS}.get_instance", return_value=_recorder({})):
+        assert await async_get_sum_before(hass, STATISTIC_ID, BEFORE) == 0.0
+
+
+async def test_first_start(hass: HomeAssistant) -> None:
+    """The first row of a range is found across search windows."""
+    first = BEFORE + timedelta(days=500, hours=3)
+    rows = _rows_at((first, 1.0), (first + timedelta(hours=1), 2.0))
+    with patch(f"{STATISTICS}.async_get_statistics_rows", side_effect=rows):
+        assert (
+            await async_get_first_start(
+                hass, STATISTIC_ID, BEFORE, BEFORE + timedelta(days=900)
+            )
+            == first
+        )
+        assert (
+            await async_get_first_start(hass, STATISTIC_ID, BEFORE, first) is None
+        )
+
+
+def test_cost_statistic_ids() -> None:
+    """The total keeps the plain ID and only the given components get one."""
+    assert cost_statistic_ids("thames_water:", "_5678", ("water",)) == {
+        "total": "thames_water:thameswater_cost_5678",
+        "water": "thames_water:thameswater_cost_water_5678",
+    }
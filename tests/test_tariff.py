@@ -0,0 +1,143 @@
+"""Tests for the tariff engine."""
+
+from __future__ import annotations
+
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.thames_water import tariff as tariff_module
+from custom_components.thames_water.readings import ReadingsBuffer, day_utc_hours
+from custom_components.thames_water.tariff import Tariff
+
+LONDON = ZoneInfo("Europe/London")
+
+
+def _day_readings(*dates: datetime.date, usage: float = 1.0) -> ReadingsBuffer:
+    """Return one reading for every UTC hour of the given local days."""
+    readings = ReadingsBuffer()
+    for date in dates:
+        for hours in day_utc_hours(date, LONDON):
+            for hour in hours:
+                if not readings or readings.hours[-1] != hour:
+                    readings.append(hour, usage)
+    return readings
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def numpy_enabled(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """Price with numpy when it is installed, and without it."""
+    if not request.param:
+        monkeypatch.setattr(tariff_module, "np", None)
+    elif tariff_module.np is None:
+        pytest.skip("numpy is not installed")
+
+
+def test_flat_liter_cost(numpy_enabled) -> None:
+    """Without periods only the water component and the total are priced."""
+    tariff = Tariff.from_config(None, 0.002)
+    readings = _day_readings(datetime.date(2024, 6, 1), usage=10.0)
+
+    costs = tariff.price(readings, LONDON)
+
+    assert tariff.components == ("water",)
+    assert set(costs) == {"water", "total"}
+    assert costs["total"] == pytest.approx([0.02] * 24)
+
+
+def test_components_with_a_rate(numpy_enabled) -> None:
+    """A component is priced when any period has a non-zero rate for it."""
+    tariff = Tariff.from_config(
+        [
+            {"effective_from": "2024-01-01", "clean_water_rate": 0.002},
+            {
+                "effective_from": "2024-04-01",
+                "clean_water_rate": 0.002,
+                "wastewater_rate": 0.001,
+            },
+        ],
+        0.0,
+    )
+    assert tariff.components == ("water", "wastewater")
+    assert set(tariff.price(_day_readings(datetime.date(2024, 6, 1)), LONDON)) == {
+        "water",
+        "wastewater",
+        "total",
+    }
+
+
+@pytest.mark.parametrize(
+    "date", [datetime.date(2024, 3, 31), datetime.date(2024, 10, 27)]
+)
+def test_standing_charge_once_per_day_on_dst_days(numpy_enabled, date) -> None:
+    """23- and 25-hour days are charged exactly one day's standing charge."""
+    tariff = Tariff.from_config(
+        [
+            {
+                "effective_from": "2024-01-01",
+                "clean_water_rate": 0.0,
+                "standing_charge": 0.24,
+            }
+        ],
+        0.0,
+    )
+    readings = _day_readings(date - datetime.timedelta(days=1), date)
+
+    standing = tariff.price(readings, LONDON)["standing"]
+
+    assert tariff.components == ("standing",)
+    assert sum(standing) == pytest.approx(0.48)
+    assert standing[0] == standing[24] == pytest.approx(0.24)
+
+
+def test_standing_charge_with_missing_hours(numpy_enabled) -> None:
+    """A day with missing hours still pays its whole standing charge."""
+    tariff = Tariff.from_config(
+        [
+            {
+                "effective_from": "2024-01-01",
+                "clean_water_rate": 0.001,
+                "standing_charge": 0.24,
+            }
+        ],
+        0.0,
+    )
+    full = _day_readings(datetime.date(2024, 6, 1))
+    readings = ReadingsBuffer()
+    for hour, usage in zip(full.hours[5:], full.usage[5:]):
+        readings.append(hour, usage)
+
+    assert sum(tariff.price(readings, LONDON)["standing"]) == pytest.approx(0.24)
+
+
+def test_bands_and_periods(numpy_enabled) -> None:
+    """Bands multiply volumetric rates by local hour; periods switch at midnight."""
+    tariff = Tariff.from_config(
+        [
+            {
+                "effective_from": "2024-06-02",
+                "clean_water_rate": 0.003,
+                "bands": [{"start_hour": 22, "end_hour": 6, "multiplier": 0.5}],
+            },
+            {"effective_from": "2024-06-01", "clean_water_rate": 0.001},
+        ],
+        0.0,
+    )
+    readings = _day_readings(datetime.date(2024, 6, 1), datetime.date(2024, 6, 2))
+
+    water = tariff.price(readings, LONDON)["water"]
+
+    assert water[:24] == pytest.approx([0.001] * 24)
+    assert water[24:30] == pytest.approx([0.0015] * 6)
+    assert water[30:46] == pytest.approx([0.003] * 16)
+    assert water[46:] == pytest.approx([0.0015] * 2)
+
+
+def test_readings_before_the_first_period(numpy_enabled) -> None:
+    """Readings before every period are priced with the first one."""
+    tariff = Tariff.from_config(
+        [{"effective_from": "2025-01-01", "clean_water_rate": 0.002}], 0.0
+    )
+    readings = _day_readings(datetime.date(2024, 6, 1))
+    assert tariff.price(readings, LONDON)["total"] == pytest.approx([0.002] * 24)
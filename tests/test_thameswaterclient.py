@@ -0,0 +1,90 @@
+"""Tests for the request pacing of the Thames Water client."""
+
+from __future__ import annotations
+
+import datetime
+from email.utils import format_datetime
+import time
+
+import pytest
+
+from custom_components.thames_water import thameswaterclient
+from custom_components.thames_water.thameswaterclient import (
+    BACKOFF_BASE,
+    MAX_BACKOFF,
+    TokenBucket,
+    retry_delay,
+)
+
+
+class _Clock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace the client's monotonic clock."""
+    clock = _Clock()
+    monkeypatch.setattr(thameswaterclient.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_burst_then_wait(clock: _Clock) -> None:
+    """A full bucket allows a burst, then queues callers behind each other."""
+    bucket = TokenBucket(rate=2.0, capacity=2.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_token_bucket_refills_up_to_capacity(clock: _Clock) -> None:
+    """Idle time refills the bucket, but never past its capacity."""
+    bucket = TokenBucket(rate=1.0, capacity=2.0)
+    bucket.reserve()
+    clock.now += 60.0
+    assert [bucket.reserve() for _ in range(3)] == pytest.approx([0.0, 0.0, 1.0])
+
+
+def test_token_bucket_adapts_rate(clock: _Clock) -> None:
+    """Throttling halves the rate down to min_rate; success recovers it."""
+    bucket = TokenBucket(rate=4.0, capacity=4.0, min_rate=0.5)
+    for _ in range(5):
+        bucket.throttled()
+    assert bucket.rate == 0.5
+
+    for _ in range(100):
+        bucket.succeeded()
+    assert bucket.rate == 4.0
+
+
+def test_retry_after_seconds() -> None:
+    """Retry-After in seconds is honoured up to MAX_BACKOFF."""
+    assert retry_delay(1, "7") == 7.0
+    assert retry_delay(1, "-3") == 0.0
+    assert retry_delay(1, str(MAX_BACKOFF * 10)) == MAX_BACKOFF
+
+
+def test_retry_after_http_date() -> None:
+    """Retry-After as an HTTP date waits until then."""
+    when = datetime.datetime.fromtimestamp(time.time() + 30, datetime.UTC)
+    header = format_datetime(when, usegmt=True)
+    assert 25 <= retry_delay(1, header) <= 31
+
+
+def test_exponential_backoff_with_jitter() -> None:
+    """Without Retry-After the delay doubles per attempt, with full jitter."""
+    for attempt in (1, 2, 3):
+        backoff = BACKOFF_BASE * 2 ** (attempt - 1)
+        for _ in range(20):
+            assert backoff / 2 <= retry_delay(attempt) <= backoff
+    assert retry_delay(50, "not a date") <= MAX_BACKOFF